@@ -4,19 +4,26 @@
 """
 
 from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
-from sqlalchemy import func, and_, or_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import delete, func, select
 from typing import List, Optional
 from datetime import datetime, timedelta
 import os
 
-from app.database.db import get_db
+from app.database.db import get_async_db
 from app.models.missing_person import MissingPerson
-from app.services.data_sync_service import DataSyncService
+from app.services.sync_coordinator import get_sync_coordinator, job_summary
+from app.services.missing_person_query import build_missing_persons_query, count_query, page_query
+from app.services.spatial_index import bbox_filter
 
 router = APIRouter()
 
 
+async def _count(db: AsyncSession, *conditions) -> int:
+    """조건에 맞는 실종자 수"""
+    return await db.scalar(select(func.count(MissingPerson.id)).where(*conditions))
+
+
 @router.get("/health")
 async def health_check():
     """헬스 체크"""
@@ -39,7 +46,8 @@ async def get_missing_persons(
     age_min: Optional[int] = Query(None, ge=0, le=150, description="최소 나이"),
     age_max: Optional[int] = Query(None, ge=0, le=150, description="최대 나이"),
     has_disability: Optional[bool] = Query(None, description="장애 여부 (true: 장애 있음, false: 장애 없음)"),
-    db: Session = Depends(get_db)
+    q: Optional[str] = Query(None, max_length=100, description="주소/상세정보 검색어 (단어 접두 검색, 여러 단어는 모두 포함)"),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     실종자 목록 조회
@@ -57,74 +65,52 @@ async def get_missing_persons(
     추가 필터:
     - gender=M/F → 성별 필터
     - age_min=10&age_max=20 → 나이 범위
-    - has_disability=true/false → 장애 여부 (location_detail에서 "장애" 키워드 검색)
+    - has_disability=true/false → 장애 여부 (수집 시 location_detail 키워드로 계산해 둔 값)
+    - q=강남 안경 → 주소/상세정보 검색 (전문 검색 인덱스)
     """
-    query = db.query(MissingPerson)
-
-    # ✅ 상태 필터 적용
-    if status and status != "all":
-        query = query.filter(MissingPerson.status == status)
+    since = until = None
 
     # 날짜 필터 적용
     if days:
         # 최근 N일
-        since_date = datetime.now() - timedelta(days=days)
-        query = query.filter(MissingPerson.missing_date >= since_date)
+        since = datetime.now() - timedelta(days=days)
 
     elif start_date and end_date:
         # 특정 기간
         try:
-            start = datetime.strptime(start_date, "%Y-%m-%d")
-            end = datetime.strptime(end_date, "%Y-%m-%d")
-
-            if start > end:
-                raise HTTPException(
-                    status_code=400,
-                    detail="시작일이 종료일보다 늦을 수 없습니다"
-                )
-
-            query = query.filter(
-                and_(
-                    MissingPerson.missing_date >= start,
-                    MissingPerson.missing_date <= end
-                )
-            )
+            since = datetime.strptime(start_date, "%Y-%m-%d")
+            until = datetime.strptime(end_date, "%Y-%m-%d")
         except ValueError:
             raise HTTPException(
                 status_code=400,
                 detail="날짜 형식이 잘못되었습니다. YYYY-MM-DD 형식으로 입력하세요"
             )
 
-    # ✅ 성별 필터 적용
-    if gender:
-        query = query.filter(MissingPerson.gender == gender)
-
-    # ✅ 나이 필터 적용
-    if age_min is not None:
-        query = query.filter(MissingPerson.age >= age_min)
-    if age_max is not None:
-        query = query.filter(MissingPerson.age <= age_max)
-
-    # ✅ 장애 필터 적용
-    if has_disability is not None:
-        if has_disability:
-            # 장애 키워드가 포함된 경우만
-            query = query.filter(MissingPerson.location_detail.like('%장애%'))
-        else:
-            # 장애 키워드가 없는 경우만
-            query = query.filter(
-                ~MissingPerson.location_detail.like('%장애%') |
-                MissingPerson.location_detail.is_(None)
+        if since > until:
+            raise HTTPException(
+                status_code=400,
+                detail="시작일이 종료일보다 늦을 수 없습니다"
             )
 
+    # 상태/날짜/성별/나이/장애/검색어 필터 (복합 인덱스에 맞춘 조건 순서)
+    query = build_missing_persons_query(
+        select(MissingPerson),
+        db.bind,
+        status=status,
+        since=since,
+        until=until,
+        gender=gender,
+        age_min=age_min,
+        age_max=age_max,
+        has_disability=has_disability,
+        search=q
+    )
+
     # 정렬 및 페이징
-    persons = query.order_by(MissingPerson.missing_date.desc())\
-        .offset(skip)\
-        .limit(limit)\
-        .all()
+    persons = (await db.scalars(page_query(query, skip, limit))).all()
 
-    # 전체 개수 (필터 적용 후)
-    total_count = query.count()
+    # 전체 개수 (필터 적용 후, 인덱스만으로 계산)
+    total_count = await db.scalar(count_query(query))
 
     return {
         "total": total_count,
@@ -137,8 +123,10 @@ async def get_missing_persons(
                 "location_detail": p.location_detail,
                 "age": p.age,
                 "gender": p.gender,
+                "has_disability": p.has_disability,
                 "latitude": p.latitude,
                 "longitude": p.longitude,
+                "geocode_precision": p.geocode_precision,  # address / sigungu / sido (대략 좌표, 동봉 지명 사전은 시군구까지)
                 "status": p.status,  # ✅ 추가
                 "resolved_at": p.resolved_at.isoformat() if p.resolved_at else None,  # ✅ 추가
             }
@@ -147,61 +135,124 @@ async def get_missing_persons(
     }
 
 
+@router.get("/missing-persons/bbox")
+async def get_missing_persons_in_bbox(
+    min_lat: float = Query(..., ge=-90, le=90, description="남쪽 위도"),
+    min_lng: float = Query(..., ge=-180, le=180, description="서쪽 경도"),
+    max_lat: float = Query(..., ge=-90, le=90, description="북쪽 위도"),
+    max_lng: float = Query(..., ge=-180, le=180, description="동쪽 경도"),
+    status: Optional[str] = Query(None, description="상태 필터 (missing/resolved/all)", regex="^(missing|resolved|all)$"),
+    limit: int = Query(1000, ge=1, le=5000),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    지도 화면 영역 안의 실종자 조회 (공간 인덱스 사용)
+
+    - 지도 앱은 화면 경계(남서/북동 좌표)만 보내고, 보이는 건만 받음
+    - 최근 발생일 순으로 최대 limit건
+    """
+    if min_lat > max_lat or min_lng > max_lng:
+        raise HTTPException(
+            status_code=400,
+            detail="영역이 잘못되었습니다 (min_lat <= max_lat, min_lng <= max_lng)"
+        )
+
+    query = bbox_filter(select(MissingPerson), db.bind, min_lat, min_lng, max_lat, max_lng)
+    if status and status != "all":
+        query = query.where(MissingPerson.status == status)
+
+    persons = (await db.scalars(query.order_by(MissingPerson.missing_date.desc()).limit(limit + 1))).all()
+    truncated = len(persons) > limit
+    persons = persons[:limit]
+
+    return {
+        "count": len(persons),
+        "truncated": truncated,  # 영역 안에 limit건보다 많음 → 지도 확대 필요
+        "bbox": [min_lat, min_lng, max_lat, max_lng],
+        "items": [
+            {
+                "id": p.id,
+                "external_id": p.external_id,
+                "missing_date": p.missing_date.isoformat() if p.missing_date else None,
+                "location_address": p.location_address,
+                "location_detail": p.location_detail,
+                "age": p.age,
+                "gender": p.gender,
+                "has_disability": p.has_disability,
+                "latitude": p.latitude,
+                "longitude": p.longitude,
+                "geocode_precision": p.geocode_precision,
+                "status": p.status,
+                "resolved_at": p.resolved_at.isoformat() if p.resolved_at else None,
+            }
+            for p in persons
+        ]
+    }
+
+
 @router.get("/missing-persons/stats")
 async def get_statistics(
     days: int = Query(30, ge=1, le=3650, description="최근 N일 통계"),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """통계 조회 (날짜 필터 적용)"""
     since_date = datetime.now() - timedelta(days=days)
 
     # 기간 내 전체 실종자
-    total_query = db.query(MissingPerson)\
-        .filter(MissingPerson.missing_date >= since_date)
-
-    total_count = total_query.count()
-
-    # ✅ 상태별 통계 (실종 중 / 실종 해제)
-    status_stats = {}
-    for status in ["missing", "resolved"]:
-        count = total_query.filter(MissingPerson.status == status).count()
-        status_stats[status] = count
-
-    # 성별 통계
-    gender_stats = {}
-    for gender in ["M", "F"]:
-        count = total_query.filter(MissingPerson.gender == gender).count()
-        gender_stats[gender] = count
+    in_period = MissingPerson.missing_date >= since_date
+
+    # 전체 / 상태별(실종 중, 실종 해제) / 성별 건수를 한 번의 스캔으로 집계
+    counted = func.count(MissingPerson.id)
+    totals = (await db.execute(
+        select(
+            counted.label("total"),
+            counted.filter(MissingPerson.status == "missing").label("missing"),
+            counted.filter(MissingPerson.status == "resolved").label("resolved"),
+            counted.filter(MissingPerson.gender == "M").label("M"),
+            counted.filter(MissingPerson.gender == "F").label("F"),
+        ).where(in_period)
+    )).one()
+
+    total_count = totals.total
+    status_stats = {status: totals._mapping[status] for status in ["missing", "resolved"]}  # ✅ 상태별 통계
+    gender_stats = {gender: totals._mapping[gender] for gender in ["M", "F"]}
 
     # 지역별 통계 (상위 5개)
-    top_locations = db.query(
-        MissingPerson.location_address,
-        func.count(MissingPerson.id).label("count")
-    ).filter(
-        MissingPerson.missing_date >= since_date
-    ).group_by(
-        MissingPerson.location_address
-    ).order_by(
-        func.count(MissingPerson.id).desc()
-    ).limit(5).all()
-
-    # 일별 통계 (최근 30일)
-    daily_stats = []
-    for i in range(min(days, 30)):
-        date = datetime.now() - timedelta(days=i)
-        date_start = date.replace(hour=0, minute=0, second=0, microsecond=0)
-        date_end = date.replace(hour=23, minute=59, second=59, microsecond=999999)
-
-        count = db.query(MissingPerson).filter(
-            and_(
-                MissingPerson.missing_date >= date_start,
-                MissingPerson.missing_date <= date_end
+    top_locations = (await db.execute(
+        select(
+            MissingPerson.location_address,
+            func.count(MissingPerson.id).label("count")
+        ).where(
+            in_period
+        ).group_by(
+            MissingPerson.location_address
+        ).order_by(
+            func.count(MissingPerson.id).desc()
+        ).limit(5)
+    )).all()
+
+    # 일별 통계 (최근 30일, 날짜별 GROUP BY 한 번)
+    today = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+    daily_days = min(days, 30)
+    missing_day = func.date(MissingPerson.missing_date)
+    daily_counts = {
+        str(day)[:10]: count
+        for day, count in (await db.execute(
+            select(missing_day, func.count(MissingPerson.id))
+            .where(
+                MissingPerson.missing_date >= today - timedelta(days=daily_days - 1),
+                MissingPerson.missing_date < today + timedelta(days=1)
             )
-        ).count()
+            .group_by(missing_day)
+        )).all()
+    }
 
+    daily_stats = []
+    for i in range(daily_days):
+        date = (today - timedelta(days=i)).strftime("%Y-%m-%d")
         daily_stats.append({
-            "date": date.strftime("%Y-%m-%d"),
-            "count": count
+            "date": date,
+            "count": daily_counts.get(date, 0)
         })
 
     return {
@@ -217,12 +268,18 @@ async def get_statistics(
     }
 
 
-@router.post("/sync/missing-persons")
+@router.post("/sync/missing-persons", status_code=202)
 async def sync_missing_persons(
     max_pages: int = Query(10, ge=1, le=50),
-    db: Session = Depends(get_db)
+    mode: str = Query("full", description="동기화 방식 (full: 전체 + 실종 해제 감지 / incremental: 최근 발생 건만)", regex="^(full|incremental)$"),
 ):
-    """안전Dream API에서 데이터 동기화"""
+    """
+    안전Dream API에서 데이터 동기화 요청 (202 Accepted + 작업 ID 즉시 반환)
+
+    이미 실행 중인 동기화가 있으면 새로 시작하지 않고 그 작업에 병합됩니다.
+    증분 동기화 중의 전체 동기화 요청은 후속 작업(job.status="queued")으로 대기했다가 이어서 실행됩니다.
+    진행 상황: GET /api/v1/sync/jobs/{job_id}
+    """
     api_key = os.getenv("SAFE_DREAM_API_KEY")
     if not api_key:
         raise HTTPException(
@@ -230,73 +287,83 @@ async def sync_missing_persons(
             detail="API 키가 설정되지 않았습니다"
         )
     
-    try:
-        service = DataSyncService(api_key=api_key)
-        result = await service.sync_all_data(max_pages=max_pages)
-        
-        if not result["success"]:
-            return {
-                "status": "error",
-                "message": "동기화 중 오류가 발생했습니다",
-                "errors": result["errors"]
-            }
-        
-        stats = service.get_statistics()
-        
-        return {
-            "status": "success",
-            "message": "데이터 동기화 완료",
-            "sync_result": {
-                "total_fetched": result["total_fetched"],
-                "new_added": result["new_added"],
-                "updated": result["updated"],
-                "resolved": result["resolved"],  # ✅ 추가
-                "skipped": result["skipped"],
-                "duration_seconds": result["duration"],
-            },
-            "database_stats": stats,
-            "errors": result["errors"] if result["errors"] else None
-        }
-        
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"동기화 실패: {str(e)}")
+    job = get_sync_coordinator().trigger(
+        api_key=api_key,
+        esntl_id=os.getenv("SAFE_DREAM_ESNTL_ID", "10000855"),
+        max_pages=max_pages,
+        source="api",
+        mode=mode
+    )
+    
+    return {
+        "status": "accepted",
+        "message": "데이터 동기화 요청이 접수되었습니다",
+        "job_id": job["job_id"],
+        "status_url": f"/api/v1/sync/jobs/{job['job_id']}",
+        "job": job_summary(job),
+    }
+
+
+@router.get("/sync/jobs/{job_id}")
+async def get_sync_job(job_id: str):
+    """동기화 작업 진행 상황 조회 (단계, 수신 페이지 수, 기록된 행 수)"""
+    job = get_sync_coordinator().get_job(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="동기화 작업을 찾을 수 없습니다")
+    
+    return job_summary(job)
 
 
 @router.get("/db/stats")
-async def get_db_statistics(db: Session = Depends(get_db)):
+async def get_db_statistics(db: AsyncSession = Depends(get_async_db)):
     """데이터베이스 전체 통계"""
-    total_count = db.query(MissingPerson).count()
+    total_count = await _count(db)
     
-    geocoded_count = db.query(MissingPerson).filter(
+    geocoded_count = await _count(
+        db,
         MissingPerson.latitude.isnot(None),
         MissingPerson.longitude.isnot(None)
-    ).count()
+    )
+    
+    # 좌표 정밀도별 개수 (None: 정밀도 기록 전 지오코딩 결과 또는 좌표 없음)
+    precision_counts = dict((await db.execute(
+        select(MissingPerson.geocode_precision, func.count(MissingPerson.id))
+        .where(MissingPerson.latitude.isnot(None))
+        .group_by(MissingPerson.geocode_precision)
+    )).all())
     
     recent_date = datetime.now() - timedelta(days=7)
-    recent_count = db.query(MissingPerson).filter(
-        MissingPerson.created_at >= recent_date
-    ).count()
+    recent_count = await _count(db, MissingPerson.created_at >= recent_date)
     
-    latest = db.query(MissingPerson)\
-        .order_by(MissingPerson.updated_at.desc())\
-        .first()
+    latest = await db.scalar(
+        select(MissingPerson)
+        .order_by(MissingPerson.updated_at.desc())
+        .limit(1)
+    )
     
     # 가장 오래된 데이터
-    oldest = db.query(MissingPerson)\
-        .filter(MissingPerson.missing_date.isnot(None))\
-        .order_by(MissingPerson.missing_date.asc())\
-        .first()
+    oldest = await db.scalar(
+        select(MissingPerson)
+        .where(MissingPerson.missing_date.isnot(None))
+        .order_by(MissingPerson.missing_date.asc())
+        .limit(1)
+    )
     
     # 가장 최근 데이터
-    newest = db.query(MissingPerson)\
-        .filter(MissingPerson.missing_date.isnot(None))\
-        .order_by(MissingPerson.missing_date.desc())\
-        .first()
+    newest = await db.scalar(
+        select(MissingPerson)
+        .where(MissingPerson.missing_date.isnot(None))
+        .order_by(MissingPerson.missing_date.desc())
+        .limit(1)
+    )
     
     return {
         "total_count": total_count,
         "geocoded_count": geocoded_count,
         "geocoded_percentage": round(geocoded_count / total_count * 100, 1) if total_count > 0 else 0,
+        "geocode_precision": {
+            (precision or "unknown"): count for precision, count in precision_counts.items()
+        },
         "recent_count": recent_count,
         "last_updated": latest.updated_at.isoformat() if latest else None,
         "date_range": {
@@ -309,7 +376,7 @@ async def get_db_statistics(db: Session = Depends(get_db)):
 @router.delete("/missing-persons/clear")
 async def clear_all_data(
     confirm: str = Query(None),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """모든 데이터 삭제 (개발용)"""
     if confirm != "DELETE_ALL":
@@ -319,14 +386,14 @@ async def clear_all_data(
         )
     
     try:
-        count = db.query(MissingPerson).count()
-        db.query(MissingPerson).delete()
-        db.commit()
+        count = await _count(db)
+        await db.execute(delete(MissingPerson))
+        await db.commit()
         
         return {
             "status": "success",
             "message": f"{count}건의 데이터가 삭제되었습니다"
         }
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(status_code=500, detail=f"삭제 실패: {str(e)}")
@@ -1,6 +1,9 @@
-from sqlalchemy import create_engine
+from sqlalchemy import case, create_engine, inspect, or_, text, update
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker, Session
-from app.models.missing_person import Base
+from app.models.missing_person import Base, MissingPerson
+from app.models import sync_run, geocode_cache, geocode_backfill, geocode_quota  # noqa: F401 (sync_runs, geocode_cache, geocode_backfills, geocode_quota_usage 테이블 등록)
 import os
 
 # 데이터베이스 URL
@@ -15,12 +18,108 @@ engine = create_engine(
 # 세션 팩토리
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# 비동기 드라이버 (API 요청 처리용, 동기화/스크립트는 위의 동기 엔진 사용)
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+}
+
+def _async_url(url: str):
+    """동기 DATABASE_URL → 같은 DB의 비동기 드라이버 URL (드라이버를 직접 지정했으면 그대로)"""
+    parsed = make_url(url)
+    if "+" in parsed.drivername:
+        backend, driver = parsed.drivername.split("+", 1)
+        if driver in ("aiosqlite", "asyncpg"):
+            return parsed
+    else:
+        backend = parsed.drivername
+    return parsed.set(drivername=ASYNC_DRIVERS.get(backend, parsed.drivername))
+
+# 비동기 엔진 (쿼리가 이벤트 루프를 막지 않음 → 동시 요청이 서로 기다리지 않음)
+ASYNC_DATABASE_URL = _async_url(DATABASE_URL)
+async_engine = create_async_engine(ASYNC_DATABASE_URL)
+
+# 비동기 세션 팩토리 (커밋 후에도 응답 직렬화에서 속성을 읽도록 만료하지 않음)
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
 def init_db():
     """데이터베이스 초기화"""
     Base.metadata.create_all(bind=engine)
+    added = _add_missing_columns()
+    _fill_derived_columns(added)
+    _create_missing_indexes()
+    _create_spatial_index()
+    _create_text_search()
+    _purge_geocode_cache_keys()
+
+def _add_missing_columns():
+    """기존 테이블에 모델에 새로 추가된 컬럼 생성 (create_all은 기존 테이블을 변경하지 않음)"""
+    inspector = inspect(engine)
+    added = set()
+    with engine.begin() as conn:
+        for table in Base.metadata.sorted_tables:
+            existing = {col["name"] for col in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name in existing:
+                    continue
+                column_type = column.type.compile(dialect=engine.dialect)
+                conn.execute(text(
+                    f'ALTER TABLE {table.name} ADD COLUMN {column.name} {column_type}'
+                ))
+                print(f"🛠️  컬럼 추가: {table.name}.{column.name}")
+                added.add(f"{table.name}.{column.name}")
+    return added
+
+def _fill_derived_columns(added):
+    """새로 추가된 계산 컬럼을 기존 행의 원본 필드로 한 번 채움 (이후로는 수집할 때 계산)"""
+    if "missing_persons.has_disability" not in added:
+        return
+    from app.services.safe_dream_decoder import DISABILITY_KEYWORDS
+    condition = or_(*[MissingPerson.location_detail.contains(keyword) for keyword in DISABILITY_KEYWORDS])
+    with engine.begin() as conn:
+        count = conn.execute(
+            update(MissingPerson.__table__).values(has_disability=case((condition, True), else_=False))
+        ).rowcount
+    print(f"🛠️  장애 여부 계산: {count}건")
+
+def _create_missing_indexes():
+    """기존 테이블에 없는 인덱스 생성 (같은 이름이지만 컬럼 구성이 바뀐 인덱스는 다시 생성)"""
+    # 삭제와 생성을 한 연결에서 (SQLite는 다른 연결의 스키마 캐시가 오래되면 "already exists" 오류)
+    with engine.begin() as conn:
+        inspector = inspect(conn)
+        for table in Base.metadata.sorted_tables:
+            existing = {index["name"]: index["column_names"] for index in inspector.get_indexes(table.name)}
+            for index in table.indexes:
+                columns = [column.name for column in index.columns]
+                if index.name in existing and existing[index.name] != columns:
+                    index.drop(bind=conn)
+                    print(f"🛠️  인덱스 재생성: {index.name} ({', '.join(columns)})")
+                elif index.name in existing:
+                    continue
+                index.create(bind=conn)
+
+def _create_spatial_index():
+    """지도 영역 조회용 공간 인덱스 (SQLite R*Tree + 트리거, 그 외 DB는 좌표 복합 인덱스)"""
+    from app.services.spatial_index import ensure_spatial_index
+    ensure_spatial_index(engine)
+
+def _create_text_search():
+    """주소/상세정보 전문 검색 인덱스 (SQLite FTS5 + 트리거)"""
+    from app.services.text_search import ensure_text_search
+    ensure_text_search(engine)
+
+def _purge_geocode_cache_keys():
+    """예전 키 규칙으로 장소명이 빠진 채 저장된 지오코딩 캐시 항목 삭제"""
+    from app.services.geocode_cache import purge_collapsed_keys
+    purge_collapsed_keys(engine)
+
+async def get_async_db():
+    """비동기 데이터베이스 세션 의존성 (API 라우터용)"""
+    async with AsyncSessionLocal() as db:
+        yield db
 
 def get_db():
-    """데이터베이스 세션 의존성"""
+    """데이터베이스 세션 의존성 (동기)"""
     db = SessionLocal()
     try:
         yield db
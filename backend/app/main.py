@@ -2,36 +2,51 @@
 """
 SafeMap API Server
 - 서버 시작 시 자동 데이터 동기화
-- 30분마다 자동 갱신
+- 변경 감지 후 증분 동기화로 자주 갱신, 전체 동기화(실종 해제 감지)는 주기적으로
 """
 
 from fastapi import FastAPI
+from fastapi.encoders import jsonable_encoder
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 from contextlib import asynccontextmanager
 import os
 import asyncio
+from datetime import datetime, timedelta
 
 # ✅ .env 파일 로드
 from dotenv import load_dotenv
 load_dotenv()
 
-from app.database.db import engine, Base
+from app.database.db import init_db
 from app.api import missing_persons
 
 
+# 자동 동기화 간격 (분) - 변경이 없으면 늘리고, 변경이 있으면 줄임
+SYNC_BASE_INTERVAL_MINUTES = float(os.getenv("SYNC_BASE_INTERVAL_MINUTES", "30"))
+SYNC_MIN_INTERVAL_MINUTES = float(os.getenv("SYNC_MIN_INTERVAL_MINUTES", "5"))
+SYNC_MAX_INTERVAL_MINUTES = float(os.getenv("SYNC_MAX_INTERVAL_MINUTES", "60"))
+
+# 이 시간이 지나면 전체 동기화 (실종 해제 감지용 정기 대조, 그 사이는 증분 동기화)
+FULL_SYNC_MAX_AGE_MINUTES = float(os.getenv("FULL_SYNC_MAX_AGE_MINUTES", "360"))
+
+
 # 자동 동기화 매니저
 class AutoSyncManager:
-    """자동 동기화 매니저 (30분마다)"""
+    """자동 동기화 매니저 (변경 감지 + 적응형 간격)"""
     
     def __init__(self, api_key: str, esntl_id: str = "10000855"):
         self.api_key = api_key
         self.esntl_id = esntl_id
         self.task = None
         self.is_running = False
+        self.interval_minutes = SYNC_BASE_INTERVAL_MINUTES
+        self.last_full_sync = None  # 마지막 전체 동기화 성공 시각
+        self.last_state = None  # 마지막으로 확인한 API 상태 (totalCount, 첫 항목 지문)
     
     async def start(self):
         """자동 동기화 시작"""
-        print("🚀 자동 동기화 시작 (30분 간격)")
+        print(f"🚀 자동 동기화 시작 ({self.interval_minutes:g}분 간격, 변경 감지 시 조정)")
         self.is_running = True
         self.task = asyncio.create_task(self._sync_loop())
     
@@ -48,17 +63,33 @@ class AutoSyncManager:
     
     async def _sync_loop(self):
         """동기화 루프"""
-        # 서버 시작 즉시 첫 동기화
-        await self._run_sync()
+        from app.services import sync_history
+        
+        restored = False
+        startup = True
         
-        # 30분마다 반복
         while self.is_running:
             try:
-                await asyncio.sleep(30 * 60)  # 30분
+                # 시작 시 복원/첫 동기화도 같은 오류 처리 → 실패해도 1분 뒤 다시 시도 (루프가 끝나지 않음)
+                if not restored:
+                    # 이전 실행 기록으로 변경 감지 기준 복원 (재시작 직후 불필요한 전체 동기화 방지)
+                    state = await asyncio.to_thread(sync_history.last_upstream_state)
+                    if state:
+                        self.last_full_sync = state.pop("last_full_sync")
+                        self.last_state = state
+                    restored = True
+                
+                if startup:
+                    # 서버 시작 즉시 첫 동기화 확인
+                    await self._run_cycle()
+                    startup = False
+                    continue
+                
+                await asyncio.sleep(self.interval_minutes * 60)
                 
                 if self.is_running:
-                    print("\n⏰ 정기 동기화 시작 (30분 경과)")
-                    await self._run_sync()
+                    print(f"\n⏰ 정기 동기화 확인 ({self.interval_minutes:g}분 경과)")
+                    await self._run_cycle()
             
             except asyncio.CancelledError:
                 break
@@ -66,26 +97,97 @@ class AutoSyncManager:
                 print(f"❌ 자동 동기화 오류: {e}")
                 await asyncio.sleep(60)
     
-    async def _run_sync(self):
-        """동기화 실행"""
+    async def _run_cycle(self):
+        """변경 감지 후 동기화 방식 결정 (생략 / 부분 / 전체)"""
+        from app.services import sync_history
+        from app.services.sync_coordinator import get_sync_coordinator
+        
+        full_due = (
+            self.last_full_sync is None
+            or datetime.now() - self.last_full_sync >= timedelta(minutes=FULL_SYNC_MAX_AGE_MINUTES)
+        )
+        if full_due:
+            await self._run_sync()
+            return
+        
+        probe = await get_sync_coordinator().worker.probe(self.api_key, self.esntl_id)
+        if not probe["success"] or self.last_state is None:
+            await self._run_sync()
+            return
+        
+        previous = self.last_state
+        delta = probe["total_count"] - previous["total_count"]
+        
+        if delta == 0 and probe["head_signature"] == previous["head_signature"]:
+            # ✅ 변경 없음 → 전체 크롤링 생략, 간격 늘림
+            print(f"💤 변경 없음 (totalCount {probe['total_count']}건) → 동기화 생략")
+            await asyncio.to_thread(
+                sync_history.record_probe_skip,
+                "auto", probe["total_count"], probe["head_signature"]
+            )
+            self._adjust_interval(changed=False)
+            return
+        
+        self._adjust_interval(changed=True)
+        
+        if delta >= 0:
+            # 신규/수정 건 → 최근 발생 건만 증분 동기화 (한두 페이지)
+            print(f"📈 변경 감지 (totalCount {previous['total_count']} → {probe['total_count']}) → 증분 동기화")
+            result = await self._run_sync(mode="incremental")
+            if result and result["success"]:
+                # 증분 결과의 totalCount는 기간 조건이 걸린 값 → 변경 감지 기준은 probe 값으로
+                self.last_state = {
+                    "total_count": probe["total_count"],
+                    "head_signature": probe["head_signature"],
+                }
+        else:
+            print(f"📉 건수 감소 (totalCount {previous['total_count']} → {probe['total_count']}) → 전체 동기화 (실종 해제 감지)")
+            await self._run_sync()
+    
+    def _adjust_interval(self, changed: bool):
+        """적응형 간격: 변경이 있으면 절반, 없으면 1.5배 (최소/최대 범위 내)"""
+        if changed:
+            self.interval_minutes = max(SYNC_MIN_INTERVAL_MINUTES, self.interval_minutes / 2)
+        else:
+            self.interval_minutes = min(SYNC_MAX_INTERVAL_MINUTES, self.interval_minutes * 1.5)
+        print(f"⏱️  다음 확인까지: {self.interval_minutes:g}분")
+    
+    async def _run_sync(self, max_pages: int = 50, mode: str = "full"):
+        """동기화 실행 (코디네이터에 요청, 진행 중인 동기화가 있으면 그 결과를 기다림)"""
+        result = None
         try:
             from app.services.data_sync_service import DataSyncService
+            from app.services.sync_coordinator import get_sync_coordinator
             
-            service = DataSyncService(
+            coordinator = get_sync_coordinator()
+            job = coordinator.trigger(
                 api_key=self.api_key,
-                esntl_id=self.esntl_id
+                esntl_id=self.esntl_id,
+                max_pages=max_pages,
+                source="auto",
+                mode=mode
             )
+            result = await coordinator.wait(job["job_id"])
             
-            result = await service.sync_all_data(max_pages=50)
-            
-            if result["success"]:
-                stats = service.get_statistics()
+            if result and result["success"] and job["mode"] != "incremental":
+                self.last_state = {
+                    "total_count": result["total_count"],
+                    "head_signature": result["head_signature"],
+                }
+                if job["mode"] == "full" and result.get("crawl_complete"):
+                    self.last_full_sync = datetime.now()
+                
+                stats = await asyncio.to_thread(
+                    DataSyncService(api_key=self.api_key).get_statistics
+                )
                 print(f"\n📊 현재 DB: {stats['total_count']}건")
             
         except Exception as e:
             print(f"❌ 동기화 실패: {e}")
             import traceback
             traceback.print_exc()
+        
+        return result
 
 
 # 전역 변수
@@ -105,9 +207,14 @@ async def lifespan(app: FastAPI):
     
     # 1. 데이터베이스 초기화
     print("📍 Environment: Development")
-    Base.metadata.create_all(bind=engine)
+    init_db()
     print("✅ Database initialized")
     
+    from app.services import sync_history
+    interrupted = sync_history.mark_interrupted_runs()
+    if interrupted:
+        print(f"♻️  Interrupted sync runs: {interrupted} (will resume from checkpoint)")
+    
     # 2. 자동 동기화 시작
     api_key = os.getenv("SAFE_DREAM_API_KEY")
     esntl_id = os.getenv("SAFE_DREAM_ESNTL_ID", "10000855")
@@ -118,7 +225,7 @@ async def lifespan(app: FastAPI):
         print("🔄 Initializing auto-sync service...")
         sync_manager = AutoSyncManager(api_key, esntl_id)
         await sync_manager.start()
-        print("✅ Auto-sync enabled (30-minute interval)")
+        print(f"✅ Auto-sync enabled ({sync_manager.interval_minutes:g}-minute interval, adaptive)")
     else:
         print("⚠️  SAFE_DREAM_API_KEY not found - auto-sync disabled")
         print("   Set the API key in .env file to enable auto-sync")
@@ -139,6 +246,14 @@ async def lifespan(app: FastAPI):
         await sync_manager.stop()
         print("✅ Auto-sync stopped")
     
+    from app.services.sync_coordinator import get_sync_coordinator
+    from app.services.sync_worker import get_sync_worker
+    await get_sync_coordinator().cancel_current()
+    get_sync_worker().stop()
+    
+    from app.database.db import async_engine
+    await async_engine.dispose()
+    
     print("="*60)
     print("✅ Server shutdown complete")
     print("="*60 + "\n")
@@ -179,33 +294,54 @@ async def root():
         "status": "running",
         "features": {
             "auto_sync": sync_manager is not None,
-            "sync_interval": "30 minutes" if sync_manager else None
+            "sync_interval": f"{sync_manager.interval_minutes:g} minutes" if sync_manager else None
         }
     }
 
 
 # 동기화 상태 확인
 @app.get("/api/v1/sync/status")
-async def sync_status():
-    """자동 동기화 상태 확인"""
-    if not sync_manager:
-        return {
-            "enabled": False,
-            "message": "Auto-sync is disabled. Set SAFE_DREAM_API_KEY to enable."
-        }
+async def sync_status(limit: int = 10):
+    """자동 동기화 상태 + 최근 실행 기록 및 소요 시간 백분위 (sync_runs 테이블)"""
+    from app.services import sync_history
+    from app.services.sync_coordinator import get_sync_coordinator, job_summary
     
-    return {
-        "enabled": True,
-        "is_running": sync_manager.is_running,
-        "interval": "30 minutes",
-        "last_sync": "Check server logs"
+    current = get_sync_coordinator().current_job()
+    recent_runs = await asyncio.to_thread(sync_history.recent_runs, min(max(limit, 1), 100))
+    percentiles = await asyncio.to_thread(sync_history.run_percentiles)
+    last_sync = next((run for run in recent_runs if run["status"] != "running"), None)
+    
+    from app.services.geocode_queue import get_geocode_queue
+    
+    status = {
+        "enabled": sync_manager is not None,
+        "current_job": job_summary(current) if current else None,
+        "geocoding": get_geocode_queue().get_stats(),
+        "last_sync": last_sync,
+        "recent_runs": recent_runs,
+        "percentiles": percentiles,
     }
+    
+    if not sync_manager:
+        status["message"] = "Auto-sync is disabled. Set SAFE_DREAM_API_KEY to enable."
+        return status
+    
+    status["is_running"] = sync_manager.is_running
+    status["interval"] = f"{sync_manager.interval_minutes:g} minutes"
+    status["last_full_sync"] = sync_manager.last_full_sync
+    return status
 
 
 # 수동 동기화 트리거
 @app.post("/api/v1/sync/trigger")
 async def trigger_sync():
-    """수동으로 동기화 실행"""
+    """
+    수동으로 동기화 요청 (202 Accepted + 작업 ID 즉시 반환)
+    
+    이미 실행 중인 동기화가 있으면 그 작업에 병합됩니다.
+    증분/부분 동기화 중이면 후속 전체 동기화 작업(job.status="queued")을 반환합니다.
+    진행 상황: GET /api/v1/sync/jobs/{job_id}
+    """
     if not sync_manager:
         return {
             "success": False,
@@ -214,22 +350,24 @@ async def trigger_sync():
     
     print("\n🔄 수동 동기화 요청")
     
-    try:
-        from app.services.data_sync_service import DataSyncService
-        
-        service = DataSyncService(
-            api_key=sync_manager.api_key,
-            esntl_id=sync_manager.esntl_id
-        )
-        
-        result = await service.sync_all_data(max_pages=50)
-        return result
+    from app.services.sync_coordinator import get_sync_coordinator, job_summary
     
-    except Exception as e:
-        return {
-            "success": False,
-            "message": str(e)
-        }
+    job = get_sync_coordinator().trigger(
+        api_key=sync_manager.api_key,
+        esntl_id=sync_manager.esntl_id,
+        max_pages=50,
+        source="trigger"
+    )
+    
+    return JSONResponse(
+        status_code=202,
+        content=jsonable_encoder({
+            "success": True,
+            "job_id": job["job_id"],
+            "status_url": f"/api/v1/sync/jobs/{job['job_id']}",
+            "job": job_summary(job),
+        })
+    )
 
 
 if __name__ == "__main__":
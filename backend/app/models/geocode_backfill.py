@@ -0,0 +1,18 @@
+from sqlalchemy import Column, Integer, String, DateTime
+from app.models.missing_person import Base
+
+class GeocodeBackfill(Base):
+    """지오코딩 백필 진행 기록 (중단 후 재개용 커서)"""
+    __tablename__ = "geocode_backfills"
+
+    id = Column(Integer, primary_key=True, index=True)
+    name = Column(String(20), unique=True, index=True)  # 백필 이름 (지오코더 종류: router/kakao/naver)
+    status = Column(String(20), default="running")  # 상태 (running/paused/completed)
+    last_id = Column(Integer, default=0)  # 처리를 마친 마지막 missing_persons.id (키셋 커서)
+    processed = Column(Integer, default=0)  # 이번 회차에 처리한 행 수
+    geocoded = Column(Integer, default=0)  # 정밀 좌표 기록
+    approximated = Column(Integer, default=0)  # 지명 사전 대략 좌표 기록
+    failed = Column(Integer, default=0)  # 좌표를 구하지 못한 행
+    started_at = Column(DateTime)  # 이번 회차 시작 일시
+    updated_at = Column(DateTime)  # 마지막 배치 커밋 일시
+    completed_at = Column(DateTime, nullable=True)  # 완료 일시
@@ -0,0 +1,20 @@
+from sqlalchemy import Column, Integer, String, DateTime, Float, UniqueConstraint
+from app.models.missing_person import Base
+
+class GeocodeCache(Base):
+    """지오코딩 결과 캐시 모델 (Kakao/Naver 공용)"""
+    __tablename__ = "geocode_cache"
+    __table_args__ = (
+        UniqueConstraint("address_key", "provider", name="uq_geocode_cache_address_provider"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    address_key = Column(String, index=True)  # 정규화된 주소 (조회 키)
+    address = Column(String)  # 원본 주소 (예시)
+    provider = Column(String(20))  # 지오코딩 제공자 (kakao/naver)
+    status = Column(String(20), default="ok")  # 결과 (ok/not_found)
+    latitude = Column(Float, nullable=True)  # 위도 (not_found면 없음)
+    longitude = Column(Float, nullable=True)  # 경도
+    confidence = Column(Float, nullable=True)  # 매칭 신뢰도 (0~1, 도로명/지번/키워드)
+    fetched_at = Column(DateTime)  # 조회 일시
+    expires_at = Column(DateTime, index=True)  # 만료 일시 (지나면 다시 조회)
@@ -0,0 +1,15 @@
+from sqlalchemy import Column, Date, DateTime, Integer, String, UniqueConstraint
+from app.models.missing_person import Base
+
+class GeocodeQuotaUsage(Base):
+    """지오코딩 제공자별 일일 API 사용량 (재시작/여러 프로세스에서도 일일 한도 유지)"""
+    __tablename__ = "geocode_quota_usage"
+    __table_args__ = (
+        UniqueConstraint("provider", "usage_date", name="uq_geocode_quota_usage_provider_date"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    provider = Column(String(20))  # 속도 제한기 이름 (kakao/naver)
+    usage_date = Column(Date)  # 사용 날짜 (로컬 날짜 기준)
+    used = Column(Integer, default=0)  # 그날 보낸 요청 수
+    updated_at = Column(DateTime)  # 마지막 요청 일시
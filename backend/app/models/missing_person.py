@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, Float
+from sqlalchemy import Boolean, Column, Integer, String, DateTime, Float, Index
 from sqlalchemy.ext.declarative import declarative_base
 
 Base = declarative_base()
@@ -6,6 +6,13 @@ Base = declarative_base()
 class MissingPerson(Base):
     """실종자 정보 모델"""
     __tablename__ = "missing_persons"
+    __table_args__ = (
+        # GET /missing-persons 목록 조회용 (발생일 최신순 정렬 + 필터)
+        # 등호 조건(상태) → 정렬/범위(발생일) → 인덱스 안에서 거르는 조건(성별, 나이, 장애 여부) 순서
+        # → 정렬 없이 인덱스를 역순으로 읽고, 건수 계산은 테이블을 읽지 않음 (bench_query_plans.py)
+        Index("ix_missing_persons_status_date", "status", "missing_date", "gender", "age", "has_disability"),
+        Index("ix_missing_persons_date", "missing_date", "gender", "age", "has_disability"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     external_id = Column(String, unique=True, index=True)  # 실종자식별코드
@@ -14,9 +21,12 @@ class MissingPerson(Base):
     location_detail = Column(String, nullable=True)  # 착의사항/상세정보
     age = Column(Integer, nullable=True)  # 나이
     gender = Column(String(1), nullable=True)  # 성별 (M/F)
+    has_disability = Column(Boolean, default=False)  # 장애 여부 (수집 시 location_detail 키워드로 계산)
     latitude = Column(Float, nullable=True)  # 위도
     longitude = Column(Float, nullable=True)  # 경도
+    geocode_precision = Column(String(10), nullable=True)  # 좌표 정밀도 (address/sigungu/sido, 지명 사전은 대략값, 동봉 지명 사전은 시군구까지)
     status = Column(String(20), default="missing", index=True)  # 상태 (missing/resolved)
     resolved_at = Column(DateTime, nullable=True)  # 실종 해제 일시
+    content_hash = Column(String(40), nullable=True)  # API 데이터 지문 (변경 감지용)
     created_at = Column(DateTime)  # 생성일시
     updated_at = Column(DateTime)  # 수정일시
@@ -0,0 +1,53 @@
+from sqlalchemy import Column, Integer, String, DateTime, Float, Text
+from app.models.missing_person import Base
+
+class SyncRun(Base):
+    """동기화 실행 기록 모델"""
+    __tablename__ = "sync_runs"
+
+    id = Column(Integer, primary_key=True, index=True)
+    job_id = Column(String(32), index=True)  # 동기화 작업 ID
+    source = Column(String(20))  # 요청 출처 (auto/trigger/api)
+    mode = Column(String(20), default="full")  # 실행 방식 (full/partial/incremental/probe)
+    status = Column(String(20), index=True)  # 상태 (running/succeeded/failed/cancelled/skipped)
+    started_at = Column(DateTime, index=True)  # 시작 일시
+    finished_at = Column(DateTime, nullable=True)  # 종료 일시
+    duration = Column(Float, nullable=True)  # 전체 소요 시간 (초)
+    fetch_seconds = Column(Float, nullable=True)  # 수신 단계 소요 시간
+    parse_seconds = Column(Float, nullable=True)  # 파싱 단계 누적 시간
+    write_seconds = Column(Float, nullable=True)  # 저장 단계 누적 시간
+    resolve_seconds = Column(Float, nullable=True)  # 실종 해제 감지 소요 시간
+    total_count = Column(Integer, nullable=True)  # API totalCount
+    head_signature = Column(String(40), nullable=True)  # 첫 항목 지문 (변경 감지용)
+    pages_fetched = Column(Integer, default=0)  # 수신한 페이지 수
+    total_fetched = Column(Integer, default=0)  # 수신한 건수
+    new_added = Column(Integer, default=0)  # 새로 추가
+    updated = Column(Integer, default=0)  # 업데이트
+    unchanged = Column(Integer, default=0)  # 변경 없음
+    resolved = Column(Integer, default=0)  # 실종 해제
+    skipped = Column(Integer, default=0)  # 건너뜀
+    error_count = Column(Integer, default=0)  # 에러 수
+    error_samples = Column(Text, nullable=True)  # 에러 샘플 (JSON 배열, 최대 5건)
+
+
+class SyncCheckpoint(Base):
+    """동기화 체크포인트 (중단된 동기화 재개용)"""
+    __tablename__ = "sync_checkpoints"
+
+    id = Column(Integer, primary_key=True, index=True)
+    mode = Column(String(20), index=True)  # 실행 방식 (full / full:<분할 방식>)
+    status = Column(String(20), default="open", index=True)  # 상태 (open/completed/abandoned)
+    total_count = Column(Integer)  # 시작 시점 API totalCount (달라지면 재개하지 않음)
+    row_size = Column(Integer)  # 페이지 크기
+    completed_pages = Column(Text, default="")  # 저장까지 끝난 페이지 키 (쉼표 구분)
+    created_at = Column(DateTime)  # 생성 일시
+    updated_at = Column(DateTime)  # 마지막 갱신 일시
+    completed_at = Column(DateTime, nullable=True)  # 종료 일시
+
+
+class SyncSeenId(Base):
+    """체크포인트별로 API에서 수신한 external_id (실종 해제 감지용)"""
+    __tablename__ = "sync_seen_ids"
+
+    checkpoint_id = Column(Integer, primary_key=True)  # sync_checkpoints.id
+    external_id = Column(String, primary_key=True)  # 실종자식별코드
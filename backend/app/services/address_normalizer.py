@@ -0,0 +1,162 @@
+# -*- coding: utf-8 -*-
+"""
+한국 주소 정규화
+- 안전Dream occrAdres 는 같은 장소라도 공백, 괄호, 건물명, 약칭(서울시/서울특별시)이 제각각
+- 시도/시군구/읍면동/도로명 + 번지만 남긴 정규 키(normalize_address)를 만듦
+- 지오코딩 캐시 키와 중복 제거는 geocode_key(): 정규 키가 읍면동 또는 도로명 + 건물번호까지 남길 때만 정규 키,
+  시군구까지만 남는 주소("서대문구,이대역 부근")는 장소명이 위치를 정하므로 정리한 원문을 키로 사용
+  (정규 키로 묶으면 같은 구의 서로 다른 장소가 첫 장소의 좌표를 공유하게 됨)
+- 제공자 API 에는 건물명/장소명이 남은 clean_address() 원문을 보냄 (키워드 검색 단서)
+
+예) "서울시  강남구 역삼동 (역삼역 근처)"   → "서울특별시 강남구 역삼동"
+    "부산 사하구 승학로233번길 12, 101동"    → "부산광역시 사하구 승학로233번길 12"
+"""
+
+import re
+import unicodedata
+from functools import lru_cache
+from typing import Dict, Optional
+
+
+# 시도 약칭/옛 명칭 → 현재 정식 명칭
+SIDO_ALIASES = {
+    "서울특별시": ["서울", "서울시", "서울특별시"],
+    "부산광역시": ["부산", "부산시", "부산광역시"],
+    "대구광역시": ["대구", "대구시", "대구광역시"],
+    "인천광역시": ["인천", "인천시", "인천광역시"],
+    "광주광역시": ["광주", "광주시", "광주광역시"],
+    "대전광역시": ["대전", "대전시", "대전광역시"],
+    "울산광역시": ["울산", "울산시", "울산광역시"],
+    "세종특별자치시": ["세종", "세종시", "세종특별자치시"],
+    "경기도": ["경기", "경기도"],
+    "강원특별자치도": ["강원", "강원도", "강원특별자치도"],
+    "충청북도": ["충북", "충청북도"],
+    "충청남도": ["충남", "충청남도"],
+    "전북특별자치도": ["전북", "전라북도", "전북특별자치도"],
+    "전라남도": ["전남", "전라남도"],
+    "경상북도": ["경북", "경상북도"],
+    "경상남도": ["경남", "경상남도"],
+    "제주특별자치도": ["제주", "제주도", "제주특별자치도"],
+}
+
+_SIDO_LOOKUP = {alias: canonical for canonical, aliases in SIDO_ALIASES.items() for alias in aliases}
+
+# 괄호 안 내용 (건물명, 참고 항목)
+_PARENTHESES = re.compile(r"\([^)]*\)|\[[^\]]*\]")
+
+# 구분 기호 → 공백
+_SEPARATORS = re.compile(r"[,·/]")
+
+# 시군구: 수원시, 강남구, 청송군 / 읍면동리: 역삼동, 역삼1동, 종로1가, 오천읍, 승학리
+_SIGUNGU = re.compile(r"^[가-힣]+(시|군|구)$")
+_DONG = re.compile(r"^[가-힣0-9]+(동|읍|면|리|가)$")
+
+# 도로명: 테헤란로, 승학로233번길, 궁포1로
+_ROAD = re.compile(r"^[가-힣0-9]+(로|길)$")
+
+# 번지/건물번호: 12, 12-3, 산12-3, 12번지
+_NUMBER = re.compile(r"^(산)?\d+(-\d+)?(번지)?$")
+
+
+def _normalize_text(address: str) -> str:
+    """유니코드/괄호/구분 기호/공백 정리"""
+    text = unicodedata.normalize("NFC", address or "")
+    text = _PARENTHESES.sub(" ", text)
+    text = _SEPARATORS.sub(" ", text)
+    return " ".join(text.split())
+
+
+def clean_address(address: str) -> str:
+    """
+    제공자 API 검색어용 원문 정리 (유니코드/구분 기호/공백만 정리, 괄호·건물명·장소명은 유지)
+
+    예) "서울특별시 서대문구,이대역 부근" → "서울특별시 서대문구 이대역 부근"
+    """
+    text = unicodedata.normalize("NFC", address or "")
+    text = _SEPARATORS.sub(" ", text)
+    return " ".join(text.split())
+
+
+@lru_cache(maxsize=65536)
+def parse_address(address: str) -> Dict[str, Optional[str]]:
+    """
+    주소를 구성 요소로 분해
+
+    Returns:
+        {"sido", "sigungu", "dong", "road", "number"} (없는 요소는 None)
+    """
+    parts = {"sido": None, "sigungu": None, "dong": None, "road": None, "number": None}
+    tokens = _normalize_text(address).split()
+    if not tokens:
+        return parts
+
+    if tokens[0] in _SIDO_LOOKUP:
+        parts["sido"] = _SIDO_LOOKUP[tokens[0]]
+        tokens = tokens[1:]
+
+    sigungu = []
+    skipped = False  # 시군구 앞에 다른 단어(장소명 등)가 있었는지
+    for token in tokens:
+        if parts["number"]:
+            break  # 번지 뒤(동/호수, 건물명 등)는 버림
+        if _NUMBER.match(token):
+            if parts["road"] or parts["dong"]:
+                parts["number"] = token.replace("번지", "")
+            continue
+        if parts["road"] or parts["dong"]:
+            if _ROAD.match(token) and not parts["road"]:
+                parts["road"] = token
+                continue
+            break  # 읍면동/도로명 뒤의 건물명 등은 버림
+        if _SIGUNGU.match(token) and len(sigungu) < 2 and not skipped:
+            sigungu.append(token)  # "수원시 팔달구" 처럼 두 단계까지 (장소명 뒤의 "출구"/"입구" 등은 제외)
+        elif _ROAD.match(token):
+            parts["road"] = token
+        elif _DONG.match(token):
+            parts["dong"] = token
+        else:
+            skipped = True
+
+    if sigungu:
+        parts["sigungu"] = " ".join(sigungu)
+    return parts
+
+
+def normalize_address(address: str) -> str:
+    """
+    정규 주소 키 (시도 시군구 [읍면동] [도로명] [번지])
+
+    구성 요소를 하나도 찾지 못하면 공백만 정리한 원문을 반환합니다.
+    """
+    parts = parse_address(address or "")
+    if not any(parts.values()):
+        return _normalize_text(address)
+
+    # 도로명이 있으면 도로명 주소(도로명 + 건물번호), 없으면 지번 주소(읍면동 + 번지)
+    if parts["road"]:
+        ordered = [parts["sido"], parts["sigungu"], parts["road"], parts["number"]]
+    else:
+        ordered = [parts["sido"], parts["sigungu"], parts["dong"], parts["number"]]
+    return " ".join(part for part in ordered if part)
+
+
+def geocode_key(address: str) -> str:
+    """
+    지오코딩 캐시/중복 제거 키
+
+    정규 키가 읍면동 또는 도로명 + 건물번호까지 남기거나, 정규화로 버려지는 내용이 없으면 정규 키,
+    그 외(시군구 + 장소명 등)는 clean_address() 원문(시도 약칭만 정식 명칭으로)을 반환합니다.
+
+    예) "서울특별시 서대문구,이대역 부근"       → "서울특별시 서대문구 이대역 부근"
+        "서울 서대문구 신촌역 3번출구"          → "서울특별시 서대문구 신촌역 3번출구"
+        "서울시 서대문구"                      → "서울특별시 서대문구"
+    """
+    parts = parse_address(address or "")
+    if parts["dong"] or (parts["road"] and parts["number"]):
+        return normalize_address(address)
+
+    tokens = clean_address(address).split()
+    if parts["sido"] and tokens and tokens[0] in _SIDO_LOOKUP:
+        tokens = [parts["sido"]] + tokens[1:]
+    # 정규화로 버려지는 내용이 없으면(장소명 없음) 정규 키와 같아짐
+    return " ".join(tokens)
@@ -0,0 +1,245 @@
+# -*- coding: utf-8 -*-
+"""
+실종자 데이터 일괄 저장 엔진
+- 기존 external_id를 한 번의 쿼리로 미리 로드
+- INSERT ... ON CONFLICT(external_id) DO UPDATE 를 executemany 배치로 실행
+- 건별 SELECT / ORM 객체 변경 없이 추가/업데이트/건너뜀 개수 집계
+- content_hash 비교로 실제 변경된 행만 기록 (변경 없음은 unchanged)
+- 수신한 external_id를 체크포인트별 적재 테이블에 기록 → 실종 해제는 UPDATE 한 번으로 처리
+- 새 행은 오프라인 지명 사전으로 대략적인 좌표를 바로 채움 (정밀 좌표는 지오코딩 단계에서)
+- 새로 추가되었거나 주소가 바뀐 행은 지오코딩 대상으로 모아 둠 (GeocodeQueue 로 전달)
+"""
+
+import hashlib
+import json
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import bindparam, func, select
+from sqlalchemy.orm import Session
+
+from app.models.missing_person import MissingPerson
+from app.models.sync_run import SyncSeenId
+from app.services.gazetteer import approximate
+from app.services.safe_dream_decoder import DERIVED_COLUMNS
+
+
+# 한 번의 executemany로 보낼 최대 행 수
+DEFAULT_BATCH_SIZE = 500
+
+# API 데이터로 덮어쓰지 않는 컬럼 (지오코딩 결과 보존)
+PRESERVED_COLUMNS = ("latitude", "longitude", "geocode_precision")
+
+
+def compute_content_hash(parsed: Dict) -> str:
+    """파싱된 API 데이터의 안정적인 지문 (필드 순서/좌표와 무관)"""
+    payload = {
+        key: value.isoformat() if isinstance(value, datetime) else value
+        for key, value in parsed.items()
+        if key not in PRESERVED_COLUMNS and key not in DERIVED_COLUMNS and key != "content_hash"
+    }
+    encoded = json.dumps(payload, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha1(encoded.encode("utf-8")).hexdigest()
+
+
+def coordinate_update(key_column: str = "external_id"):
+    """
+    좌표 일괄 기록용 UPDATE 문 (executemany 파라미터: target_key, target_address, latitude, longitude, precision, now)
+
+    지오코딩하는 동안 주소가 바뀐 행은 건너뜀 (WHERE location_address = 요청한 주소)
+    """
+    persons = MissingPerson.__table__
+    return (
+        persons.update()
+        .where(persons.c[key_column] == bindparam("target_key"))
+        .where(persons.c.location_address == bindparam("target_address"))
+        .values(
+            latitude=bindparam("latitude"),
+            longitude=bindparam("longitude"),
+            geocode_precision=bindparam("precision"),
+            updated_at=bindparam("now")
+        )
+    )
+
+
+def _dialect_insert(dialect_name: str):
+    """DB 종류에 맞는 ON CONFLICT 지원 insert 함수 반환"""
+    if dialect_name == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+    elif dialect_name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        raise NotImplementedError(f"지원하지 않는 DB입니다: {dialect_name}")
+    return insert
+
+
+class MissingPersonBulkWriter:
+    """missing_persons 테이블 일괄 upsert 엔진"""
+
+    def __init__(
+        self,
+        db: Session,
+        checkpoint_id: Optional[int] = None,
+        batch_size: int = DEFAULT_BATCH_SIZE
+    ):
+        """
+        Args:
+            db: 데이터베이스 세션
+            checkpoint_id: 수신 ID를 적재할 체크포인트 (None이면 적재/실종 해제 감지 안 함)
+            batch_size: executemany 배치 크기
+        """
+        self.db = db
+        self.checkpoint_id = checkpoint_id
+        self.batch_size = batch_size
+        self._existing: Optional[Dict[str, Tuple[Optional[str], Optional[str], Optional[str]]]] = None
+        self._geocode_targets: List[Tuple[str, str]] = []
+        self._insert = _dialect_insert(self.db.get_bind().dialect.name)
+        self._upsert = self._build_upsert()
+        self._stage = self._insert(SyncSeenId.__table__).on_conflict_do_nothing()
+
+    def _build_upsert(self):
+        """external_id 충돌 시 업데이트하는 upsert 문 생성"""
+        insert = self._insert
+        persons = MissingPerson.__table__
+        stmt = insert(persons)
+
+        update_columns = {
+            col.name: stmt.excluded[col.name]
+            for col in persons.columns
+            if col.name not in ("id", "external_id", "created_at")
+            and col.name not in PRESERVED_COLUMNS
+        }
+
+        return stmt.on_conflict_do_update(
+            index_elements=[persons.c.external_id],
+            set_=update_columns
+        )
+
+    def _stage_ids(self, external_ids: List[str]):
+        """수신한 external_id를 체크포인트별 적재 테이블에 기록 (중복 무시)"""
+        if not external_ids or self.checkpoint_id is None:
+            return
+        self.db.execute(
+            self._stage,
+            [
+                {"checkpoint_id": self.checkpoint_id, "external_id": external_id}
+                for external_id in external_ids
+            ]
+        )
+
+    def count_staged(self) -> int:
+        """이번 동기화(체크포인트)에서 수신한 고유 external_id 개수"""
+        return self.db.execute(
+            select(func.count())
+            .select_from(SyncSeenId)
+            .where(SyncSeenId.checkpoint_id == self.checkpoint_id)
+        ).scalar()
+
+    def resolve_unseen(self) -> int:
+        """
+        실종 중이지만 이번 동기화에서 수신되지 않은 사람을 실종 해제 처리
+
+        Returns:
+            실종 해제된 행 수
+        """
+        if self.checkpoint_id is None:
+            raise ValueError("체크포인트 없이 실종 해제 감지를 실행할 수 없습니다")
+
+        now = datetime.now()
+        persons = MissingPerson.__table__
+        staged_ids = select(SyncSeenId.external_id).where(
+            SyncSeenId.checkpoint_id == self.checkpoint_id
+        )
+        stmt = (
+            persons.update()
+            .where(persons.c.status == "missing")
+            .where(persons.c.external_id.not_in(staged_ids))
+            .values(status="resolved", resolved_at=now, updated_at=now)
+        )
+        resolved = self.db.execute(stmt).rowcount
+        self._existing = None  # 상태가 바뀌었으므로 캐시 무효화
+        return resolved
+
+    def load_existing(self) -> Dict[str, Tuple[Optional[str], Optional[str], Optional[str]]]:
+        """DB에 있는 {external_id: (content_hash, status, location_address)} 전체를 한 번의 쿼리로 로드"""
+        if self._existing is None:
+            rows = self.db.execute(select(
+                MissingPerson.external_id,
+                MissingPerson.content_hash,
+                MissingPerson.status,
+                MissingPerson.location_address
+            ))
+            self._existing = {row[0]: (row[1], row[2], row[3]) for row in rows if row[0]}
+        return self._existing
+
+    def take_geocode_targets(self) -> List[Tuple[str, str]]:
+        """지난 호출 이후 모인 지오코딩 대상 [(external_id, location_address)] 반환 후 비움"""
+        targets, self._geocode_targets = self._geocode_targets, []
+        return targets
+
+    def write(self, parsed_rows: List[Optional[Dict]]) -> Dict[str, int]:
+        """
+        파싱된 실종자 데이터를 일괄 저장 (변경된 행만 기록)
+
+        Args:
+            parsed_rows: parse_missing_person() 결과 리스트 (None 포함 가능)
+
+        Returns:
+            {"added": n, "updated": n, "unchanged": n, "skipped": n}
+            (지오코딩 대상은 take_geocode_targets()로 가져감)
+        """
+        existing = self.load_existing()
+        counts = {"added": 0, "updated": 0, "unchanged": 0, "skipped": 0}
+        now = datetime.now()
+        batch = []
+        seen_ids = []
+
+        for parsed in parsed_rows:
+            if not parsed or not parsed.get("external_id"):
+                counts["skipped"] += 1
+                continue
+
+            external_id = parsed["external_id"]
+            seen_ids.append(external_id)
+            content_hash = compute_content_hash(parsed)
+            previous = existing.get(external_id)
+
+            address = parsed.get("location_address")
+            if previous is None:
+                counts["added"] += 1
+            elif previous[:2] == (content_hash, "missing"):
+                # 내용도 같고 여전히 실종 중 → 쓰기 생략
+                counts["unchanged"] += 1
+                continue
+            else:
+                counts["updated"] += 1
+
+            # 새 행 또는 주소가 바뀐 행 → 좌표를 다시 구해야 함
+            if address and (previous is None or previous[2] != address):
+                self._geocode_targets.append((external_id, address))
+
+            existing[external_id] = (content_hash, "missing", address)
+            row = {
+                **parsed,
+                "geocode_precision": None,
+                "content_hash": content_hash,
+                # API에 나타났으므로 실종 중으로 복원
+                "status": "missing",
+                "resolved_at": None,
+                "created_at": now,
+                "updated_at": now,
+            }
+            if previous is None and address:
+                # 새 행은 지명 사전 좌표로 바로 지도에 표시 (기존 행의 좌표는 upsert가 보존)
+                row.update(approximate(address) or {})
+            batch.append(row)
+
+            if len(batch) >= self.batch_size:
+                self.db.execute(self._upsert, batch)
+                batch = []
+
+        if batch:
+            self.db.execute(self._upsert, batch)
+
+        self._stage_ids(seen_ids)
+        return counts
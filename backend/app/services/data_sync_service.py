@@ -3,62 +3,156 @@
 안전Dream API 데이터 동기화 서비스 (마지막 페이지 오류 수정 버전)
 - totalCount 기반 페이지 수 계산
 - 마지막 페이지는 남은 개수만큼만 요청 ✅
+- 2페이지부터는 제한된 동시성으로 병렬 요청 ✅
+- 실패한 페이지는 지수 백오프로 재시도, 완료 페이지는 체크포인트에 기록 → 중단 후 재개 ✅
+- 증분 모드: 마지막으로 받은 발생일(high-water mark) - 겹침 기간 이후만 요청 ✅
+- 새로 추가되었거나 주소가 바뀐 행은 백그라운드 지오코딩 큐로 전달 → 수동 스크립트 없이 지도에 표시 ✅
 """
 
 import asyncio
 import math
-from datetime import datetime
-from typing import Dict, List
+import os
+import random
+import time
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
 
 try:
     from sqlalchemy.orm import Session
     from app.services.safe_dream_api import SafeDreamAPI
     from app.models.missing_person import MissingPerson
     from app.database.db import SessionLocal
+    from app.services.bulk_writer import MissingPersonBulkWriter
+    from app.services.sync_checkpoint import SyncCheckpointStore
+    from app.services.fetch_planner import DATE_PARAM_FORMAT, page_key, plan_partitions
+    from app.services.geocode_queue import GEOCODE_ON_SYNC, GeocodeQueue, get_geocode_queue
+    from sqlalchemy import func
     SQLALCHEMY_AVAILABLE = True
 except ImportError:
     SQLALCHEMY_AVAILABLE = False
     print("⚠️  SQLAlchemy를 찾을 수 없습니다.")
 
 
+# 동시에 요청할 최대 페이지 수 (API 부하 방지)
+DEFAULT_FETCH_CONCURRENCY = int(os.getenv("SAFE_DREAM_FETCH_CONCURRENCY", "5"))
+
+# 페이지 요청 실패 시 재시도 횟수와 백오프 기본 지연 (초)
+FETCH_RETRIES = int(os.getenv("SAFE_DREAM_FETCH_RETRIES", "3"))
+FETCH_RETRY_BASE_DELAY = float(os.getenv("SAFE_DREAM_FETCH_RETRY_BASE_DELAY", "0.5"))
+
+# 전체 동기화 분할 수집 방식 (target/region/date, 비어 있으면 분할하지 않음)
+DEFAULT_PARTITION_BY = os.getenv("SAFE_DREAM_PARTITION_BY") or None
+
+# 증분 동기화 겹침 기간 (일) - 늦게 등록되거나 수정된 건을 놓치지 않도록 high-water mark보다 앞에서 시작
+INCREMENTAL_OVERLAP_DAYS = int(os.getenv("INCREMENTAL_SYNC_OVERLAP_DAYS", "7"))
+
+
 class DataSyncService:
     """데이터 동기화 서비스"""
     
-    def __init__(self, api_key: str, esntl_id: str = "10000855"):
+    def __init__(
+        self,
+        api_key: str,
+        esntl_id: str = "10000855",
+        concurrency: int = DEFAULT_FETCH_CONCURRENCY,
+        api_client: Optional["SafeDreamAPI"] = None,
+        geocode: Optional[bool] = None,
+        geocode_queue: Optional["GeocodeQueue"] = None
+    ):
+        """
+        Args:
+            api_key: 안전Dream API 키
+            esntl_id: 발급 ID
+            concurrency: 동시에 요청할 최대 페이지 수
+            api_client: 사용할 API 클라이언트 (재생/합성 트랜스포트 주입용, 기본: 실제 API)
+            geocode: 새로 추가/주소 변경된 행을 지오코딩 큐로 보낼지 여부 (기본: GEOCODE_ON_SYNC)
+            geocode_queue: 사용할 지오코딩 큐 (기본: 공용 큐)
+        """
         if not SQLALCHEMY_AVAILABLE:
             raise ImportError("SQLAlchemy가 설치되지 않았습니다")
         
-        self.api_client = SafeDreamAPI(api_key=api_key, esntl_id=esntl_id)
+        self.api_client = api_client or SafeDreamAPI(api_key=api_key, esntl_id=esntl_id)
+        self.concurrency = max(1, concurrency)
+        if geocode is None:
+            geocode = GEOCODE_ON_SYNC
+        self.geocode_queue = (geocode_queue or get_geocode_queue()) if geocode else None
+        self._progress: Optional[Dict] = None
     
-    async def sync_all_data(self, max_pages: int = 50) -> Dict:
-        """모든 데이터 동기화 (최적화)"""
+    async def sync_all_data(
+        self,
+        max_pages: int = 50,
+        progress: Optional[Dict] = None,
+        resolve: bool = True,
+        partition_by: Optional[str] = DEFAULT_PARTITION_BY,
+        incremental: bool = False
+    ) -> Dict:
+        """
+        모든 데이터 동기화 (fetch → parse → write 스트리밍 파이프라인)
+
+        Args:
+            max_pages: 최대 요청 페이지 수 (분할 수집이면 파티션당)
+            progress: 진행 상황을 기록할 딕셔너리 (동기화 작업 조회용, 선택)
+            resolve: 실종 해제 감지 실행 여부 (앞쪽 몇 페이지만 받는 부분 동기화는 False)
+                     전체 동기화는 체크포인트를 사용하며, 모든 페이지를 받은 경우에만 실종 해제 감지
+            partition_by: 분할 수집 방식 (target/region/date, None이면 분할하지 않음)
+            incremental: 증분 모드 (발생일이 high-water mark - 겹침 기간 이후인 건만 요청,
+                         실종 해제 감지와 분할 수집은 하지 않음)
+        """
         print("\n" + "="*60)
         print("🚀 안전Dream API 데이터 동기화 시작")
         print("="*60 + "\n")
         
+        self._progress = progress
         result = {
             "success": True,
+            "total_count": 0,  # API totalCount
+            "head_signature": None,  # 첫 항목 지문 (변경 감지용)
             "total_fetched": 0,
+            "pages_fetched": 0,
+            "rows_written": 0,  # 실제로 기록된 행 (추가 + 업데이트)
             "new_added": 0,
             "updated": 0,
+            "unchanged": 0,  # 변경 없음 (쓰기 생략)
             "skipped": 0,
             "resolved": 0,  # 실종 해제
+            "geocode_queued": 0,  # 지오코딩 큐로 보낸 행 (추가 + 주소 변경)
+            "since": None,  # 증분 모드 요청 시작일 (detailDate1)
+            "crawl_complete": False,  # 모든 페이지 수신/저장 완료 여부
+            "resumed_pages": 0,  # 이전 체크포인트에서 이어받아 건너뛴 페이지 수
+            "duplicates": 0,  # 파티션 간 중복으로 제외한 항목 수
+            "failed_pages": [],  # 재시도 후에도 실패한 페이지
+            "parse_errors": [],  # 파싱 에러 메시지 (출력 대신 수집)
             "errors": [],
+            "timings": {"fetch": 0.0, "parse": 0.0, "write": 0.0, "resolve": 0.0},  # 단계별 소요 시간 (초)
             "start_time": datetime.now(),
         }
         
         db = SessionLocal()
         
         try:
-            all_persons = []
             row_size = 100  # 기본 페이지 크기
+            self._report(result, "fetching")
+            
+            base_filters = {}
+            if incremental:
+                # ✅ 증분 모드: 전체 이력 대신 최근 발생 건만 요청 (해제 감지는 정기 전체 동기화에서)
+                resolve = False
+                partition_by = None
+                since = await asyncio.to_thread(self._incremental_since, db)
+                if since:
+                    result["since"] = since
+                    base_filters["detail_date1"] = since.strftime(DATE_PARAM_FORMAT)
+                    print(f"⏩ 증분 동기화: 발생일 {since:%Y-%m-%d} 이후 (겹침 {INCREMENTAL_OVERLAP_DAYS}일)")
+                else:
+                    print("⚠️  기존 데이터 없음 → 전체 이력 요청 (실종 해제 감지 생략)")
             
             # ✅ 첫 페이지에서 전체 개수 확인
             print(f"📄 페이지 1: 조회 중 (전체 개수 확인)...")
-            first_response = await self.api_client.get_missing_children(
-                row_size=row_size,
-                page_num=1
+            started = time.perf_counter()
+            first_response = await self._fetch_with_retry(
+                row_size=row_size, page_num=1, filters=base_filters
             )
+            result["timings"]["fetch"] += time.perf_counter() - started
             
             if not first_response.get("success", False):
                 error_msg = f"API 호출 실패: {first_response.get('msg')}"
@@ -67,140 +161,126 @@ class DataSyncService:
                 result["success"] = False
                 return result
             
-            # ✅ 전체 데이터 개수와 필요한 페이지 수 계산
+            # ✅ 전체 데이터 개수 확인 (분할 수집의 완료 판정 기준)
             total_count = first_response.get("totalCount", 0)
             first_list = first_response.get("list", [])
+            result["total_count"] = total_count
+            result["head_signature"] = self.api_client.head_signature(first_list)
             
             if total_count > 0:
-                # 필요한 페이지 수 계산
-                needed_pages = math.ceil(total_count / row_size)
-                actual_pages = min(needed_pages, max_pages)
-                
                 print(f"📊 전체 데이터: {total_count}건")
-                print(f"📄 필요한 페이지: {needed_pages}페이지")
-                print(f"📄 요청할 페이지: {actual_pages}페이지 (최대 {max_pages}페이지)\n")
             else:
                 print("⚠️  전체 데이터 개수를 확인할 수 없습니다. 빈 페이지까지 요청합니다.\n")
-                actual_pages = max_pages
-            
-            # 첫 페이지 데이터 추가
-            if first_list:
-                print(f"   ✅ 페이지 1: {len(first_list)}건 데이터 수신")
-                all_persons.extend(first_list)
-                result["total_fetched"] += len(first_list)
             
-            # ✅ 나머지 페이지 요청
-            for page in range(2, actual_pages + 1):
-                # 🎯 마지막 페이지는 남은 개수만큼만 요청!
+            # ✅ 분할 수집 계획 (부분 동기화는 항상 분할하지 않음)
+            partition_by = partition_by if resolve else None
+            partitions = plan_partitions(partition_by)
+            if not partition_by:
+                partitions[0]["filters"].update(base_filters)
+            if partition_by:
+                print(f"🧩 분할 수집: {partition_by} 기준 {len(partitions)}개 파티션 (파티션당 최대 {max_pages}페이지)")
+                plans = await self._plan_partitions(partitions, row_size, max_pages, result)
+            else:
+                plans = [self._page_plan(partitions[0], total_count, first_list, row_size, max_pages)]
                 if total_count > 0:
-                    already_fetched = (page - 1) * row_size
-                    remaining = total_count - already_fetched
-                    current_row_size = min(row_size, remaining)
-                else:
-                    current_row_size = row_size
-                
-                print(f"📄 페이지 {page}/{actual_pages}: 조회 중 (요청 크기: {current_row_size}건)...")
-                
-                response = await self.api_client.get_missing_children(
-                    row_size=current_row_size,  # ← 동적으로 계산된 크기!
-                    page_num=page
+                    print(f"📄 필요한 페이지: {plans[0]['needed_pages']}페이지")
+                    print(f"📄 요청할 페이지: {plans[0]['pages']}페이지 (최대 {max_pages}페이지)\n")
+            
+            # ✅ 전체 동기화는 체크포인트 사용 (같은 totalCount의 중단된 동기화가 있으면 이어받기)
+            store = SyncCheckpointStore(db)
+            checkpoint = None
+            completed_pages = set()
+            if resolve:
+                checkpoint_mode = f"full:{partition_by}" if partition_by else "full"
+                checkpoint, completed_pages = await asyncio.to_thread(
+                    store.open, checkpoint_mode, total_count, row_size
                 )
-                
-                if not response.get("success", False):
-                    error_msg = f"페이지 {page} 실패: {response.get('msg')}"
-                    print(f"❌ {error_msg}")
-                    result["errors"].append(error_msg)
-                    # 에러 발생 시 중단
-                    break
-                
-                persons_list = response.get("list", [])
-                
-                # ✅ 빈 페이지면 즉시 중단
-                if not persons_list or len(persons_list) == 0:
-                    print(f"   ℹ️  페이지 {page}에 데이터 없음. 동기화 종료.\n")
-                    break
-                
-                print(f"   ✅ 페이지 {page}: {len(persons_list)}건 데이터 수신")
-                all_persons.extend(persons_list)
-                result["total_fetched"] += len(persons_list)
-                
-                # API 부하 방지
-                await asyncio.sleep(0.5)
+                # 각 파티션의 1페이지는 이미 받았으므로 다시 저장
+                completed_pages -= {page_key(plan["partition"], 1) for plan in plans}
             
+            self._report(result, "fetching", total_count=total_count)
+            
+            print("\n" + "-"*60)
+            print("💾 수신과 동시에 데이터베이스 저장 시작...")
+            print("-"*60 + "\n")
+            
+            # ✅ 단계 사이는 크기 제한 큐로 연결 → 메모리 사용량 일정
+            page_queue: asyncio.Queue = asyncio.Queue(maxsize=self.concurrency * 2)
+            write_queue: asyncio.Queue = asyncio.Queue(maxsize=self.concurrency * 2)
+            writer = MissingPersonBulkWriter(
+                db, checkpoint_id=checkpoint.id if checkpoint else None
+            )
+            
+            started = time.perf_counter()
+            await asyncio.to_thread(writer.load_existing)
+            result["timings"]["write"] += time.perf_counter() - started
+            
+            await self._run_pipeline(
+                self._fetch_stage(page_queue, plans, row_size, completed_pages, result),
+                self._parse_stage(page_queue, write_queue, result),
+                self._write_stage(write_queue, writer, store, checkpoint, result),
+            )
+            
+            if result["resumed_pages"]:
+                print(f"♻️  체크포인트 {checkpoint.id}에서 재개: {result['resumed_pages']}페이지 건너뜀")
             print(f"\n📊 총 {result['total_fetched']}건의 데이터 수신 완료")
+            if result["duplicates"]:
+                print(f"🔁 파티션 간 중복 제거: {result['duplicates']}건")
 
             # 예상 개수와 실제 개수 비교
-            if total_count > 0 and result['total_fetched'] != total_count:
+            if not partition_by and total_count > 0 and result['total_fetched'] != total_count:
                 print(f"⚠️  예상 {total_count}건 vs 실제 {result['total_fetched']}건")
 
-            # ✅ API에서 받아온 external_id 목록 수집
-            api_external_ids = set()
-            for item in all_persons:
-                parsed = self.api_client.parse_missing_person(item)
-                if parsed and parsed.get("external_id"):
-                    api_external_ids.add(parsed["external_id"])
-
-            print(f"\n🔍 API에서 받은 실종자 ID: {len(api_external_ids)}개")
-
-            # ✅ DB에서 현재 실종 중인 사람들의 ID 가져오기
-            current_missing = db.query(MissingPerson).filter(
-                MissingPerson.status == "missing"
-            ).all()
+            # ✅ 실패한 페이지 없이 모든 파티션의 필요한 페이지를 다 받은 경우에만 완료
+            result["crawl_complete"] = (
+                bool(plans)
+                and all(
+                    plan["needed_pages"] is not None and plan["needed_pages"] <= max_pages
+                    for plan in plans
+                )
+                and not result["failed_pages"]
+            )
+            
+            if partition_by and result["crawl_complete"]:
+                # 분할 조건이 모든 데이터를 덮는지 확인 (지역/발생일이 비어 있는 건은 빠질 수 있음)
+                staged_count = await asyncio.to_thread(writer.count_staged)
+                if total_count <= 0 or staged_count < total_count:
+                    print(f"⚠️  분할 수집 {staged_count}건 < 전체 {total_count}건 → 누락 가능성")
+                    result["crawl_complete"] = False
+            
+            if resolve and result["crawl_complete"]:
+                self._report(result, "resolving")
+                started = time.perf_counter()
+                staged_count = await asyncio.to_thread(writer.count_staged)
+                print(f"\n🔍 API에서 받은 실종자 ID: {staged_count}개")
 
-            current_missing_ids = {p.external_id for p in current_missing}
-            print(f"📊 DB에 실종 중인 사람: {len(current_missing_ids)}명")
+                # ✅ API에 없지만 DB에는 실종 중으로 있는 사람들 = 실종 해제! (DB에서 한 번에 처리)
+                def resolve_unseen():
+                    resolved = writer.resolve_unseen()
+                    db.commit()
+                    store.finish(checkpoint)
+                    return resolved
 
-            # ✅ API에 없지만 DB에는 실종 중으로 있는 사람들 = 실종 해제!
-            resolved_ids = current_missing_ids - api_external_ids
-            result["resolved"] = len(resolved_ids)
+                result["resolved"] = await asyncio.to_thread(resolve_unseen)
+                result["timings"]["resolve"] = time.perf_counter() - started
 
-            if resolved_ids:
-                print(f"\n🎉 실종 해제 감지: {len(resolved_ids)}명")
-                for person in current_missing:
-                    if person.external_id in resolved_ids:
-                        person.status = "resolved"
-                        person.resolved_at = datetime.now()
-                        person.updated_at = datetime.now()
-                        print(f"   ✅ 실종 해제: {person.location_address[:40]} (ID: {person.external_id})")
-                db.commit()
+                if result["resolved"]:
+                    print(f"\n🎉 실종 해제 감지: {result['resolved']}명")
+                else:
+                    print("\n📌 실종 해제된 사람 없음")
+            elif resolve:
+                if result["failed_pages"]:
+                    print(f"\n⚠️  실패한 페이지 {result['failed_pages']} → 실종 해제 감지 생략 (다음 동기화에서 재개)")
+                else:
+                    print("\n⚠️  전체 페이지를 받지 못함 → 실종 해제 감지 생략")
+            elif incremental:
+                print("\n⏭️  증분 동기화: 실종 해제 감지 생략 (정기 전체 동기화에서 처리)")
             else:
-                print("\n📌 실종 해제된 사람 없음")
-
-            print("\n" + "-"*60)
-            print("💾 데이터베이스 저장 시작...")
-            print("-"*60 + "\n")
-
-            for idx, item in enumerate(all_persons, 1):
-                try:
-                    sync_result = self._sync_person(item, db)
-                    
-                    if sync_result == "added":
-                        result["new_added"] += 1
-                        if result["new_added"] <= 10:  # 처음 10개만 출력
-                            print(f"✅ [{idx}/{len(all_persons)}] 새 데이터 추가: {item.get('occrAdres', 'N/A')[:40]}")
-                    elif sync_result == "updated":
-                        result["updated"] += 1
-                        if result["updated"] <= 10:  # 처음 10개만 출력
-                            print(f"🔄 [{idx}/{len(all_persons)}] 데이터 업데이트: {item.get('occrAdres', 'N/A')[:40]}")
-                    elif sync_result == "skipped":
-                        result["skipped"] += 1
-                    
-                    # 주기적으로 커밋
-                    if idx % 50 == 0:
-                        db.commit()
-                        print(f"   💾 {idx}건 저장 완료")
-                
-                except Exception as e:
-                    error_msg = f"데이터 저장 실패 (항목 {idx}): {str(e)}"
-                    result["errors"].append(error_msg)
-                    if len(result["errors"]) <= 5:  # 처음 5개만 출력
-                        print(f"❌ {error_msg}")
-                    continue
-            
-            db.commit()
+                print("\n⏭️  부분 동기화: 실종 해제 감지 생략")
             
             result["end_time"] = datetime.now()
             result["duration"] = (result["end_time"] - result["start_time"]).total_seconds()
+            self._report(result, "done")
             
             print("\n" + "="*60)
             print("✅ 데이터 동기화 완료!")
@@ -210,10 +290,14 @@ class DataSyncService:
    • 전체 수신: {result['total_fetched']}건
    • 새로 추가: {result['new_added']}건
    • 업데이트: {result['updated']}건
+   • 변경 없음: {result['unchanged']}건
    • 실종 해제: {result['resolved']}건 🎉
-   • 건너뜀: {result['skipped']}건
+   • 지오코딩 대기열: {result['geocode_queued']}건
+   • 건너뜀: {result['skipped']}건 (파싱 에러 {len(result['parse_errors'])}건)
+   • 재개로 건너뛴 페이지: {result['resumed_pages']}페이지
    • 에러: {len(result['errors'])}건
    • 소요 시간: {result['duration']:.2f}초
+     (수신 {result['timings']['fetch']:.2f}초 / 파싱 {result['timings']['parse']:.2f}초 / 저장 {result['timings']['write']:.2f}초 / 해제 감지 {result['timings']['resolve']:.2f}초)
             """)
             
             if result["errors"]:
@@ -223,11 +307,17 @@ class DataSyncService:
                 if len(result["errors"]) > 5:
                     print(f"   ... 외 {len(result['errors']) - 5}건")
             
+            if result["parse_errors"]:
+                print("\n⚠️  파싱 에러 예시:")
+                for error in result["parse_errors"][:3]:
+                    print(f"   - {error}")
+            
             print("="*60 + "\n")
             
         except Exception as e:
             result["success"] = False
             result["errors"].append(f"동기화 중 치명적 오류: {str(e)}")
+            self._report(result, "failed")
             print(f"\n❌ 치명적 오류 발생: {str(e)}\n")
             import traceback
             traceback.print_exc()
@@ -238,37 +328,274 @@ class DataSyncService:
         
         return result
     
-    def _sync_person(self, item: Dict, db: Session) -> str:
-        """개별 실종자 데이터 동기화"""
-        parsed = self.api_client.parse_missing_person(item)
-
-        if not parsed or not parsed.get("external_id"):
-            return "skipped"
-
-        existing = db.query(MissingPerson).filter(
-            MissingPerson.external_id == parsed["external_id"]
-        ).first()
-
-        if existing:
-            # 기존 데이터 업데이트
-            for key, value in parsed.items():
-                setattr(existing, key, value)
-            # API에 다시 나타났으므로 실종 중으로 복원
-            existing.status = "missing"
-            existing.resolved_at = None
-            existing.updated_at = datetime.now()
-            return "updated"
+    def _incremental_since(self, db: "Session") -> Optional[datetime]:
+        """증분 동기화 시작일 = DB에 있는 가장 최근 발생일(high-water mark) - 겹침 기간"""
+        high_water_mark = db.query(func.max(MissingPerson.missing_date)).scalar()
+        if high_water_mark is None:
+            return None
+        return high_water_mark - timedelta(days=INCREMENTAL_OVERLAP_DAYS)
+    
+    def _report(self, result: Dict, phase: Optional[str] = None, **extra):
+        """진행 상황 딕셔너리 갱신 (워커 스레드에서 기록, API에서 조회)"""
+        if self._progress is None:
+            return
+        if phase:
+            self._progress["phase"] = phase
+        self._progress.update(extra)
+        for key in ("pages_fetched", "total_fetched", "rows_written"):
+            self._progress[key] = result[key]
+    
+    async def _run_pipeline(self, *stages):
+        """파이프라인 단계를 동시에 실행 (한 단계가 실패하면 나머지 취소)"""
+        tasks = [asyncio.create_task(stage) for stage in stages]
+        try:
+            await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+    
+    def _page_plan(
+        self,
+        partition: Dict,
+        total_count: int,
+        first_list: List[Dict],
+        row_size: int,
+        max_pages: int
+    ) -> Dict:
+        """파티션의 1페이지 응답으로 요청할 페이지 수 계산"""
+        if total_count > 0:
+            needed_pages = math.ceil(total_count / row_size)
+            pages = min(needed_pages, max_pages)
+        elif partition["key"] and not first_list:
+            # 분할 조건에 해당하는 데이터 없음
+            needed_pages = pages = 0
         else:
-            # 새로운 실종자 추가
-            new_person = MissingPerson(
-                **parsed,
-                status="missing",  # 기본값: 실종 중
-                resolved_at=None,
-                created_at=datetime.now(),
-                updated_at=datetime.now()
+            needed_pages = None  # 전체 개수 미확인 → 빈 페이지까지 요청
+            pages = max_pages
+        
+        return {
+            "partition": partition,
+            "total_count": total_count,
+            "first_list": first_list,
+            "needed_pages": needed_pages,
+            "pages": pages,
+        }
+    
+    async def _plan_partitions(
+        self,
+        partitions: List[Dict],
+        row_size: int,
+        max_pages: int,
+        result: Dict
+    ) -> List[Dict]:
+        """각 파티션의 1페이지를 병렬로 받아 파티션별 페이지 계획 생성"""
+        semaphore = asyncio.Semaphore(self.concurrency)
+        started = time.perf_counter()
+        
+        async def plan(partition):
+            async with semaphore:
+                response = await self._fetch_with_retry(
+                    row_size=row_size, page_num=1, filters=partition["filters"]
+                )
+            
+            if not response.get("success", False):
+                key = page_key(partition, 1)
+                error_msg = f"파티션 {partition['key']} 실패: {response.get('msg')}"
+                print(f"❌ {error_msg}")
+                result["errors"].append(error_msg)
+                result["failed_pages"].append(key)
+                return None
+            
+            page_plan = self._page_plan(
+                partition, response.get("totalCount", 0), response.get("list", []),
+                row_size, max_pages
+            )
+            print(f"   🧩 {partition['key']}: {page_plan['total_count']}건 → {page_plan['pages']}페이지")
+            return page_plan
+        
+        plans = await asyncio.gather(*(plan(partition) for partition in partitions))
+        result["timings"]["fetch"] += time.perf_counter() - started
+        return [page_plan for page_plan in plans if page_plan is not None]
+    
+    async def _fetch_stage(
+        self,
+        page_queue: asyncio.Queue,
+        plans: List[Dict],
+        row_size: int,
+        completed_pages: set,
+        result: Dict
+    ):
+        """1단계: 파티션별 페이지 수신 (제한된 동시성, 체크포인트에 완료된 페이지는 건너뜀) → page_queue"""
+        started = time.perf_counter()
+        
+        for plan in plans:
+            if plan["first_list"]:
+                label = f"{plan['partition']['key']} " if plan["partition"]["key"] else ""
+                print(f"   ✅ {label}페이지 1: {len(plan['first_list'])}건 데이터 수신")
+                result["total_fetched"] += len(plan["first_list"])
+                result["pages_fetched"] += 1
+                await page_queue.put((page_key(plan["partition"], 1), plan["first_list"]))
+        
+        # 모든 파티션의 남은 페이지를 하나의 작업 목록으로 → 워커들이 나눠서 요청
+        tasks = []
+        for plan in plans:
+            for page in range(2, plan["pages"] + 1):
+                if page_key(plan["partition"], page) in completed_pages:
+                    result["resumed_pages"] += 1
+                else:
+                    tasks.append((plan, page))
+        pages = iter(tasks)
+        
+        # 빈 페이지를 만나면 그 파티션의 뒤 페이지는 요청하지 않음
+        last_page = {id(plan): plan["pages"] for plan in plans}
+        
+        async def fetch_worker():
+            for plan, page in pages:
+                if page > last_page[id(plan)]:
+                    continue
+                
+                partition = plan["partition"]
+                key = page_key(partition, page)
+                
+                # 🎯 마지막 페이지는 남은 개수만큼만 요청!
+                if plan["total_count"] > 0:
+                    already_fetched = (page - 1) * row_size
+                    remaining = plan["total_count"] - already_fetched
+                    current_row_size = min(row_size, remaining)
+                else:
+                    current_row_size = row_size
+                
+                label = f"{partition['key']} " if partition["key"] else ""
+                print(f"📄 {label}페이지 {page}/{plan['pages']}: 조회 중 (요청 크기: {current_row_size}건)...")
+                response = await self._fetch_with_retry(
+                    row_size=current_row_size,  # ← 동적으로 계산된 크기!
+                    page_num=page,
+                    filters=partition["filters"]
+                )
+                
+                if not response.get("success", False):
+                    error_msg = f"{label}페이지 {page} 실패: {response.get('msg')}"
+                    print(f"❌ {error_msg}")
+                    result["errors"].append(error_msg)
+                    result["failed_pages"].append(key)
+                    continue
+                
+                persons_list = response.get("list", [])
+                
+                # ✅ 빈 페이지면 이 파티션의 이후 페이지 요청 중단
+                if not persons_list:
+                    print(f"   ℹ️  {label}페이지 {page}에 데이터 없음. 이후 페이지 요청 중단.\n")
+                    last_page[id(plan)] = min(last_page[id(plan)], page)
+                    continue
+                
+                print(f"   ✅ {label}페이지 {page}: {len(persons_list)}건 데이터 수신")
+                result["total_fetched"] += len(persons_list)
+                result["pages_fetched"] += 1
+                self._report(result)
+                await page_queue.put((key, persons_list))
+        
+        await asyncio.gather(*(fetch_worker() for _ in range(self.concurrency)))
+        result["timings"]["fetch"] += time.perf_counter() - started
+        await page_queue.put(None)  # 수신 종료 신호
+    
+    async def _fetch_with_retry(
+        self,
+        row_size: int,
+        page_num: int,
+        filters: Optional[Dict] = None
+    ) -> Dict:
+        """페이지 요청 (실패 시 지수 백오프 + 지터로 재시도)"""
+        filters = filters or {}
+        response = await self.api_client.get_missing_children(
+            row_size=row_size, page_num=page_num, **filters
+        )
+        
+        for attempt in range(1, FETCH_RETRIES + 1):
+            if response.get("success", False):
+                break
+            
+            # full jitter: 0 ~ base * 2^(attempt-1) 사이 무작위 대기 (동시 재시도 분산)
+            delay = random.uniform(0, FETCH_RETRY_BASE_DELAY * (2 ** (attempt - 1)))
+            print(f"   🔁 페이지 {page_num} 재시도 {attempt}/{FETCH_RETRIES} ({delay:.2f}초 후): {response.get('msg')}")
+            await asyncio.sleep(delay)
+            response = await self.api_client.get_missing_children(
+                row_size=row_size, page_num=page_num, **filters
             )
-            db.add(new_person)
-            return "added"
+        
+        return response
+    
+    async def _parse_stage(
+        self,
+        page_queue: asyncio.Queue,
+        write_queue: asyncio.Queue,
+        result: Dict
+    ):
+        """2단계: 페이지 단위 파싱 (항목당 1회, msspsnIdntfccd 중복 제거, 파싱 에러는 수집) → write_queue"""
+        seen_ids = set()
+        
+        while True:
+            entry = await page_queue.get()
+            if entry is None:
+                await write_queue.put(None)
+                return
+            
+            key, persons_list = entry
+            started = time.perf_counter()
+            unique_items = []
+            for item in persons_list:
+                external_id = item.get("msspsnIdntfccd")
+                if external_id:
+                    if external_id in seen_ids:
+                        result["duplicates"] += 1
+                        continue
+                    seen_ids.add(external_id)
+                unique_items.append(item)
+            parsed_rows = self.api_client.parse_page(unique_items, result["parse_errors"])
+            result["timings"]["parse"] += time.perf_counter() - started
+            await write_queue.put((key, parsed_rows))
+    
+    async def _write_stage(
+        self,
+        write_queue: asyncio.Queue,
+        writer: "MissingPersonBulkWriter",
+        store: "SyncCheckpointStore",
+        checkpoint,
+        result: Dict
+    ):
+        """3단계: 페이지 단위 일괄 upsert (별도 스레드에서 실행 → 수신은 계속 진행)"""
+        written = 0
+        
+        def write_page(key, parsed_rows):
+            counts = writer.write(parsed_rows)
+            if checkpoint is not None:
+                # 페이지 데이터와 완료 기록을 같은 트랜잭션으로 커밋
+                store.mark_page_done(checkpoint, key)
+            store.db.commit()
+            return counts
+        
+        while True:
+            entry = await write_queue.get()
+            if entry is None:
+                return
+            
+            key, parsed_rows = entry
+            started = time.perf_counter()
+            counts = await asyncio.to_thread(write_page, key, parsed_rows)
+            result["timings"]["write"] += time.perf_counter() - started
+            result["new_added"] += counts["added"]
+            result["updated"] += counts["updated"]
+            result["unchanged"] += counts["unchanged"]
+            result["skipped"] += counts["skipped"]
+            result["rows_written"] += counts["added"] + counts["updated"]
+            if self.geocode_queue is not None:
+                # 커밋된 행만 큐로 → 지오코딩은 백그라운드에서 진행 (저장 단계는 기다리지 않음)
+                result["geocode_queued"] += self.geocode_queue.submit(writer.take_geocode_targets())
+            self._report(result)
+            
+            written += len(parsed_rows)
+            print(f"   💾 {written}건 저장 완료")
     
     def get_statistics(self) -> Dict:
         """현재 DB 통계 조회"""
@@ -276,7 +603,6 @@ class DataSyncService:
         try:
             total_count = db.query(MissingPerson).count()
             
-            from datetime import timedelta
             recent_date = datetime.now() - timedelta(days=7)
             recent_count = db.query(MissingPerson).filter(
                 MissingPerson.created_at >= recent_date
@@ -302,6 +628,11 @@ async def run_sync(api_key: str, esntl_id: str = "10000855", max_pages: int = 50
     service = DataSyncService(api_key=api_key, esntl_id=esntl_id)
     result = await service.sync_all_data(max_pages=max_pages)
     
+    if service.geocode_queue is not None:
+        # 단독 실행은 이벤트 루프가 곧 끝나므로 지오코딩까지 마치고 종료
+        await service.geocode_queue.join()
+        await service.geocode_queue.aclose()
+    
     stats = service.get_statistics()
     print("\n" + "="*60)
     print("📊 현재 데이터베이스 통계")
@@ -317,7 +648,6 @@ async def run_sync(api_key: str, esntl_id: str = "10000855", max_pages: int = 50
 
 
 if __name__ == "__main__":
-    import os
     from dotenv import load_dotenv
     
     load_dotenv()
@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+"""
+안전Dream 수집 분할 계획
+- 하나의 긴 페이지 목록 대신 서로 독립적인 조회 조건(파티션)으로 나눠 병렬 수집
+- target: 대상 구분 코드별 (010 아동 / 060 지적장애 / 070 치매) → 합집합이 기본 조회와 동일
+- region: 발생 지역(occrAdres) 시/도별
+- date: 발생일(detailDate1~detailDate2) 연도 구간별
+- 파티션 사이 중복은 수집 단계에서 msspsnIdntfccd 기준으로 제거
+"""
+
+from datetime import date
+from typing import Dict, List, Optional
+
+
+# 기본 조회에 포함되는 대상 구분 코드
+TARGET_CODES = ["010", "060", "070"]
+
+# 시/도 발생 지역 (개편 전/후 명칭 모두 포함, 겹치는 결과는 중복 제거)
+REGION_PREFIXES = [
+    "서울특별시", "부산광역시", "대구광역시", "인천광역시", "광주광역시",
+    "대전광역시", "울산광역시", "세종특별자치시", "경기도", "강원",
+    "충청북도", "충청남도", "전라북도", "전북특별자치도", "전라남도",
+    "경상북도", "경상남도", "제주",
+]
+
+# 연도별로 나누기 시작하는 해 (그 이전 발생 건은 하나의 구간)
+DATE_WINDOW_START_YEAR = 2000
+
+# detailDate1/detailDate2 파라미터 형식
+DATE_PARAM_FORMAT = "%Y-%m-%d"
+
+PARTITION_SCHEMES = ("target", "region", "date")
+
+
+def _partition(key: str, **filters) -> Dict:
+    """파티션 정의 {"key": 체크포인트/로그용 이름, "filters": get_missing_children 추가 인자}"""
+    return {"key": key, "filters": filters}
+
+
+def _date_windows(today: date, start_year: int) -> List[Dict]:
+    """발생일 연도 구간 (첫 구간은 시작일 없음, 마지막 구간은 종료일 없음)"""
+    windows = [_partition(
+        f"date:~{start_year - 1}",
+        detail_date2=date(start_year - 1, 12, 31).strftime(DATE_PARAM_FORMAT)
+    )]
+    for year in range(start_year, today.year + 1):
+        windows.append(_partition(
+            f"date:{year}",
+            detail_date1=date(year, 1, 1).strftime(DATE_PARAM_FORMAT),
+            detail_date2=(
+                date(year, 12, 31).strftime(DATE_PARAM_FORMAT) if year < today.year else ""
+            )
+        ))
+    return windows
+
+
+def plan_partitions(
+    scheme: Optional[str] = None,
+    today: Optional[date] = None,
+    start_year: int = DATE_WINDOW_START_YEAR
+) -> List[Dict]:
+    """
+    수집 파티션 목록 생성
+
+    Args:
+        scheme: 분할 방식 (target/region/date, 없으면 분할하지 않음)
+        today: 기준일 (date 분할용, 기본: 오늘)
+        start_year: 연도 구간 시작 해 (date 분할용)
+
+    Returns:
+        [{"key": str, "filters": dict}, ...]
+    """
+    if not scheme:
+        return [_partition("")]
+
+    if scheme == "target":
+        return [_partition(f"target:{code}", writng_trget_dscds=[code]) for code in TARGET_CODES]
+
+    if scheme == "region":
+        return [_partition(f"region:{prefix}", occr_adres=prefix) for prefix in REGION_PREFIXES]
+
+    if scheme == "date":
+        return _date_windows(today or date.today(), start_year)
+
+    raise ValueError(f"지원하지 않는 분할 방식입니다: {scheme} ({', '.join(PARTITION_SCHEMES)})")
+
+
+def page_key(partition: Dict, page: int) -> str:
+    """체크포인트에 기록하는 (파티션, 페이지) 키 (분할하지 않으면 페이지 번호만)"""
+    if not partition["key"]:
+        return str(page)
+    return f"{partition['key']}#{page}"
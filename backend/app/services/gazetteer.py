@@ -0,0 +1,144 @@
+# -*- coding: utf-8 -*-
+"""
+오프라인 행정구역 지명 사전 (네트워크 없이 대략적인 좌표)
+- 동봉한 행정구역 중심 좌표 데이터(app/data/admin_region_centroids.csv: 시도 17 + 시군구 228행)를
+  토큰 단위 트라이로 올려 두고, 주소의 가장 긴 일치 구역 좌표를 반환
+- 동봉 데이터의 가장 세밀한 단위는 시군구 (읍면동 행 없음)
+  dong 열을 채운 파일을 GAZETTEER_PATH 로 지정하면 읍면동 단위까지 조회
+- 시도가 없는 주소("강남구 역삼동")는 시도를 뺀 트라이로 조회 (여러 시도에 있는 이름은 제외)
+- 정밀도(geocode_precision): sido < sigungu (< dong, 읍면동 데이터를 지정한 경우) < address(네트워크 지오코더 결과)
+- 동기화 직후 모든 행에 대략적인 좌표를 채우고, 네트워크 지오코더는 정밀도만 높임
+"""
+
+import csv
+import os
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from app.services.address_normalizer import parse_address
+
+
+# 동봉 데이터 경로 (GAZETTEER_PATH 로 다른 파일 지정 가능, 같은 열 형식)
+DEFAULT_GAZETTEER_PATH = Path(__file__).resolve().parent.parent / "data" / "admin_region_centroids.csv"
+GAZETTEER_PATH = Path(os.getenv("GAZETTEER_PATH") or DEFAULT_GAZETTEER_PATH)
+
+# 지명 사전으로 얻은 좌표의 정밀도 (네트워크 지오코더 결과는 "address")
+PRECISION_ADDRESS = "address"
+GAZETTEER_PRECISIONS = ("sido", "sigungu", "dong")
+
+# 여러 구역에 같은 이름이 있어 시도 없이는 정할 수 없는 항목 표시
+_AMBIGUOUS = object()
+
+
+class _TrieNode:
+    __slots__ = ("children", "value")
+
+    def __init__(self):
+        self.children: Dict[str, "_TrieNode"] = {}
+        self.value = None
+
+
+class RegionTrie:
+    """행정구역 이름 토큰 트라이 (가장 긴 접두 일치 조회)"""
+
+    def __init__(self):
+        self.root = _TrieNode()
+        self.size = 0
+
+    def insert(self, tokens: List[str], value: Dict):
+        """토큰 경로에 값 저장 (같은 경로에 다른 값이 있으면 모호한 항목으로 표시)"""
+        node = self.root
+        for token in tokens:
+            node = node.children.setdefault(token, _TrieNode())
+        if node.value is None:
+            self.size += 1
+            node.value = value
+        elif node.value is not value:
+            node.value = _AMBIGUOUS
+
+    def longest_prefix(self, tokens: List[str]) -> Optional[Dict]:
+        """토큰 목록의 가장 긴 일치 구역 값 (모호한 항목은 건너뜀)"""
+        node = self.root
+        found = None
+        for token in tokens:
+            node = node.children.get(token)
+            if node is None:
+                break
+            if node.value is not None and node.value is not _AMBIGUOUS:
+                found = node.value
+        return found
+
+
+class Gazetteer:
+    """행정구역 중심 좌표 사전"""
+
+    def __init__(self, path: Path = GAZETTEER_PATH):
+        self.path = Path(path)
+        self.full = RegionTrie()  # 시도부터 시작하는 경로
+        self.partial = RegionTrie()  # 시도를 뺀 경로
+        self._load()
+
+    def _load(self):
+        """CSV(sido, sigungu, dong, latitude, longitude) 읽기"""
+        with open(self.path, encoding="utf-8", newline="") as f:
+            for row in csv.DictReader(f):
+                sigungu = (row.get("sigungu") or "").split()
+                dong = (row.get("dong") or "").strip()
+                tokens = [row["sido"].strip()] + sigungu + ([dong] if dong else [])
+                value = {
+                    "name": " ".join(tokens),
+                    "latitude": float(row["latitude"]),
+                    "longitude": float(row["longitude"]),
+                    "precision": "dong" if dong else ("sigungu" if sigungu else "sido"),
+                }
+                self.full.insert(tokens, value)
+                if len(tokens) > 1:
+                    self.partial.insert(tokens[1:], value)
+
+    def lookup(self, address: str) -> Optional[Dict]:
+        """
+        주소 → 가장 좁은 일치 행정구역
+
+        Returns:
+            {"name", "latitude", "longitude", "precision"} 또는 None
+        """
+        parts = parse_address(address or "")
+        tokens = (parts["sigungu"] or "").split()
+        if parts["dong"]:
+            tokens.append(parts["dong"])
+
+        if parts["sido"]:
+            return self.full.longest_prefix([parts["sido"]] + tokens)
+        return self.partial.longest_prefix(tokens)
+
+    def __len__(self) -> int:
+        return self.full.size
+
+
+def approximate(address: str) -> Optional[Dict]:
+    """
+    대략적인 좌표 (missing_persons 컬럼 형식)
+
+    Returns:
+        {"latitude", "longitude", "geocode_precision"} 또는 None
+    """
+    region = get_gazetteer().lookup(address)
+    if region is None:
+        return None
+    return {
+        "latitude": region["latitude"],
+        "longitude": region["longitude"],
+        "geocode_precision": region["precision"],
+    }
+
+
+# 싱글톤 인스턴스
+_gazetteer = None
+
+
+def get_gazetteer() -> Gazetteer:
+    """지명 사전 인스턴스 반환 (처음 호출할 때 로드)"""
+    global _gazetteer
+    if _gazetteer is None:
+        _gazetteer = Gazetteer()
+    return _gazetteer
@@ -0,0 +1,212 @@
+# -*- coding: utf-8 -*-
+"""
+지오코딩 백필 (update_geocoding*.py 공용)
+- 좌표가 없거나 지명 사전 대략 좌표만 있는 행을 id 순 키셋 배치(WHERE id > 커서 LIMIT n)로 읽음
+  → 전체를 메모리에 올리지 않고, 배치마다 짧은 세션 사용 (메모리 일정)
+- 배치 안에서 주소 키(geocode_key)로 중복 제거 후 지오코더의 geocode_batch 로 동시 변환
+- 결과는 executemany UPDATE 한 번으로 기록하고, 같은 트랜잭션에서 커서(geocode_backfills.last_id) 저장
+  → 중단되어도 다음 실행이 마지막 커밋 배치 다음부터 재개
+- 일일 한도를 다 쓰면 그 배치의 성공분만 기록하고 커서는 그대로 둔 채 일시 중지 (paused)
+"""
+
+import os
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from sqlalchemy import or_, select
+
+from app.database.db import SessionLocal
+from app.models.geocode_backfill import GeocodeBackfill
+from app.models.missing_person import MissingPerson
+from app.services.address_normalizer import geocode_key
+from app.services.bulk_writer import coordinate_update
+from app.services.gazetteer import GAZETTEER_PRECISIONS, PRECISION_ADDRESS, approximate
+
+
+# 한 번에 읽고/변환하고/커밋하는 행 수
+GEOCODE_BACKFILL_BATCH_SIZE = int(os.getenv("GEOCODE_BACKFILL_BATCH_SIZE", "500"))
+
+
+def _open_cursor(db, name: str, restart: bool) -> GeocodeBackfill:
+    """
+    백필 커서 조회/생성
+
+    이전 회차가 끝나지 않았으면(running/paused) 마지막 커서부터 재개하고,
+    완료되었거나 restart=True 이면 처음부터 새 회차를 시작합니다.
+    """
+    now = datetime.now()
+    cursor = db.query(GeocodeBackfill).filter(GeocodeBackfill.name == name).first()
+    if cursor is None:
+        cursor = GeocodeBackfill(name=name)
+        db.add(cursor)
+        restart = True
+
+    if restart or cursor.status == "completed":
+        cursor.last_id = 0
+        cursor.processed = 0
+        cursor.geocoded = 0
+        cursor.approximated = 0
+        cursor.failed = 0
+        cursor.started_at = now
+        cursor.completed_at = None
+
+    cursor.status = "running"
+    cursor.updated_at = now
+    db.commit()
+    return cursor
+
+
+def _next_batch(db, last_id: int, batch_size: int) -> List:
+    """커서 다음의 백필 대상 행 (id, 주소, 위도) - 키셋 조회"""
+    return db.execute(
+        select(MissingPerson.id, MissingPerson.location_address, MissingPerson.latitude)
+        .where(MissingPerson.id > last_id)
+        .where(MissingPerson.location_address.isnot(None))
+        .where(or_(
+            MissingPerson.latitude.is_(None),
+            MissingPerson.geocode_precision.in_(GAZETTEER_PRECISIONS)
+        ))
+        .order_by(MissingPerson.id)
+        .limit(batch_size)
+    ).all()
+
+
+async def run_backfill(
+    geocoder,
+    name: Optional[str] = None,
+    batch_size: int = GEOCODE_BACKFILL_BATCH_SIZE,
+    restart: bool = False,
+    max_rows: Optional[int] = None,
+    session_factory=SessionLocal
+) -> Dict:
+    """
+    지오코딩 백필 실행 (재개 가능)
+
+    Args:
+        geocoder: geocode_batch() / remaining_today() 를 가진 지오코더 (GeocodingRouter, Kakao/Naver 서비스)
+        name: 커서 이름 (기본: geocoder.provider)
+        batch_size: 배치 크기
+        restart: 저장된 커서를 무시하고 처음부터
+        max_rows: 이번 실행에서 처리할 최대 행 수 (None이면 끝까지)
+        session_factory: DB 세션 생성 함수
+
+    Returns:
+        {"status", "batches", "processed", "geocoded", "approximated", "failed", "last_id", "resumed_from"}
+    """
+    name = name or geocoder.provider
+    update = coordinate_update("id")
+
+    db = session_factory()
+    try:
+        cursor = _open_cursor(db, name, restart)
+        last_id = cursor.last_id or 0
+    finally:
+        db.close()
+
+    summary = {
+        "status": "running",
+        "batches": 0,
+        "processed": 0,
+        "geocoded": 0,
+        "approximated": 0,
+        "failed": 0,
+        "last_id": last_id,
+        "resumed_from": last_id,
+    }
+    if last_id:
+        print(f"♻️  백필 커서 {name}: id {last_id} 다음부터 재개")
+
+    while max_rows is None or summary["processed"] < max_rows:
+        limit = batch_size if max_rows is None else min(batch_size, max_rows - summary["processed"])
+
+        db = session_factory()
+        try:
+            rows = _next_batch(db, last_id, limit)
+        finally:
+            db.close()
+
+        if not rows:
+            summary["status"] = "completed"
+            break
+
+        # geocode_batch 가 주소 키로 묶어 키마다 한 번만 변환 (제공자에는 원문 주소로 요청)
+        keys = {row.id: geocode_key(row.location_address) for row in rows}
+        results = await geocoder.geocode_batch([row.location_address for row in rows], show_progress=False)
+        quota_exhausted = geocoder.remaining_today() == 0
+
+        now = datetime.now()
+        updates = []
+        counts = {"geocoded": 0, "approximated": 0, "failed": 0}
+        for row in rows:
+            coords = results.get(row.location_address)
+            if coords:
+                latitude, longitude, precision = coords[0], coords[1], PRECISION_ADDRESS
+                counts["geocoded"] += 1
+            else:
+                # 좌표가 아예 없는 행은 지명 사전 대략 좌표라도 채움
+                region = None
+                if row.latitude is None and not quota_exhausted:
+                    region = approximate(row.location_address)
+                if region is None:
+                    counts["failed"] += 1
+                    continue
+                latitude, longitude, precision = region["latitude"], region["longitude"], region["geocode_precision"]
+                counts["approximated"] += 1
+            updates.append({
+                "target_key": row.id,
+                "target_address": row.location_address,
+                "latitude": latitude,
+                "longitude": longitude,
+                "precision": precision,
+                "now": now,
+            })
+
+        # 한도 소진 시 변환하지 못한 행은 다음 실행에서 다시 (커서를 옮기지 않음)
+        if not quota_exhausted:
+            last_id = rows[-1].id
+
+        db = session_factory()
+        try:
+            if updates:
+                db.execute(update, updates)
+            cursor = db.query(GeocodeBackfill).filter(GeocodeBackfill.name == name).one()
+            cursor.last_id = last_id
+            cursor.processed += len(rows)
+            cursor.geocoded += counts["geocoded"]
+            cursor.approximated += counts["approximated"]
+            cursor.failed += counts["failed"]
+            cursor.updated_at = now
+            if quota_exhausted:
+                cursor.status = "paused"
+            db.commit()
+        finally:
+            db.close()
+
+        summary["batches"] += 1
+        summary["processed"] += len(rows)
+        summary["last_id"] = last_id
+        for key, value in counts.items():
+            summary[key] += value
+        print(f"📍 배치 {summary['batches']}: {len(rows)}행 (고유 주소 {len(set(keys.values()))}개) - "
+              f"정밀 {counts['geocoded']}, 대략 {counts['approximated']}, 실패 {counts['failed']} "
+              f"(커서 id {last_id})")
+
+        if quota_exhausted:
+            summary["status"] = "paused"
+            print("\n⛔ 일일 한도 소진 → 여기까지 저장하고 중단합니다 (다음 실행에서 재개)")
+            break
+
+    db = session_factory()
+    try:
+        cursor = db.query(GeocodeBackfill).filter(GeocodeBackfill.name == name).one()
+        if summary["status"] == "completed":
+            cursor.status = "completed"
+            cursor.completed_at = datetime.now()
+        elif summary["status"] == "running":
+            cursor.status = "paused"  # max_rows 도달 → 다음 실행에서 이어서
+            summary["status"] = "paused"
+        db.commit()
+    finally:
+        db.close()
+
+    return summary
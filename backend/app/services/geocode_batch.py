@@ -0,0 +1,89 @@
+# -*- coding: utf-8 -*-
+"""
+일괄 지오코딩 공통 처리 (Kakao/Naver 서비스, GeocodingRouter 공용)
+- 주소 키(geocode_key)로 중복 제거 → 키마다 한 번만 변환하고 같은 키의 주소 모두에 결과 반영
+  (시군구까지만 남는 장소명 주소는 장소마다 따로 변환)
+- 동시 요청 수 제한 (속도/일일 한도는 각 제공자의 토큰 버킷이 관리)
+- 일일 한도 초과 시 남은 주소는 건너뜀
+- 끝나면 토큰 버킷이 미리 확보해 둔 일일 한도 중 쓰지 않은 분량을 반환 (settle_rate_limiters)
+"""
+
+import asyncio
+import os
+from typing import Dict, Optional, Tuple
+
+from app.services.address_normalizer import geocode_key
+from app.services.rate_limiter import DailyQuotaExceeded, settle_rate_limiters
+
+
+# 기본 동시 요청 수
+GEOCODE_CONCURRENCY = int(os.getenv("GEOCODE_CONCURRENCY", "8"))
+
+
+async def geocode_batch(
+    geocoder,
+    addresses: list,
+    show_progress: bool = True,
+    concurrency: int = GEOCODE_CONCURRENCY
+) -> Dict[str, Optional[Tuple[float, float]]]:
+    """
+    여러 주소를 동시에 변환
+
+    Args:
+        geocoder: geocode_address(address) 와 cache 를 가진 지오코더
+        addresses: 변환할 주소 리스트
+        show_progress: 진행 상황 출력 여부
+        concurrency: 동시에 처리할 최대 주소 수
+
+    Returns:
+        {address: (lat, lon)} 딕셔너리
+    """
+    results = {address: None for address in addresses}
+    groups: Dict[str, list] = {}
+    for address in results:
+        key = geocode_key(address or "")
+        if key:
+            groups.setdefault(key, []).append(address)
+    unique = list(groups)
+    total = len(unique)
+    if total == 0:
+        return results
+
+    # 캐시를 한 번에 불러옴 (주소마다 DB 조회 방지)
+    await asyncio.to_thread(geocoder.cache.preload, unique)
+
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+    done = 0
+    quota_exceeded = False
+
+    async def worker(key):
+        nonlocal done, quota_exceeded
+        async with semaphore:
+            if quota_exceeded:
+                return
+            try:
+                # 제공자에는 정규 키가 아닌 원문 주소로 요청 (건물명/장소명 유지)
+                coords = await geocoder.geocode_address(groups[key][0])
+                for original in groups[key]:
+                    results[original] = coords
+            except DailyQuotaExceeded as e:
+                if not quota_exceeded:
+                    print(f"⛔ {e} → 남은 주소는 건너뜀")
+                quota_exceeded = True
+                return
+
+        done += 1
+        if show_progress and done % 10 == 0:
+            print(f"🗺️  지오코딩 진행: {done}/{total} ({done/total*100:.1f}%)")
+
+    try:
+        await asyncio.gather(*(worker(key) for key in unique))
+    finally:
+        # 제공자 토큰 버킷이 블록으로 확보해 두고 쓰지 않은 일일 한도 반환
+        await asyncio.to_thread(settle_rate_limiters)
+
+    if show_progress:
+        success_count = sum(1 for v in results.values() if v is not None)
+        print(f"✅ 지오코딩 완료: {success_count}/{len(results)} ({success_count/len(results)*100:.1f}%)")
+
+    return results
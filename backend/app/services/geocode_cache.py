@@ -0,0 +1,194 @@
+# -*- coding: utf-8 -*-
+"""
+지오코딩 결과 영구 캐시 (geocode_cache 테이블, Kakao/Naver 공용)
+- 주소 키(address_normalizer.geocode_key) → 좌표, 제공자, 신뢰도, 조회 일시
+- 성공 결과는 어느 제공자 것이든 공유, 실패(검색 결과 없음)는 제공자별로 기록 (네거티브 캐시)
+- TTL이 지난 결과는 다시 조회 (조회 실패 시에는 이전 좌표 사용)
+- 메모리에도 올려 두어 같은 실행 안에서는 DB 조회 없이 응답
+"""
+
+import os
+import threading
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, Optional, Tuple
+
+from sqlalchemy import delete, select
+
+from app.database.db import SessionLocal
+from app.models.geocode_cache import GeocodeCache
+from app.services.address_normalizer import geocode_key
+
+
+# 성공 결과 유효 기간 (일)
+GEOCODE_CACHE_TTL = timedelta(days=float(os.getenv("GEOCODE_CACHE_TTL_DAYS", "180")))
+
+# 실패(검색 결과 없음) 결과 유효 기간 (일) - 지나면 다시 시도
+GEOCODE_NEGATIVE_TTL = timedelta(days=float(os.getenv("GEOCODE_NEGATIVE_TTL_DAYS", "7")))
+
+# 미리 불러올 때 한 번의 IN 쿼리에 넣을 주소 수
+PRELOAD_CHUNK_SIZE = 500
+
+
+def _entry(row: GeocodeCache) -> Dict:
+    """DB 행 → 메모리 항목"""
+    return {
+        "status": row.status,
+        "coords": (row.latitude, row.longitude) if row.status == "ok" else None,
+        "confidence": row.confidence,
+        "provider": row.provider,
+        "expires_at": row.expires_at,
+    }
+
+
+class GeocodeCacheStore:
+    """geocode_cache 테이블 읽기/쓰기 (메모리 캐시 포함, 스레드 안전)"""
+
+    def __init__(self, session_factory=SessionLocal):
+        self.session_factory = session_factory
+        self._memory: Dict[str, Dict[str, Dict]] = {}  # {address_key: {provider: 항목}}
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "negative_hits": 0, "stale": 0, "misses": 0, "writes": 0}
+
+    def _load(self, keys: Iterable[str]):
+        """메모리에 없는 주소를 DB에서 읽어 옴 (없는 주소도 빈 항목으로 기록)"""
+        with self._lock:
+            missing = [key for key in set(keys) if key and key not in self._memory]
+        if not missing:
+            return
+
+        db = self.session_factory()
+        try:
+            loaded = {key: {} for key in missing}
+            for start in range(0, len(missing), PRELOAD_CHUNK_SIZE):
+                chunk = missing[start:start + PRELOAD_CHUNK_SIZE]
+                rows = db.query(GeocodeCache).filter(GeocodeCache.address_key.in_(chunk)).all()
+                for row in rows:
+                    loaded[row.address_key][row.provider] = _entry(row)
+        finally:
+            db.close()
+
+        with self._lock:
+            for key, entries in loaded.items():
+                self._memory.setdefault(key, entries)
+
+    def preload(self, addresses: Iterable[str]):
+        """일괄 지오코딩 전에 주소 목록의 캐시를 한 번에 불러옴 (주소마다 쿼리 방지)"""
+        self._load(geocode_key(address) for address in addresses)
+
+    def lookup(self, address: str, provider: str) -> Tuple[str, Optional[Tuple[float, float]]]:
+        """
+        캐시 조회
+
+        Returns:
+            (상태, 좌표) - 상태는 hit(유효한 성공) / negative(유효한 실패, 이 제공자) /
+            stale(만료된 성공, 좌표는 대체용) / miss
+        """
+        key = geocode_key(address)
+        self._load([key])
+        now = datetime.now()
+
+        with self._lock:
+            entries = self._memory.get(key, {})
+            stale = None
+            # 성공 결과는 제공자와 무관하게 사용 (요청한 제공자 결과 우선)
+            for name in sorted(entries, key=lambda name: name != provider):
+                entry = entries[name]
+                if entry["status"] != "ok":
+                    continue
+                if entry["expires_at"] and entry["expires_at"] > now:
+                    self.stats["hits"] += 1
+                    return "hit", entry["coords"]
+                stale = stale or entry["coords"]
+
+            if stale:
+                self.stats["stale"] += 1
+                return "stale", stale
+
+            own = entries.get(provider)
+            if own and own["status"] == "not_found" and own["expires_at"] and own["expires_at"] > now:
+                self.stats["negative_hits"] += 1
+                return "negative", None
+
+            self.stats["misses"] += 1
+            return "miss", None
+
+    def store(
+        self,
+        address: str,
+        provider: str,
+        coords: Optional[Tuple[float, float]],
+        confidence: Optional[float] = None
+    ):
+        """조회 결과 저장 (coords가 None이면 검색 결과 없음으로 기록)"""
+        key = geocode_key(address)
+        if not key:
+            return
+
+        now = datetime.now()
+        status = "ok" if coords else "not_found"
+        expires_at = now + (GEOCODE_CACHE_TTL if coords else GEOCODE_NEGATIVE_TTL)
+        latitude, longitude = coords if coords else (None, None)
+
+        db = self.session_factory()
+        try:
+            row = db.query(GeocodeCache)\
+                .filter(GeocodeCache.address_key == key, GeocodeCache.provider == provider)\
+                .first()
+            if row is None:
+                row = GeocodeCache(address_key=key, provider=provider)
+                db.add(row)
+            row.address = address
+            row.status = status
+            row.latitude = latitude
+            row.longitude = longitude
+            row.confidence = confidence
+            row.fetched_at = now
+            row.expires_at = expires_at
+            db.commit()
+            entry = _entry(row)
+        finally:
+            db.close()
+
+        with self._lock:
+            self._memory.setdefault(key, {})[provider] = entry
+            self.stats["writes"] += 1
+
+    def count(self) -> int:
+        """저장된 캐시 항목 수"""
+        db = self.session_factory()
+        try:
+            return db.query(GeocodeCache).count()
+        finally:
+            db.close()
+
+
+def purge_collapsed_keys(engine) -> int:
+    """
+    예전 키 규칙(항상 정규 키)으로 저장된 항목 중 지금 키와 다른 것을 삭제 (init_db에서 호출)
+
+    시군구 + 장소명 주소가 "시도 시군구" 키 하나로 묶여 첫 장소의 좌표가 저장된 항목을 지움
+    (읍면동 + 번지까지 있는 긴 키는 예전과 같으므로 토큰 4개 이하인 키만 확인)
+    """
+    with engine.begin() as conn:
+        rows = conn.execute(
+            select(GeocodeCache.id, GeocodeCache.address_key, GeocodeCache.address)
+            .where(GeocodeCache.address_key.notlike("% % % % %"))
+        ).all()
+        stale = [row.id for row in rows if row.address and geocode_key(row.address) != row.address_key]
+        for start in range(0, len(stale), PRELOAD_CHUNK_SIZE):
+            conn.execute(delete(GeocodeCache).where(GeocodeCache.id.in_(stale[start:start + PRELOAD_CHUNK_SIZE])))
+    if stale:
+        print(f"🧹 지오코딩 캐시 정리: 장소명이 빠진 키 {len(stale)}건 삭제")
+    return len(stale)
+
+
+# 싱글톤 인스턴스
+_geocode_cache = None
+
+
+def get_geocode_cache() -> GeocodeCacheStore:
+    """지오코딩 캐시 인스턴스 반환"""
+    global _geocode_cache
+    if _geocode_cache is None:
+        _geocode_cache = GeocodeCacheStore()
+    return _geocode_cache
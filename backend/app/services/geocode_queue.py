@@ -0,0 +1,257 @@
+# -*- coding: utf-8 -*-
+"""
+동기화 후속 지오코딩 단계 (백그라운드)
+- 동기화 저장 단계가 새로 추가되었거나 주소가 바뀐 행을 큐에 넣음
+- 동기화 워커 루프에서 도는 작업이 모아서(최대 GEOCODE_QUEUE_BATCH_SIZE건 또는 GEOCODE_QUEUE_FLUSH_SECONDS초)
+  GeocodingRouter 로 동시에 변환하고, 결과를 executemany UPDATE 한 번으로 기록
+- 동기화가 끝나기를 기다리지 않으므로 새 실종 건이 몇 초 안에 지도에 표시됨
+- 변환 중 주소가 또 바뀐 행은 덮어쓰지 않음 (WHERE location_address = 요청한 주소)
+- 네트워크 지오코딩이 실패했거나 API 키가 없으면 오프라인 지명 사전 좌표를 기록 (정밀도 표시)
+"""
+
+import asyncio
+import os
+import time
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from app.database.db import SessionLocal
+from app.services.bulk_writer import coordinate_update
+from app.services.gazetteer import PRECISION_ADDRESS, approximate
+
+
+# 동기화 중 자동 지오코딩 사용 여부
+GEOCODE_ON_SYNC = os.getenv("GEOCODE_ON_SYNC", "true").lower() in ("1", "true", "yes")
+
+# 한 번에 변환/기록하는 최대 행 수, 행이 모자랄 때 기다리는 최대 시간 (초)
+GEOCODE_QUEUE_BATCH_SIZE = int(os.getenv("GEOCODE_QUEUE_BATCH_SIZE", "100"))
+GEOCODE_QUEUE_FLUSH_SECONDS = float(os.getenv("GEOCODE_QUEUE_FLUSH_SECONDS", "1.0"))
+
+
+class GeocodeQueue:
+    """동기화로 들어온 행을 모아 지오코딩 후 좌표를 기록하는 백그라운드 단계"""
+
+    def __init__(
+        self,
+        geocoder=None,
+        session_factory=SessionLocal,
+        batch_size: int = GEOCODE_QUEUE_BATCH_SIZE,
+        flush_seconds: float = GEOCODE_QUEUE_FLUSH_SECONDS
+    ):
+        """
+        Args:
+            geocoder: geocode_batch() 를 가진 지오코더 (기본: 환경 변수로 구성한 GeocodingRouter)
+            session_factory: 좌표 기록용 DB 세션 생성 함수
+            batch_size: 한 번에 변환/기록하는 최대 행 수
+            flush_seconds: 배치가 차지 않아도 처리하기까지 기다리는 최대 시간 (초)
+        """
+        self._geocoder = geocoder
+        self.session_factory = session_factory
+        self.batch_size = max(1, batch_size)
+        self.flush_seconds = flush_seconds
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        self._loop = None
+        self._disabled_reason: Optional[str] = None
+        self._update = coordinate_update("external_id")
+        self.stats = {
+            "queued": 0,
+            "geocoded": 0,
+            "approximated": 0,  # 지명 사전 좌표로 대체
+            "failed": 0,
+            "batches": 0,
+            "last_batch_at": None,
+            "last_batch_seconds": None,
+        }
+
+    def _get_geocoder(self):
+        """지오코더 (처음 사용할 때 생성, API 키가 없으면 None → 지명 사전만 사용)"""
+        if self._geocoder is None and self._disabled_reason is None:
+            try:
+                from app.services.geocoding_router import get_geocoding_router
+                self._geocoder = get_geocoding_router()
+            except ValueError as e:
+                self._disabled_reason = str(e)
+                print(f"⚠️  네트워크 지오코딩 비활성화 (지명 사전 좌표만 사용): {e}")
+        return self._geocoder
+
+    def _ensure_worker(self):
+        """현재 이벤트 루프에 처리 작업이 없으면 시작"""
+        loop = asyncio.get_running_loop()
+        if self._task is None or self._task.done() or self._loop is not loop:
+            self._queue = asyncio.Queue()
+            self._loop = loop
+            self._task = loop.create_task(self._run())
+
+    def submit(self, targets: List[Tuple[str, str]]) -> int:
+        """
+        지오코딩 대상 추가 (이벤트 루프 안에서 호출, 대기 없음)
+
+        Args:
+            targets: [(external_id, location_address)]
+
+        Returns:
+            큐에 넣은 건수 (GEOCODE_ON_SYNC 비활성화 시 0)
+        """
+        if not targets or not GEOCODE_ON_SYNC:
+            return 0
+        self._ensure_worker()
+        for target in targets:
+            self._queue.put_nowait(target)
+        self.stats["queued"] += len(targets)
+        return len(targets)
+
+    def pending(self) -> int:
+        """아직 처리하지 않은 건수"""
+        return self._queue.qsize() if self._queue is not None else 0
+
+    async def _next_batch(self) -> Tuple[Dict[str, str], int]:
+        """
+        첫 항목을 기다린 뒤 batch_size 또는 flush_seconds 까지 모음
+
+        Returns:
+            ({external_id: 마지막 주소}, 큐에서 꺼낸 항목 수)
+            같은 행이 여러 번 들어오면 하나로 합치므로 꺼낸 항목 수가 더 클 수 있음
+        """
+        external_id, address = await self._queue.get()
+        batch = {external_id: address}
+        taken = 1
+        deadline = time.monotonic() + self.flush_seconds
+
+        while len(batch) < self.batch_size:
+            timeout = deadline - time.monotonic()
+            if timeout <= 0:
+                break
+            try:
+                external_id, address = await asyncio.wait_for(self._queue.get(), timeout)
+            except asyncio.TimeoutError:
+                break
+            taken += 1
+            batch[external_id] = address
+        return batch, taken
+
+    async def _run(self):
+        """처리 루프 (배치 하나가 실패해도 계속)"""
+        while True:
+            batch, taken = await self._next_batch()
+            try:
+                await self._process(batch)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.stats["failed"] += len(batch)
+                print(f"⚠️  동기화 지오코딩 배치 실패 ({len(batch)}건): {e}")
+            finally:
+                # get() 한 번마다 task_done() 한 번 (합쳐진 중복 항목 포함, 아니면 join()이 끝나지 않음)
+                for _ in range(taken):
+                    self._queue.task_done()
+
+    async def _process(self, batch: Dict[str, str]):
+        """배치 하나 변환 후 좌표 기록 (네트워크 실패 시 지명 사전 좌표)"""
+        started = time.perf_counter()
+        geocoder = self._get_geocoder()
+        results = {}
+        if geocoder is not None:
+            results = await geocoder.geocode_batch(list(set(batch.values())), show_progress=False)
+
+        now = datetime.now()
+        updates = []
+        approximated = 0
+        for external_id, address in batch.items():
+            coords = results.get(address)
+            if coords:
+                latitude, longitude, precision = coords[0], coords[1], PRECISION_ADDRESS
+            else:
+                region = approximate(address)
+                if region is None:
+                    continue
+                latitude, longitude, precision = region["latitude"], region["longitude"], region["geocode_precision"]
+                approximated += 1
+            updates.append({
+                "target_key": external_id,
+                "target_address": address,
+                "latitude": latitude,
+                "longitude": longitude,
+                "precision": precision,
+                "now": now,
+            })
+
+        if updates:
+            await asyncio.to_thread(self._apply, updates)
+
+        elapsed = time.perf_counter() - started
+        self.stats["geocoded"] += len(updates) - approximated
+        self.stats["approximated"] += approximated
+        self.stats["failed"] += len(batch) - len(updates)
+        self.stats["batches"] += 1
+        self.stats["last_batch_at"] = now
+        self.stats["last_batch_seconds"] = round(elapsed, 3)
+        print(f"🗺️  동기화 지오코딩: {len(updates)}/{len(batch)}건 좌표 기록 "
+              f"(지명 사전 {approximated}건, {elapsed:.2f}초, 대기 {self.pending()}건)")
+
+    def _apply(self, updates: List[Dict]):
+        """좌표 일괄 기록 (executemany 한 번)"""
+        db = self.session_factory()
+        try:
+            db.execute(self._update, updates)
+            db.commit()
+        finally:
+            db.close()
+
+    async def join(self):
+        """큐에 들어간 항목을 모두 처리할 때까지 대기 (벤치마크/종료용)"""
+        if self._queue is not None and self._task is not None and not self._task.done():
+            await self._queue.join()
+
+    async def aclose(self):
+        """처리 작업 취소 및 지오코더 클라이언트 종료 (남은 항목은 다음 백필에서 처리)"""
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self._task = None
+        if self._geocoder is not None and hasattr(self._geocoder, "aclose"):
+            await self._geocoder.aclose()
+
+    def get_stats(self) -> Dict:
+        """처리 통계 (API 응답용)"""
+        return {
+            "enabled": GEOCODE_ON_SYNC,
+            "network": self._disabled_reason is None,
+            "disabled_reason": self._disabled_reason,
+            "pending": self.pending(),
+            **self.stats,
+        }
+
+
+# 싱글톤 인스턴스
+_geocode_queue = None
+
+
+def get_geocode_queue() -> GeocodeQueue:
+    """동기화 지오코딩 큐 인스턴스 반환"""
+    global _geocode_queue
+    if _geocode_queue is None:
+        _geocode_queue = GeocodeQueue()
+    return _geocode_queue
+
+
+if __name__ == "__main__":
+    # 중복 항목 확인: 같은 행을 두 번 넣어도 join()이 끝나야 함 (네트워크/DB 불필요)
+    class _NoMatchGeocoder:
+        async def geocode_batch(self, addresses, show_progress=False):
+            return {}
+
+    async def _check_duplicates():
+        queue = GeocodeQueue(geocoder=_NoMatchGeocoder(), flush_seconds=0.05)
+        queue.submit([("DUP-1", "주소 없음"), ("DUP-1", "주소 없음"), ("DUP-2", "주소 없음")])
+        try:
+            await asyncio.wait_for(queue.join(), timeout=5)
+        finally:
+            await queue.aclose()
+        assert queue.pending() == 0, "처리되지 않은 항목이 남음"
+        print(f"✅ 중복 항목 포함 join() 완료 (큐 {queue.stats['queued']}건, 배치 {queue.stats['batches']}회)")
+
+    asyncio.run(_check_duplicates())
@@ -0,0 +1,118 @@
+# -*- coding: utf-8 -*-
+"""
+지오코딩 일일 API 사용량 저장소 (geocode_quota_usage 테이블)
+- 제공자(속도 제한기 이름) + 날짜별 사용 건수를 DB에 기록 → 재시작하거나 여러 프로세스가 같은 키를 써도 일일 한도 유지
+- 요청마다 쓰지 않고 블록(GEOCODE_QUOTA_BLOCK 건) 단위로 확보 → 지오코딩 동시 요청이 DB 쓰기로 줄 서지 않음
+  확보는 읽은 값이 그대로일 때만 늘리는 조건부 UPDATE (여러 프로세스가 동시에 확보해도 한도 이하)
+- TokenBucket(usage_store=..., quota_block=...) 이 확보분에서 메모리로 차감하고,
+  일괄 지오코딩이 끝나면 쓰지 않은 분량을 refund() 로 반환 (비정상 종료 시 최대 한 블록은 그날 사용한 것으로 남음)
+"""
+
+import os
+from datetime import date, datetime
+from typing import Optional
+
+from sqlalchemy import case
+from sqlalchemy.exc import IntegrityError
+
+from app.database.db import SessionLocal
+from app.models.geocode_quota import GeocodeQuotaUsage
+
+
+# 한 번의 DB 쓰기로 확보할 한도 건수 (요청마다 쓰지 않음 → 동기화 쓰기와 잠금 경합 감소)
+GEOCODE_QUOTA_BLOCK = int(os.getenv("GEOCODE_QUOTA_BLOCK", "50"))
+
+# 다른 프로세스와 동시에 확보할 때 다시 읽는 횟수
+QUOTA_TAKE_RETRIES = 5
+
+
+class QuotaUsageStore:
+    """geocode_quota_usage 테이블 읽기/쓰기"""
+
+    def __init__(self, session_factory=SessionLocal):
+        self.session_factory = session_factory
+
+    def take(self, name: str, day: date, limit: Optional[int], count: int = 1) -> int:
+        """
+        한도 count 건 확보 (남은 한도가 적으면 남은 만큼만)
+
+        Returns:
+            확보한 건수 (오늘 한도를 다 썼으면 0)
+        """
+        db = self.session_factory()
+        try:
+            query = db.query(GeocodeQuotaUsage).filter(
+                GeocodeQuotaUsage.provider == name,
+                GeocodeQuotaUsage.usage_date == day
+            )
+            for _ in range(QUOTA_TAKE_RETRIES):
+                used = query.with_entities(GeocodeQuotaUsage.used).scalar()
+                granted = count if limit is None else min(count, limit - (used or 0))
+                if granted <= 0:
+                    db.rollback()
+                    return 0
+
+                if used is None:
+                    # 오늘 첫 확보
+                    try:
+                        db.add(GeocodeQuotaUsage(provider=name, usage_date=day, used=granted, updated_at=datetime.now()))
+                        db.commit()
+                        return granted
+                    except IntegrityError:
+                        db.rollback()  # 다른 프로세스가 먼저 만듦 → 다시 읽음
+                        continue
+
+                # 읽은 값이 그대로일 때만 증가 (그 사이 다른 프로세스가 확보했으면 다시 읽음)
+                updated = query.filter(GeocodeQuotaUsage.used == used).update(
+                    {GeocodeQuotaUsage.used: used + granted, GeocodeQuotaUsage.updated_at: datetime.now()},
+                    synchronize_session=False
+                )
+                if updated:
+                    db.commit()
+                    return granted
+                db.rollback()
+            return 0
+        finally:
+            db.close()
+
+    def refund(self, name: str, day: date, count: int = 1):
+        """확보한 한도 count 건 반환 (쓰지 않은 블록, 보내지 못한 요청)"""
+        db = self.session_factory()
+        try:
+            db.query(GeocodeQuotaUsage).filter(
+                GeocodeQuotaUsage.provider == name,
+                GeocodeQuotaUsage.usage_date == day
+            ).update(
+                {GeocodeQuotaUsage.used: case(
+                    (GeocodeQuotaUsage.used > count, GeocodeQuotaUsage.used - count),
+                    else_=0
+                )},
+                synchronize_session=False
+            )
+            db.commit()
+        finally:
+            db.close()
+
+    def used(self, name: str, day: date) -> int:
+        """그날 사용 건수"""
+        db = self.session_factory()
+        try:
+            used = db.query(GeocodeQuotaUsage.used).filter(
+                GeocodeQuotaUsage.provider == name,
+                GeocodeQuotaUsage.usage_date == day
+            ).scalar()
+            return used or 0
+        finally:
+            db.close()
+
+
+# 싱글톤 인스턴스
+_quota_store = None
+
+
+def get_quota_store() -> QuotaUsageStore:
+    """일일 사용량 저장소 인스턴스 반환"""
+    global _quota_store
+    if _quota_store is None:
+        _quota_store = QuotaUsageStore()
+    return _quota_store
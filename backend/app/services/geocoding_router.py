@@ -0,0 +1,351 @@
+# -*- coding: utf-8 -*-
+"""
+여러 지오코딩 제공자(Kakao 주소 검색 / Naver / Kakao 키워드 검색)를 하나로 묶는 라우터
+- 가장 성적이 좋은 제공자에 먼저 요청하고, 응답이 늦으면 다음 제공자에 헤지 요청을 추가로 보냄
+- 먼저 도착한 성공 응답을 사용하고 나머지 요청은 취소 (속도 제한 대기 중에 취소된 요청은 일일 한도를 쓰지 않음)
+- 결과 없음/오류는 기다리지 않고 바로 다음 제공자로 넘어감
+- 제공자별 지연 시간(p50/p90)과 성공률을 기록해 순서와 헤지 대기 시간을 조정
+- 캐시는 geocode_cache 테이블 공용 (성공은 실제 응답한 제공자 이름, 모든 제공자 실패는 "router" 로 기록)
+"""
+
+import asyncio
+import os
+import time
+from collections import deque
+from typing import Dict, List, Optional, Tuple
+
+from app.services.address_normalizer import clean_address
+from app.services.geocode_batch import GEOCODE_CONCURRENCY, geocode_batch
+from app.services.geocode_cache import GeocodeCacheStore, get_geocode_cache
+from app.services.rate_limiter import DailyQuotaExceeded
+
+
+# 통계가 쌓이기 전 헤지 대기 시간 (초)
+GEOCODE_HEDGE_DELAY = float(os.getenv("GEOCODE_HEDGE_DELAY", "0.5"))
+
+# 지연 시간 p90 으로 계산한 헤지 대기 시간의 하한/상한 (초)
+GEOCODE_HEDGE_MIN_DELAY = float(os.getenv("GEOCODE_HEDGE_MIN_DELAY", "0.2"))
+GEOCODE_HEDGE_MAX_DELAY = float(os.getenv("GEOCODE_HEDGE_MAX_DELAY", "2.0"))
+
+# p90 을 헤지 대기 시간으로 쓰기 시작하는 최소 표본 수 / 보관하는 최근 표본 수
+MIN_LATENCY_SAMPLES = 20
+LATENCY_WINDOW = 200
+
+# 항상 마지막 순서로 두는 대체 제공자 (주소 검색보다 신뢰도 낮음)
+FALLBACK_PROVIDERS = ("kakao_keyword",)
+
+# 캐시에 실패(모든 제공자 결과 없음)를 기록할 때 쓰는 제공자 이름
+ROUTER_PROVIDER = "router"
+
+
+def _percentile(samples, ratio: float) -> Optional[float]:
+    """표본의 백분위 값 (표본이 없으면 None)"""
+    if not samples:
+        return None
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * ratio))]
+
+
+class ProviderStats:
+    """제공자별 호출 결과/지연 시간 기록"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.calls = 0
+        self.ok = 0
+        self.not_found = 0
+        self.errors = 0
+        self.cancelled = 0
+        self.wins = 0
+        self.latencies = deque(maxlen=LATENCY_WINDOW)
+
+    def record(self, status: str, elapsed: float):
+        """완료된 호출 1건 기록"""
+        self.calls += 1
+        if status == "ok":
+            self.ok += 1
+        elif status == "not_found":
+            self.not_found += 1
+        else:
+            self.errors += 1
+        self.latencies.append(elapsed)
+
+    def success_rate(self) -> float:
+        """오류가 아닌 응답 비율 (호출 기록이 없으면 1.0)"""
+        if self.calls == 0:
+            return 1.0
+        return (self.ok + self.not_found) / self.calls
+
+    def p50(self) -> Optional[float]:
+        return _percentile(self.latencies, 0.5)
+
+    def p90(self) -> Optional[float]:
+        return _percentile(self.latencies, 0.9)
+
+    def to_dict(self) -> Dict:
+        p50, p90 = self.p50(), self.p90()
+        return {
+            "calls": self.calls,
+            "ok": self.ok,
+            "not_found": self.not_found,
+            "errors": self.errors,
+            "cancelled": self.cancelled,
+            "wins": self.wins,
+            "p50_ms": round(p50 * 1000, 1) if p50 is not None else None,
+            "p90_ms": round(p90 * 1000, 1) if p90 is not None else None,
+        }
+
+
+class GeocodingRouter:
+    """헤지 요청을 사용하는 다중 제공자 지오코딩 서비스"""
+
+    provider = ROUTER_PROVIDER
+
+    def __init__(
+        self,
+        providers: List,
+        cache: Optional[GeocodeCacheStore] = None,
+        hedge_delay: Optional[float] = None
+    ):
+        """
+        Args:
+            providers: search(address) 를 가진 제공자 목록 (앞쪽이 통계가 없을 때의 우선순위)
+            cache: 지오코딩 결과 캐시 (기본: 공용 geocode_cache 테이블)
+            hedge_delay: 고정 헤지 대기 시간 (초, 없으면 제공자 p90 으로 자동 조정)
+        """
+        if not providers:
+            raise ValueError("지오코딩 제공자가 하나 이상 필요합니다")
+
+        self.providers = providers
+        self.cache = cache or get_geocode_cache()
+        self.hedge_delay = hedge_delay
+        self.stats = {p.provider: ProviderStats(p.provider) for p in providers}
+        self._exhausted = set()  # 일일 한도를 다 쓴 제공자
+        self._hedges = 0
+
+    def _chain(self) -> List:
+        """요청 순서 (성공률 높은 순(10% 단위) → p50 빠른 순, 대체 제공자는 마지막)"""
+        available = [p for p in self.providers if p.provider not in self._exhausted]
+        order = {p.provider: index for index, p in enumerate(self.providers)}
+
+        def rank(p):
+            stats = self.stats[p.provider]
+            p50 = stats.p50()
+            return (
+                p.provider in FALLBACK_PROVIDERS,
+                -round(stats.success_rate(), 1),
+                p50 if p50 is not None else float("inf"),
+                order[p.provider],
+            )
+
+        return sorted(available, key=rank)
+
+    def _hedge_delay_for(self, provider) -> float:
+        """다음 제공자에 헤지 요청을 보내기 전 대기 시간 (초)"""
+        if self.hedge_delay is not None:
+            return self.hedge_delay
+        stats = self.stats[provider.provider]
+        if len(stats.latencies) < MIN_LATENCY_SAMPLES:
+            return GEOCODE_HEDGE_DELAY
+        return min(GEOCODE_HEDGE_MAX_DELAY, max(GEOCODE_HEDGE_MIN_DELAY, stats.p90()))
+
+    async def _call(self, provider, address: str) -> Tuple[str, Optional[Tuple[float, float]], Optional[float]]:
+        """제공자 1회 호출 + 통계 기록 (일일 한도 초과는 "quota" 상태로 반환)"""
+        stats = self.stats[provider.provider]
+        started = time.monotonic()
+        try:
+            status, coords, confidence = await provider.search(address)
+        except DailyQuotaExceeded as e:
+            if provider.provider not in self._exhausted:
+                print(f"⛔ {e} → {provider.provider} 제외")
+            self._exhausted.add(provider.provider)
+            return "quota", None, None
+        except asyncio.CancelledError:
+            stats.cancelled += 1
+            raise
+        stats.record(status, time.monotonic() - started)
+        return status, coords, confidence
+
+    async def _race(self, address: str) -> Tuple[str, Optional[str], Optional[Tuple[float, float]], Optional[float]]:
+        """
+        헤지 요청으로 제공자들을 경쟁시킴
+
+        Returns:
+            (상태, 제공자, 좌표, 신뢰도) - 상태는 ok / not_found(모두 결과 없음) / error / quota(모두 한도 초과)
+        """
+        chain = self._chain()
+        if not chain:
+            return "quota", None, None, None
+
+        tasks = {}  # {task: provider}
+        statuses = []
+        next_index = 0
+
+        def launch():
+            nonlocal next_index
+            provider = chain[next_index]
+            next_index += 1
+            tasks[asyncio.ensure_future(self._call(provider, address))] = provider
+            return provider
+
+        try:
+            last_launched = launch()
+            while tasks:
+                can_hedge = next_index < len(chain)
+                done, _ = await asyncio.wait(
+                    tasks,
+                    timeout=self._hedge_delay_for(last_launched) if can_hedge else None,
+                    return_when=asyncio.FIRST_COMPLETED
+                )
+
+                if not done:
+                    # 응답이 늦음 → 다음 제공자에 헤지 요청
+                    self._hedges += 1
+                    last_launched = launch()
+                    continue
+
+                for task in done:
+                    provider = tasks.pop(task)
+                    status, coords, confidence = task.result()
+                    if status == "ok":
+                        self.stats[provider.provider].wins += 1
+                        return "ok", provider.provider, coords, confidence
+                    statuses.append(status)
+
+                # 결과 없음/오류 → 기다리지 않고 다음 제공자로
+                if not tasks and next_index < len(chain):
+                    last_launched = launch()
+        finally:
+            for task in tasks:
+                task.cancel()
+            if tasks:
+                await asyncio.gather(*tasks, return_exceptions=True)
+
+        if statuses and all(status == "quota" for status in statuses):
+            return "quota", None, None, None
+        if "error" in statuses or "quota" in statuses:
+            return "error", None, None, None
+        return "not_found", None, None, None
+
+    async def geocode_address(self, address: str) -> Optional[Tuple[float, float]]:
+        """
+        주소를 좌표로 변환 (geocode_cache 테이블을 먼저 확인)
+
+        Args:
+            address: 변환할 주소
+
+        Returns:
+            (latitude, longitude) 튜플 또는 None (모든 제공자가 한도 초과면 DailyQuotaExceeded)
+        """
+        if not address or not address.strip():
+            return None
+
+        # 캐시는 주소 키(geocode_key)로 조회/저장 (GeocodeCacheStore), 제공자에는 장소명이 남은 원문으로 요청
+        address = clean_address(address)
+
+        state, cached = await asyncio.to_thread(self.cache.lookup, address, ROUTER_PROVIDER)
+        if state == "hit":
+            return cached
+        if state == "negative":
+            return None
+
+        status, provider, coords, confidence = await self._race(address)
+        if status == "ok":
+            await asyncio.to_thread(self.cache.store, address, provider, coords, confidence)
+            return coords
+        if status == "not_found":
+            # 모든 제공자가 결과 없음일 때만 실패로 기록
+            await asyncio.to_thread(self.cache.store, address, ROUTER_PROVIDER, None, None)
+            return None
+        if status == "quota" and cached is None:
+            raise DailyQuotaExceeded("모든 지오코딩 제공자의 일일 한도 초과")
+
+        # 일시적 오류는 캐시하지 않음 (만료된 좌표가 있으면 그대로 사용)
+        return cached
+
+    async def geocode_batch(
+        self,
+        addresses: list,
+        show_progress: bool = True,
+        concurrency: int = GEOCODE_CONCURRENCY
+    ) -> Dict[str, Optional[Tuple[float, float]]]:
+        """
+        여러 주소를 동시에 변환 (주소 키로 중복 제거, app.services.geocode_batch 참고)
+
+        Returns:
+            {address: (lat, lon)} 딕셔너리
+        """
+        return await geocode_batch(self, addresses, show_progress, concurrency)
+
+    def _limiters(self) -> Dict:
+        """제공자가 쓰는 속도 제한기 (Kakao 주소/키워드 검색은 같은 제한기 공유)"""
+        return {id(p.rate_limiter): p.rate_limiter for p in self.providers}
+
+    def remaining_today(self) -> Optional[int]:
+        """오늘 남은 API 요청 수 합계 (일일 한도 없는 제공자가 있으면 None)"""
+        remaining = [limiter.remaining_today() for limiter in self._limiters().values()]
+        if any(value is None for value in remaining):
+            return None
+        return sum(remaining)
+
+    def provider_stats(self) -> Dict:
+        """제공자별 통계 (현재 요청 순서대로)"""
+        return {p.provider: self.stats[p.provider].to_dict() for p in self._chain()}
+
+    def get_cache_stats(self) -> Dict:
+        """캐시/제공자 통계 반환"""
+        return {
+            "cached_addresses": self.cache.count(),
+            "api_calls": sum(stats.calls + stats.cancelled for stats in self.stats.values()),
+            "used_today": sum(limiter.stats()["used_today"] for limiter in self._limiters().values()),
+            "hedges": self._hedges,
+            "providers": self.provider_stats(),
+            **self.cache.stats,
+        }
+
+    async def aclose(self):
+        """제공자 클라이언트 종료"""
+        for provider in self.providers:
+            if hasattr(provider, "aclose"):
+                await provider.aclose()
+
+
+def build_providers(
+    kakao_api_key: Optional[str] = None,
+    naver_client_id: Optional[str] = None,
+    naver_client_secret: Optional[str] = None,
+    cache: Optional[GeocodeCacheStore] = None
+) -> List:
+    """설정된 API 키로 제공자 목록 생성 (Kakao 주소 → Naver → Kakao 키워드)"""
+    from app.services.geocoding_service import KakaoGeocodingService, KakaoKeywordGeocodingService
+    from app.services.naver_geocoding_service import NaverGeocodingService
+
+    providers = []
+    kakao = None
+    if kakao_api_key:
+        kakao = KakaoGeocodingService(kakao_api_key, cache=cache)
+        providers.append(kakao)
+    if naver_client_id and naver_client_secret:
+        providers.append(NaverGeocodingService(naver_client_id, naver_client_secret, cache=cache))
+    if kakao is not None:
+        providers.append(KakaoKeywordGeocodingService(kakao))
+    return providers
+
+
+# 싱글톤 인스턴스
+_geocoding_router = None
+
+
+def get_geocoding_router() -> GeocodingRouter:
+    """환경 변수(KAKAO_REST_API_KEY, NAVER_CLIENT_ID/SECRET)로 구성한 라우터 반환"""
+    global _geocoding_router
+    if _geocoding_router is None:
+        providers = build_providers(
+            os.getenv("KAKAO_REST_API_KEY"),
+            os.getenv("NAVER_CLIENT_ID"),
+            os.getenv("NAVER_CLIENT_SECRET")
+        )
+        if not providers:
+            raise ValueError("KAKAO_REST_API_KEY 또는 NAVER_CLIENT_ID/NAVER_CLIENT_SECRET 설정이 필요합니다")
+        _geocoding_router = GeocodingRouter(providers)
+    return _geocoding_router
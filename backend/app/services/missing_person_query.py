@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+"""
+실종자 목록 조회 쿼리 (GET /missing-persons, bench_query_plans.py 공용)
+- 필터: 상태, 발생일 범위, 성별, 나이 범위, 장애 여부, 검색어 / 정렬: 발생일 최신순
+- MissingPerson.__table_args__ 의 복합 인덱스가 이 필터/정렬 조합에 맞춰 설계되어 있음
+  (상태 → 발생일 → 성별 → 나이 → 장애 여부 순서: 등호 조건, 정렬/범위, 인덱스 안에서 거르는 조건)
+- 검색어는 FTS5 전문 검색 인덱스 사용 (app/services/text_search.py)
+"""
+
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import Select, func
+
+from app.models.missing_person import MissingPerson
+from app.services.text_search import search_filter
+
+
+def build_missing_persons_query(
+    stmt: Select,
+    bind,
+    status: Optional[str] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    gender: Optional[str] = None,
+    age_min: Optional[int] = None,
+    age_max: Optional[int] = None,
+    has_disability: Optional[bool] = None,
+    search: Optional[str] = None
+) -> Select:
+    """
+    select(MissingPerson) 문에 목록 필터 적용 (정렬/페이징은 호출하는 쪽에서)
+
+    Args:
+        stmt: select(MissingPerson)
+        bind: 엔진/연결 (동기·비동기 모두, 검색 방식 결정용)
+        status: missing / resolved (None 또는 all 이면 전체)
+        since / until: 발생일 범위 (포함)
+        gender: M / F
+        age_min / age_max: 나이 범위 (포함)
+        has_disability: True → 장애 있음, False → 없음 (수집 시 계산한 has_disability 컬럼)
+        search: 주소/상세정보 검색어 (공백으로 나눈 단어를 모두 포함)
+    """
+    if status and status != "all":
+        stmt = stmt.where(MissingPerson.status == status)
+
+    if since is not None:
+        stmt = stmt.where(MissingPerson.missing_date >= since)
+    if until is not None:
+        stmt = stmt.where(MissingPerson.missing_date <= until)
+
+    if gender:
+        stmt = stmt.where(MissingPerson.gender == gender)
+
+    if age_min is not None:
+        stmt = stmt.where(MissingPerson.age >= age_min)
+    if age_max is not None:
+        stmt = stmt.where(MissingPerson.age <= age_max)
+
+    if has_disability is not None:
+        stmt = stmt.where(MissingPerson.has_disability.is_(has_disability))
+
+    if search:
+        stmt = search_filter(stmt, bind, search)
+
+    return stmt
+
+
+def page_query(stmt: Select, skip: int = 0, limit: int = 100) -> Select:
+    """발생일 최신순 페이지 (인덱스를 역순으로 읽어 정렬 없이 limit 건에서 멈춤)"""
+    return stmt.order_by(MissingPerson.missing_date.desc()).offset(skip).limit(limit)
+
+
+def count_query(stmt: Select) -> Select:
+    """
+    필터 적용 후 전체 건수
+
+    모든 컬럼을 고른 서브쿼리를 감싸지 않고 id(rowid)만 세어
+    인덱스만으로(커버링) 끝나도록 합니다.
+    """
+    return stmt.with_only_columns(func.count(MissingPerson.id)).order_by(None)
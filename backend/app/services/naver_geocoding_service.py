@@ -4,33 +4,61 @@ Naver Geocoding API를 사용한 주소 → 좌표 변환 서비스
 - 한국 주소에 최적화
 - 하루 10만건 무료
 - Kakao보다 정확함
+- 결과는 geocode_cache 테이블에 저장 (Kakao 서비스와 공용)
 """
 
 import httpx
 import asyncio
+import os
 from typing import Optional, Tuple, Dict
-from datetime import datetime
+
+from app.services.address_normalizer import clean_address
+from app.services.geocode_cache import GeocodeCacheStore, get_geocode_cache
+from app.services.geocode_batch import GEOCODE_CONCURRENCY, geocode_batch
+from app.services.geocode_quota import GEOCODE_QUOTA_BLOCK, get_quota_store
+from app.services.rate_limiter import get_rate_limiter
+
+
+# 초당 요청 수 / 일일 한도 (같은 프로세스의 모든 호출자가 공유, 일일 사용량은 geocode_quota_usage 테이블에 기록)
+NAVER_GEOCODE_RPS = float(os.getenv("NAVER_GEOCODE_RPS", "10"))
+NAVER_GEOCODE_DAILY_LIMIT = int(os.getenv("NAVER_GEOCODE_DAILY_LIMIT", "100000"))
 
 
 class NaverGeocodingService:
     """Naver Maps Geocoding API 서비스"""
 
-    def __init__(self, client_id: str, client_secret: str):
+    provider = "naver"
+
+    def __init__(
+        self,
+        client_id: str,
+        client_secret: str,
+        cache: Optional[GeocodeCacheStore] = None
+    ):
         """
         Args:
             client_id: Naver Cloud Platform Client ID
             client_secret: Naver Cloud Platform Client Secret
+            cache: 지오코딩 결과 캐시 (기본: 공용 geocode_cache 테이블)
         """
         self.client_id = client_id
         self.client_secret = client_secret
         self.base_url = "https://naveropenapi.apigw.ntruss.com/map-geocode/v2/geocode"
-        self._cache = {}  # 주소 캐시
-        self._request_count = 0
-        self._last_request_time = None
+        self.cache = cache or get_geocode_cache()
+        self.rate_limiter = get_rate_limiter(
+            self.provider,
+            rate_per_second=NAVER_GEOCODE_RPS,
+            daily_limit=NAVER_GEOCODE_DAILY_LIMIT,
+            usage_store=get_quota_store(),
+            quota_block=GEOCODE_QUOTA_BLOCK
+        )
+        self._client: Optional[httpx.AsyncClient] = None
+        self._client_loop = None
+        self._api_calls = 0
 
     async def geocode_address(self, address: str) -> Optional[Tuple[float, float]]:
         """
-        주소를 좌표로 변환
+        주소를 좌표로 변환 (geocode_cache 테이블을 먼저 확인)
 
         Args:
             address: 변환할 주소
@@ -41,116 +69,118 @@ class NaverGeocodingService:
         if not address or not address.strip():
             return None
 
-        address = address.strip()
+        # 캐시는 주소 키(geocode_key)로 조회/저장 (GeocodeCacheStore), 제공자에는 장소명이 남은 원문으로 요청
+        address = clean_address(address)
+
+        # 캐시 확인 (성공은 제공자 공용, 실패는 Naver 기록만)
+        state, cached = await asyncio.to_thread(self.cache.lookup, address, self.provider)
+        if state == "hit":
+            return cached
+        if state == "negative":
+            return None
+
+        status, result, confidence = await self.search(address)
+        if status == "error":
+            # 일시적 오류는 캐시하지 않음 (만료된 좌표가 있으면 그대로 사용)
+            return cached
+
+        await asyncio.to_thread(self.cache.store, address, self.provider, result, confidence)
+        return result
 
-        # 캐시 확인
-        if address in self._cache:
-            return self._cache[address]
+    async def search(self, address: str) -> Tuple[str, Optional[Tuple[float, float]], Optional[float]]:
+        """
+        Naver 주소 검색 1회 (캐시 없음, GeocodingRouter 공통 인터페이스)
 
-        # API 호출 속도 제한 (초당 최대 10회)
-        await self._rate_limit()
+        API 호출 속도 제한: 프로세스 전체 공유 토큰 버킷 (일일 한도 초과 시 DailyQuotaExceeded)
 
+        Returns:
+            (상태, 좌표, 신뢰도) - 상태는 ok / not_found / error
+        """
+        await self.rate_limiter.acquire()
         try:
-            async with httpx.AsyncClient(timeout=10.0) as client:
-                response = await client.get(
-                    self.base_url,
-                    params={"query": address},
-                    headers={
-                        "X-NCP-APIGW-API-KEY-ID": self.client_id,
-                        "X-NCP-APIGW-API-KEY": self.client_secret
-                    }
-                )
+            self._api_calls += 1
+            client = self._get_client()
+            response = await client.get(
+                self.base_url,
+                params={"query": address},
+                headers={
+                    "X-NCP-APIGW-API-KEY-ID": self.client_id,
+                    "X-NCP-APIGW-API-KEY": self.client_secret
+                }
+            )
 
-                if response.status_code != 200:
-                    print(f"⚠️  지오코딩 실패 (HTTP {response.status_code}): {address[:30]}")
-                    return None
+            if response.status_code != 200:
+                print(f"⚠️  지오코딩 실패 (HTTP {response.status_code}): {address[:30]}")
+                return "error", None, None
 
-                data = response.json()
+            data = response.json()
 
-                # Naver API 응답 형식
-                if data.get("status") != "OK":
-                    return None
+            # Naver API 응답 형식
+            if data.get("status") != "OK":
+                return "error", None, None
 
-                addresses = data.get("addresses", [])
-                if not addresses:
-                    return None
+            addresses = data.get("addresses", [])
+            if not addresses:
+                return "not_found", None, None
 
-                # 첫 번째 결과 사용
-                first_result = addresses[0]
+            # 첫 번째 결과 사용
+            first_result = addresses[0]
 
-                # Naver는 x=경도, y=위도 순서
-                lon = float(first_result.get("x"))
-                lat = float(first_result.get("y"))
+            # Naver는 x=경도, y=위도 순서
+            lon = float(first_result.get("x"))
+            lat = float(first_result.get("y"))
 
-                result = (lat, lon)
-                self._cache[address] = result
-                return result
+            return "ok", (lat, lon), 1.0
 
         except httpx.HTTPError as e:
             print(f"⚠️  HTTP 오류: {address[:30]}, {str(e)}")
-            return None
+            return "error", None, None
         except Exception as e:
             print(f"⚠️  지오코딩 오류: {address[:30]}, {str(e)}")
-            return None
-
-    async def _rate_limit(self):
-        """API 호출 속도 제한 (초당 최대 10회)"""
-        current_time = datetime.now()
-
-        if self._last_request_time:
-            time_diff = (current_time - self._last_request_time).total_seconds()
-
-            # 같은 초 내에 10번 이상 요청하면 대기
-            if time_diff < 1.0:
-                self._request_count += 1
-                if self._request_count >= 10:
-                    await asyncio.sleep(1.0 - time_diff)
-                    self._request_count = 0
-            else:
-                self._request_count = 0
-
-        self._last_request_time = datetime.now()
+            return "error", None, None
+
+    def _get_client(self) -> httpx.AsyncClient:
+        """keep-alive 공유 클라이언트 (현재 이벤트 루프 기준으로 재사용)"""
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._client.is_closed or self._client_loop is not loop:
+            self._client = httpx.AsyncClient(
+                timeout=10.0,
+                limits=httpx.Limits(max_connections=GEOCODE_CONCURRENCY * 2)
+            )
+            self._client_loop = loop
+        return self._client
+
+    async def aclose(self):
+        """공유 클라이언트 종료"""
+        if self._client is not None and not self._client.is_closed:
+            await self._client.aclose()
+        self._client = None
 
     async def geocode_batch(
         self,
         addresses: list,
-        show_progress: bool = True
+        show_progress: bool = True,
+        concurrency: int = GEOCODE_CONCURRENCY
     ) -> Dict[str, Optional[Tuple[float, float]]]:
         """
-        여러 주소를 일괄 변환
-
-        Args:
-            addresses: 변환할 주소 리스트
-            show_progress: 진행 상황 출력 여부
+        여러 주소를 동시에 변환 (주소 키로 중복 제거, app.services.geocode_batch 참고)
 
         Returns:
             {address: (lat, lon)} 딕셔너리
         """
-        results = {}
-        total = len(addresses)
-
-        for idx, address in enumerate(addresses, 1):
-            if show_progress and idx % 10 == 0:
-                print(f"🗺️  지오코딩 진행: {idx}/{total} ({idx/total*100:.1f}%)")
-
-            result = await self.geocode_address(address)
-            results[address] = result
-
-            # API 부하 방지
-            if idx % 50 == 0:
-                await asyncio.sleep(1.0)
-
-        if show_progress:
-            success_count = sum(1 for v in results.values() if v is not None)
-            print(f"✅ 지오코딩 완료: {success_count}/{total} ({success_count/total*100:.1f}%)")
+        return await geocode_batch(self, addresses, show_progress, concurrency)
 
-        return results
+    def remaining_today(self) -> Optional[int]:
+        """오늘 남은 API 요청 수 (일일 한도 없으면 None)"""
+        return self.rate_limiter.remaining_today()
 
     def get_cache_stats(self) -> Dict:
         """캐시 통계 반환"""
         return {
-            "cached_addresses": len(self._cache),
-            "total_requests": self._request_count
+            "cached_addresses": self.cache.count(),
+            "api_calls": self._api_calls,
+            "used_today": self.rate_limiter.stats()["used_today"],
+            **self.cache.stats,
         }
 
 
@@ -0,0 +1,252 @@
+# -*- coding: utf-8 -*-
+"""
+비동기 토큰 버킷 속도 제한기
+- 초당 요청 수 + 순간 허용량(burst) + 일일 한도
+- 같은 이름의 제한기는 프로세스 전체에서 공유 → 여러 호출자가 동시에 써도 합계가 한도를 넘지 않음
+- 대기 순서는 요청 순서대로 예약 (GCRA 방식), 스레드/이벤트 루프와 무관하게 동작
+- 일일 한도는 대기가 끝나 실제로 요청을 보낼 때 차감 (대기 중 취소된 헤지 요청은 한도를 쓰지 않음)
+- usage_store 를 주면 일일 사용량을 DB에 기록 (재시작/여러 프로세스에서도 한도 유지, app/services/geocode_quota.py)
+  요청마다 쓰지 않고 quota_block 건씩 미리 확보 → 쓰지 않은 분량은 settle() 로 반환
+"""
+
+import asyncio
+import threading
+import time
+from datetime import date
+from typing import Dict, Optional
+
+
+# usage_store 에서 한도 소진을 확인한 뒤 DB를 다시 보지 않고 바로 거절하는 시간 (초)
+QUOTA_RECHECK_SECONDS = 60
+
+
+class DailyQuotaExceeded(Exception):
+    """일일 한도 초과 (다음 날까지 요청 불가)"""
+
+
+class TokenBucket:
+    """비동기 토큰 버킷"""
+
+    def __init__(
+        self,
+        name: str,
+        rate_per_second: float,
+        burst: Optional[int] = None,
+        daily_limit: Optional[int] = None,
+        usage_store=None,
+        quota_block: int = 1
+    ):
+        """
+        Args:
+            name: 제한기 이름 (로그용)
+            rate_per_second: 초당 허용 요청 수
+            burst: 순간 허용량 (기본 1: 요청 간격을 균등하게 → 어느 1초 구간에서도 한도 이하)
+            daily_limit: 일일 최대 요청 수 (None이면 제한 없음)
+            usage_store: take/refund/used 를 가진 일일 사용량 저장소 (None이면 메모리에만 기록)
+            quota_block: usage_store 에서 한 번에 확보할 한도 건수 (DB 쓰기 1회로 여러 요청분 확보)
+        """
+        if rate_per_second <= 0:
+            raise ValueError("rate_per_second는 0보다 커야 합니다")
+
+        self.name = name
+        self.rate_per_second = rate_per_second
+        self.burst = max(1, burst or 1)
+        self.daily_limit = daily_limit
+        self.usage_store = usage_store
+        self.quota_block = max(1, quota_block)
+        self._interval = 1.0 / rate_per_second
+        self._next_free = 0.0  # 다음 요청이 대기 없이 나갈 수 있는 이론적 시각 (monotonic)
+        self._day = date.today()
+        self._used_today = 0  # 이 프로세스가 오늘 보낸 요청 수
+        self._reserved = 0  # usage_store 에서 확보했지만 아직 쓰지 않은 한도 (오늘)
+        self._exhausted_at: Optional[float] = None  # usage_store 에서 한도 소진을 확인한 시각 (monotonic)
+        self._lock = threading.Lock()
+        self._block_lock = threading.Lock()  # 한도 블록 확보는 한 번에 하나만
+
+    def _roll_day(self) -> date:
+        """날짜가 바뀌었으면 사용량 초기화 (self._lock 안에서 호출)"""
+        today = date.today()
+        if today != self._day:
+            self._day = today
+            self._used_today = 0
+            self._reserved = 0  # 전날 확보분은 전날 기록에 남음
+            self._exhausted_at = None
+        return today
+
+    def _quota_error(self) -> DailyQuotaExceeded:
+        return DailyQuotaExceeded(f"{self.name} 일일 한도 {self.daily_limit}건 초과")
+
+    def _quota_spent(self) -> bool:
+        """오늘 한도를 다 썼는지 (self._lock 안에서 호출)"""
+        if self.usage_store is not None:
+            # 다른 프로세스가 쓰지 않은 블록을 반환할 수 있으므로 잠시 뒤에는 DB를 다시 확인
+            return (
+                self._reserved == 0
+                and self._exhausted_at is not None
+                and time.monotonic() - self._exhausted_at < QUOTA_RECHECK_SECONDS
+            )
+        return self.daily_limit is not None and self._used_today >= self.daily_limit
+
+    def _reserve(self) -> float:
+        """요청 1건 예약 후 대기해야 할 시간(초) 반환 (이미 한도를 다 썼으면 바로 DailyQuotaExceeded)"""
+        with self._lock:
+            self._roll_day()
+            if self._quota_spent():
+                raise self._quota_error()
+
+            now = time.monotonic()
+            # burst 만큼은 앞당겨 보낼 수 있음
+            allowed_at = self._next_free - (self.burst - 1) * self._interval
+            wait = max(0.0, allowed_at - now)
+            self._next_free = max(self._next_free, now) + self._interval
+            return wait
+
+    def _take_local(self) -> Optional[date]:
+        """메모리에서 한도 1건 차감 (usage_store 가 있으면 확보해 둔 블록에서), 못 하면 None"""
+        with self._lock:
+            today = self._roll_day()
+            if self.usage_store is None:
+                if self.daily_limit is not None and self._used_today >= self.daily_limit:
+                    raise self._quota_error()
+            elif self._reserved > 0:
+                self._reserved -= 1
+            else:
+                return None
+            self._used_today += 1
+            return today
+
+    def _take(self) -> date:
+        """일일 한도 1건 차감 (한도 초과 시 DailyQuotaExceeded), 차감한 날짜 반환"""
+        day = self._take_local()
+        if day is not None:
+            return day
+
+        with self._block_lock:
+            # 기다리는 동안 다른 요청이 블록을 확보했으면 그대로 사용
+            day = self._take_local()
+            if day is not None:
+                return day
+
+            with self._lock:
+                today = self._roll_day()
+            granted = self.usage_store.take(self.name, today, self.daily_limit, self.quota_block)
+            with self._lock:
+                rolled = today != self._roll_day()
+                if not rolled:
+                    if granted == 0:
+                        self._exhausted_at = time.monotonic()
+                        raise self._quota_error()
+                    self._exhausted_at = None
+                    self._reserved += granted - 1
+                    self._used_today += 1
+                    return today
+            # 확보하는 사이 날짜가 바뀜 → 전날 확보분은 반환하고 새 날짜로 다시 확보
+            if granted:
+                self.usage_store.refund(self.name, today, granted)
+        return self._take()
+
+    def _refund(self, day: date):
+        """차감한 1건 되돌림 (usage_store 가 있으면 확보분으로 돌려 다음 요청이 사용)"""
+        with self._lock:
+            if day != self._day:
+                return
+            self._used_today = max(0, self._used_today - 1)
+            if self.usage_store is not None:
+                self._reserved += 1
+
+    def settle(self):
+        """확보했지만 쓰지 않은 한도를 usage_store 에 반환 (일괄 지오코딩이 끝날 때 호출)"""
+        if self.usage_store is None:
+            return
+        with self._block_lock:
+            with self._lock:
+                day, unused = self._day, self._reserved
+                self._reserved = 0
+            if unused:
+                self.usage_store.refund(self.name, day, unused)
+
+    async def acquire(self):
+        """
+        요청 1건 허가 대기 (일일 한도 초과 시 DailyQuotaExceeded)
+
+        속도 제한 대기가 끝난 뒤, 곧 요청을 보낼 때 일일 한도를 차감합니다.
+        대기 중에 취소되면(헤지 요청 취소) 한도를 쓰지 않고, 차감 도중 취소되면 되돌립니다.
+        usage_store 가 있으면 quota_block 건씩 확보해 두고 메모리에서 차감합니다 (블록을 다 쓸 때만 DB 쓰기).
+        """
+        wait = self._reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+        if self._take_local() is not None:
+            return
+
+        task = asyncio.ensure_future(asyncio.to_thread(self._take))
+        try:
+            await asyncio.shield(task)
+        except asyncio.CancelledError:
+            task.add_done_callback(self._refund_cancelled)
+            raise
+
+    def _refund_cancelled(self, task: asyncio.Future):
+        """취소된 요청이 차감한 한도를 되돌림 (차감 작업 완료 콜백)"""
+        if task.cancelled() or task.exception() is not None:
+            return
+        self._refund(task.result())
+
+    def remaining_today(self) -> Optional[int]:
+        """오늘 남은 요청 수 (일일 한도가 없으면 None)"""
+        if self.daily_limit is None:
+            return None
+        if self.usage_store is not None:
+            # 다른 프로세스 사용분까지 반영 (DB 값에는 확보만 하고 아직 쓰지 않은 블록도 포함)
+            today = date.today()
+            used = self.usage_store.used(self.name, today)
+            with self._lock:
+                reserved = self._reserved if self._roll_day() == today else 0
+            return max(0, self.daily_limit - used + reserved)
+        with self._lock:
+            if date.today() != self._day:
+                return self.daily_limit
+            return max(0, self.daily_limit - self._used_today)
+
+    def stats(self) -> Dict:
+        """사용량 통계 (used_today: 이 프로세스가 오늘 보낸 요청 수)"""
+        with self._lock:
+            return {
+                "name": self.name,
+                "rate_per_second": self.rate_per_second,
+                "burst": self.burst,
+                "daily_limit": self.daily_limit,
+                "used_today": self._used_today,
+                "reserved": self._reserved,
+            }
+
+
+# 이름별 공유 인스턴스
+_limiters: Dict[str, TokenBucket] = {}
+_limiters_lock = threading.Lock()
+
+
+def get_rate_limiter(
+    name: str,
+    rate_per_second: float,
+    burst: Optional[int] = None,
+    daily_limit: Optional[int] = None,
+    usage_store=None,
+    quota_block: int = 1
+) -> TokenBucket:
+    """이름별 공유 속도 제한기 반환 (처음 호출할 때의 설정으로 생성)"""
+    with _limiters_lock:
+        if name not in _limiters:
+            _limiters[name] = TokenBucket(
+                name, rate_per_second, burst, daily_limit, usage_store, quota_block
+            )
+        return _limiters[name]
+
+
+def settle_rate_limiters():
+    """모든 공유 제한기의 쓰지 않은 한도 블록을 usage_store 에 반환"""
+    with _limiters_lock:
+        limiters = list(_limiters.values())
+    for limiter in limiters:
+        limiter.settle()
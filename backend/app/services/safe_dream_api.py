@@ -2,29 +2,134 @@
 """
 안전Dream API 클라이언트 (수정 버전)
 - API 응답 형식 수정
+- 원본 응답 압축 보관 (선택, 실행/페이지 단위 JSONL.gz) → 오프라인 재현용
 """
 
+import gzip
+import hashlib
+import json
+import os
+import threading
+
 import httpx
 from typing import List, Dict, Optional
 from datetime import datetime
 from urllib.parse import urlencode
 
+from app.services.safe_dream_decoder import decode_json, parse_item, parse_items
+
+
+# ✅ 동기화 실행 간에 재사용되는 keep-alive 클라이언트 (페이지마다 TCP+TLS 핸드셰이크 방지)
+_http_client: Optional[httpx.AsyncClient] = None
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """공유 HTTP 클라이언트 반환 (없거나 닫혔으면 새로 생성)"""
+    global _http_client
+    if _http_client is None or _http_client.is_closed:
+        _http_client = httpx.AsyncClient(
+            timeout=30.0,
+            limits=httpx.Limits(
+                max_connections=20,
+                max_keepalive_connections=10,
+                keepalive_expiry=300.0
+            )
+        )
+    return _http_client
+
+
+async def close_http_client():
+    """공유 HTTP 클라이언트 종료 (서버 종료 시 호출)"""
+    global _http_client
+    if _http_client is not None and not _http_client.is_closed:
+        await _http_client.aclose()
+    _http_client = None
+
+
+# 원본 응답 보관 디렉터리 (비어 있으면 보관 안 함)
+DEFAULT_ARCHIVE_DIR = os.getenv("SAFE_DREAM_ARCHIVE_DIR") or None
+
 
 class SafeDreamAPI:
     """안전Dream API 클라이언트"""
     
-    def __init__(self, api_key: str, esntl_id: str = None):
+    def __init__(
+        self,
+        api_key: str,
+        esntl_id: str = None,
+        archive_dir: Optional[str] = DEFAULT_ARCHIVE_DIR,
+        run_id: Optional[str] = None,
+        transport: Optional[httpx.AsyncBaseTransport] = None
+    ):
+        """
+        Args:
+            api_key: 안전Dream API 키
+            esntl_id: 발급 ID
+            archive_dir: 원본 응답 보관 디렉터리 (None이면 보관 안 함)
+            run_id: 보관 파일 이름에 쓰는 실행 ID (기본: 생성 시각)
+            transport: 실제 엔드포인트 대신 사용할 httpx 트랜스포트 (재생/합성 데이터용)
+        """
         self.api_key = api_key
         self.esntl_id = esntl_id or "10000855"
         self.base_url = "https://www.safe182.go.kr/api/lcm/findChildList.do"
+        self.archive_dir = archive_dir
+        self.run_id = run_id or datetime.now().strftime("%Y%m%d-%H%M%S")
+        self._archive_lock = threading.Lock()
+        self._client = (
+            httpx.AsyncClient(transport=transport, timeout=30.0) if transport else None
+        )
+    
+    async def aclose(self):
+        """전용 트랜스포트 클라이언트 종료 (공유 클라이언트는 닫지 않음)"""
+        if self._client is not None:
+            await self._client.aclose()
+    
+    @property
+    def archive_path(self) -> Optional[str]:
+        """이번 실행의 원본 응답 보관 파일 경로"""
+        if not self.archive_dir:
+            return None
+        return os.path.join(self.archive_dir, f"{self.run_id}.jsonl.gz")
+    
+    def _archive_page(self, page_num: int, row_size: int, raw: bytes, query: Dict):
+        """원본 응답 한 페이지를 보관 파일에 추가 (gzip 멤버 단위 append)"""
+        record = {
+            "run_id": self.run_id,
+            "page": page_num,
+            "row_size": row_size,
+            "query": query,
+            "fetched_at": datetime.now().isoformat(),
+            "body": raw.decode("utf-8", errors="replace"),
+        }
+        line = json.dumps(record, ensure_ascii=False) + "\n"
+        
+        try:
+            os.makedirs(self.archive_dir, exist_ok=True)
+            with self._archive_lock, gzip.open(self.archive_path, "at", encoding="utf-8") as f:
+                f.write(line)
+        except OSError as e:
+            print(f"⚠️  응답 보관 실패: {e}")
     
     async def get_missing_children(
         self, 
         row_size: int = 100,
         page_num: int = 1,
-        writng_trget_dscds: List[str] = None
+        writng_trget_dscds: List[str] = None,
+        occr_adres: str = "",
+        detail_date1: str = "",
+        detail_date2: str = ""
     ) -> Dict:
-        """실종아동 목록 조회"""
+        """
+        실종아동 목록 조회
+
+        Args:
+            row_size: 페이지 크기
+            page_num: 페이지 번호
+            writng_trget_dscds: 대상 구분 코드 (기본: 010/060/070)
+            occr_adres: 발생 지역 (분할 수집용)
+            detail_date1: 발생일 시작 (분할 수집용)
+            detail_date2: 발생일 종료 (분할 수집용)
+        """
         if writng_trget_dscds is None:
             writng_trget_dscds = ["010", "060", "070"]
         
@@ -35,12 +140,12 @@ class SafeDreamAPI:
             "page": str(page_num),
             "sexdstnDscd": "",
             "nm": "",
-            "detailDate1": "",
-            "detailDate2": "",
+            "detailDate1": detail_date1,
+            "detailDate2": detail_date2,
             "age1": "",
             "age2": "",
             "etcSpfeatr": "",
-            "occrAdres": "",
+            "occrAdres": occr_adres,
             "xmlUseYN": "",
         }
         
@@ -51,42 +156,50 @@ class SafeDreamAPI:
         body = "&".join(body_parts)
         
         try:
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                print(f"🔍 요청 URL: {self.base_url}")
-                
-                response = await client.post(
-                    self.base_url,
-                    content=body,
-                    headers={
-                        "Content-Type": "application/x-www-form-urlencoded; charset=UTF-8"
-                    }
-                )
-                
-                print(f"🔍 응답 상태: {response.status_code}")
-                
-                if response.status_code != 200:
-                    return {
-                        "success": False,
-                        "msg": f"HTTP {response.status_code}", 
-                        "totalCount": 0, 
-                        "list": []
-                    }
-                
-                data = response.json()
-                
-                # ✅ 안전Dream API는 totalCount와 list만 반환
-                # result 필드가 없어도 정상!
-                if "totalCount" in data and "list" in data:
-                    data["success"] = True
-                    data["msg"] = "성공"
-                else:
-                    data["success"] = False
-                    data["msg"] = "응답 형식 오류"
-                    data["totalCount"] = 0
-                    data["list"] = []
-                
-                return data
-                
+            client = self._client or get_http_client()
+            print(f"🔍 요청 URL: {self.base_url} (page={page_num})")
+            
+            response = await client.post(
+                self.base_url,
+                content=body,
+                headers={
+                    "Content-Type": "application/x-www-form-urlencoded; charset=UTF-8"
+                }
+            )
+            
+            print(f"🔍 응답 상태: {response.status_code}")
+            
+            if response.status_code != 200:
+                return {
+                    "success": False,
+                    "msg": f"HTTP {response.status_code}", 
+                    "totalCount": 0, 
+                    "list": []
+                }
+            
+            if self.archive_dir:
+                self._archive_page(page_num, row_size, response.content, {
+                    "writngTrgetDscds": writng_trget_dscds,
+                    "occrAdres": occr_adres,
+                    "detailDate1": detail_date1,
+                    "detailDate2": detail_date2,
+                })
+            
+            data = decode_json(response.content)
+            
+            # ✅ 안전Dream API는 totalCount와 list만 반환
+            # result 필드가 없어도 정상!
+            if "totalCount" in data and "list" in data:
+                data["success"] = True
+                data["msg"] = "성공"
+            else:
+                data["success"] = False
+                data["msg"] = "응답 형식 오류"
+                data["totalCount"] = 0
+                data["list"] = []
+            
+            return data
+            
         except httpx.HTTPError as e:
             print(f"❌ API 호출 실패: {e}")
             return {"success": False, "msg": str(e), "totalCount": 0, "list": []}
@@ -94,51 +207,36 @@ class SafeDreamAPI:
             print(f"❌ 데이터 처리 실패: {e}")
             return {"success": False, "msg": str(e), "totalCount": 0, "list": []}
     
-    def parse_missing_person(self, item: Dict) -> Optional[Dict]:
-        """API 응답을 데이터베이스 모델로 변환"""
-        try:
-            return {
-                "external_id": str(item.get("msspsnIdntfccd", "")),
-                "missing_date": self._parse_date(item.get("occrde")),
-                "location_address": item.get("occrAdres", ""),
-                "location_detail": item.get("alldressingDscd", ""),
-                "age": self._parse_age(item.get("age")),
-                "gender": self._parse_gender(item.get("sexdstnDscd")),
-                "latitude": None,
-                "longitude": None,
-            }
-        except Exception as e:
-            print(f"⚠️ 데이터 파싱 실패: {e}")
-            return None
+    async def probe(self) -> Dict:
+        """
+        변경 감지용 경량 조회 (rowSize=1)
+
+        Returns:
+            {"success": bool, "total_count": int, "head_signature": str | None}
+        """
+        response = await self.get_missing_children(row_size=1, page_num=1)
+        return {
+            "success": response.get("success", False),
+            "msg": response.get("msg"),
+            "total_count": response.get("totalCount", 0),
+            "head_signature": self.head_signature(response.get("list", [])),
+        }
     
-    def _parse_date(self, date_str: str) -> Optional[datetime]:
-        """날짜 문자열 파싱"""
-        if not date_str:
-            return None
-        try:
-            if len(str(date_str)) == 8:
-                return datetime.strptime(str(date_str), "%Y%m%d")
-            return datetime.fromisoformat(str(date_str))
-        except Exception as e:
-            print(f"⚠️ 날짜 파싱 실패: {date_str}, {e}")
+    @staticmethod
+    def head_signature(items: List[Dict]) -> Optional[str]:
+        """첫 페이지 맨 앞 항목의 지문 (최신 등록 건이 바뀌었는지 비교용)"""
+        if not items:
             return None
+        encoded = json.dumps(items[0], sort_keys=True, ensure_ascii=False, default=str)
+        return hashlib.sha1(encoded.encode("utf-8")).hexdigest()
     
-    def _parse_age(self, age_str) -> Optional[int]:
-        """나이 파싱"""
-        try:
-            return int(age_str) if age_str else None
-        except:
-            return None
+    def parse_missing_person(self, item: Dict, errors: Optional[List[str]] = None) -> Optional[Dict]:
+        """API 응답을 데이터베이스 모델로 변환 (파싱 에러는 errors에 수집)"""
+        return parse_item(item, errors)
     
-    def _parse_gender(self, gender_str: str) -> Optional[str]:
-        """성별 파싱"""
-        if not gender_str:
-            return None
-        if "남" in str(gender_str):
-            return "M"
-        elif "여" in str(gender_str):
-            return "F"
-        return None
+    def parse_page(self, items: List[Dict], errors: Optional[List[str]] = None) -> List[Optional[Dict]]:
+        """페이지 항목 전체를 한 번에 변환"""
+        return parse_items(items, errors)
 
 
 # 싱글톤 인스턴스
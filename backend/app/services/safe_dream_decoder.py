@@ -0,0 +1,128 @@
+# -*- coding: utf-8 -*-
+"""
+안전Dream 응답 고속 디코딩/파싱
+- 원본 바이트 → dict: orjson 이 있으면 사용 (없으면 표준 json)
+- 8자리 발생일(occrde)은 strptime 대신 슬라이싱 + 캐시로 변환
+- 파싱 실패는 출력하지 않고 errors 리스트에 모음 (동기화 결과에서 건수/샘플 확인)
+- 키워드로 판별하는 속성(장애 여부)은 수집할 때 한 번만 계산해 인덱스 컬럼으로 저장
+  (조회마다 location_detail LIKE '%장애%' 로 모든 행을 읽지 않도록)
+"""
+
+import json
+from datetime import datetime
+from functools import lru_cache
+from typing import Dict, List, Optional
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+
+# 모아 둘 파싱 에러 메시지 최대 개수 (그 이상은 건수만)
+MAX_ERROR_MESSAGES = 100
+
+# 착의사항/상세정보(location_detail)에 포함되면 장애가 있는 것으로 보는 키워드
+DISABILITY_KEYWORDS = ("장애",)
+
+# 다른 필드에서 계산하는 컬럼 (원본 필드가 이미 content_hash에 포함되므로 지문에서 제외)
+DERIVED_COLUMNS = ("has_disability",)
+
+
+def decode_json(raw: bytes) -> Dict:
+    """응답 본문 바이트 → dict"""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+def _add_error(errors: Optional[List[str]], message: str):
+    """에러 메시지 수집 (상한까지만)"""
+    if errors is not None and len(errors) < MAX_ERROR_MESSAGES:
+        errors.append(message)
+
+
+@lru_cache(maxsize=65536)
+def _parse_yyyymmdd(value: str) -> Optional[datetime]:
+    """"20250101" → datetime (같은 날짜는 캐시, 잘못된 날짜는 None)"""
+    try:
+        return datetime(int(value[:4]), int(value[4:6]), int(value[6:8]))
+    except ValueError:
+        return None
+
+
+def parse_date(value, errors: Optional[List[str]] = None) -> Optional[datetime]:
+    """발생일 파싱 (8자리 숫자는 빠른 경로, 그 외는 ISO 형식)"""
+    if not value:
+        return None
+
+    text = str(value)
+    if len(text) == 8 and text.isdigit():
+        parsed = _parse_yyyymmdd(text)
+        if parsed is None:
+            _add_error(errors, f"날짜 파싱 실패: {text}")
+        return parsed
+
+    try:
+        if len(text) == 8:
+            return datetime.strptime(text, "%Y%m%d")
+        return datetime.fromisoformat(text)
+    except ValueError as e:
+        _add_error(errors, f"날짜 파싱 실패: {text}, {e}")
+        return None
+
+
+def parse_age(value) -> Optional[int]:
+    """나이 파싱 (숫자가 아니면 None)"""
+    if not value:
+        return None
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def parse_gender(value) -> Optional[str]:
+    """성별 파싱 (남/여 → M/F)"""
+    if not value:
+        return None
+    text = str(value)
+    if "남" in text:
+        return "M"
+    if "여" in text:
+        return "F"
+    return None
+
+
+def detect_disability(detail) -> bool:
+    """상세정보에 장애 키워드가 있는지"""
+    if not detail:
+        return False
+    text = str(detail)
+    return any(keyword in text for keyword in DISABILITY_KEYWORDS)
+
+
+def parse_item(item: Dict, errors: Optional[List[str]] = None) -> Optional[Dict]:
+    """API 항목 하나 → missing_persons 행 (실패 시 None, 에러는 errors에 수집)"""
+    try:
+        detail = item.get("alldressingDscd", "")
+        return {
+            "external_id": str(item.get("msspsnIdntfccd", "")),
+            "missing_date": parse_date(item.get("occrde"), errors),
+            "location_address": item.get("occrAdres", ""),
+            "location_detail": detail,
+            "age": parse_age(item.get("age")),
+            "gender": parse_gender(item.get("sexdstnDscd")),
+            "has_disability": detect_disability(detail),
+            "latitude": None,
+            "longitude": None,
+        }
+    except Exception as e:
+        _add_error(errors, f"데이터 파싱 실패: {e}")
+        return None
+
+
+def parse_items(items: List[Dict], errors: Optional[List[str]] = None) -> List[Optional[Dict]]:
+    """페이지 항목 전체 파싱 (한 번의 순회)"""
+    return [parse_item(item, errors) for item in items]
@@ -0,0 +1,207 @@
+# -*- coding: utf-8 -*-
+"""
+안전Dream API 오프라인 재생 트랜스포트
+- ReplayTransport: SafeDreamAPI가 보관한 원본 응답(JSONL.gz)을 그대로 재생
+- SyntheticTransport: N건의 합성 실종자 데이터를 생성해 응답
+
+SafeDreamAPI(transport=...) 로 넘기면 safe182.go.kr 대신 사용됩니다.
+네트워크 없이 동기화 성능을 재현/벤치마크할 때 사용합니다.
+"""
+
+import asyncio
+import gzip
+import json
+import random
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qs
+
+import httpx
+
+
+# 분할 수집 조건으로 쓰이는 요청 파라미터
+FILTER_PARAMS = ("writngTrgetDscds", "occrAdres", "detailDate1", "detailDate2")
+
+
+def _page_params(request: httpx.Request) -> Tuple[int, int, Dict]:
+    """요청 본문에서 (page, rowSize, 분할 조건) 추출"""
+    query = parse_qs(request.content.decode("utf-8"))
+    page = int(query.get("page", ["1"])[0] or 1)
+    row_size = int(query.get("rowSize", ["100"])[0] or 100)
+    filters = {
+        "writngTrgetDscds": query.get("writngTrgetDscds", []),
+        "occrAdres": query.get("occrAdres", [""])[0],
+        "detailDate1": query.get("detailDate1", [""])[0],
+        "detailDate2": query.get("detailDate2", [""])[0],
+    }
+    return page, row_size, filters
+
+
+def _filter_key(filters: Optional[Dict]) -> str:
+    """분할 조건 → 비교용 문자열 (보관 기록과 요청을 같은 형식으로)"""
+    filters = filters or {}
+    codes = sorted(filters.get("writngTrgetDscds") or ["010", "060", "070"])
+    return "|".join([",".join(codes)] + [filters.get(name) or "" for name in FILTER_PARAMS[1:]])
+
+
+def _json_response(payload: Dict) -> httpx.Response:
+    """JSON 응답 생성"""
+    return httpx.Response(
+        200,
+        content=json.dumps(payload, ensure_ascii=False).encode("utf-8"),
+        headers={"Content-Type": "application/json; charset=UTF-8"}
+    )
+
+
+class ReplayTransport(httpx.AsyncBaseTransport):
+    """보관된 원본 응답을 페이지 번호로 재생하는 트랜스포트"""
+
+    def __init__(self, archive_path: str, latency: float = 0.0):
+        """
+        Args:
+            archive_path: SafeDreamAPI가 만든 {run_id}.jsonl.gz 파일
+            latency: 응답마다 추가할 지연 시간 (초, 네트워크 흉내)
+        """
+        self.latency = latency
+        self._pages: Dict[Tuple[str, int], bytes] = {}
+        self._total_count = 0
+
+        with gzip.open(archive_path, "rt", encoding="utf-8") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                record = json.loads(line)
+                body = record["body"].encode("utf-8")
+                self._pages[(_filter_key(record.get("query")), record["page"])] = body
+                try:
+                    self._total_count = max(self._total_count, json.loads(body).get("totalCount", 0))
+                except ValueError:
+                    pass
+
+        print(f"📼 재생 데이터 로드: {len(self._pages)}페이지 ({archive_path})")
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        page, _, filters = _page_params(request)
+        if self.latency:
+            await asyncio.sleep(self.latency)
+
+        body = self._pages.get((_filter_key(filters), page))
+        if body is None:
+            # 보관되지 않은 페이지는 빈 페이지로 응답
+            return _json_response({"totalCount": self._total_count, "list": []})
+
+        return httpx.Response(
+            200,
+            content=body,
+            headers={"Content-Type": "application/json; charset=UTF-8"}
+        )
+
+
+# 합성 데이터용 샘플 주소
+SAMPLE_ADDRESSES = [
+    "서울특별시 강남구 역삼동",
+    "서울특별시 송파구 잠실동",
+    "서울특별시 마포구 서교동",
+    "부산광역시 해운대구 우동",
+    "부산광역시 사하구 승학로233번길",
+    "대구광역시 수성구 범어동",
+    "인천광역시 남동구 구월동",
+    "광주광역시 북구 용봉동",
+    "대전광역시 유성구 봉명동",
+    "경기도 수원시 팔달구 인계동",
+    "경기도 안산시 상록구 ",
+    "강원특별자치도 춘천시 효자동",
+    "충청북도 청주시 상당구 ",
+    "전북특별자치도 군산시 궁포1로 ",
+    "경상남도 창원시 성산구 상남동",
+    "제주특별자치도 제주시 연동",
+]
+
+SAMPLE_DRESSINGS = ["", "기타", "운동복차림", "청바지, 흰색 티셔츠", "지적장애 2급", "검정 코트"]
+
+
+class SyntheticTransport(httpx.AsyncBaseTransport):
+    """N건의 합성 실종자 데이터를 결정적으로 생성하는 트랜스포트"""
+
+    def __init__(
+        self,
+        total_count: int,
+        page_size: int = 100,
+        seed: int = 0,
+        latency: float = 0.0
+    ):
+        """
+        Args:
+            total_count: 전체 데이터 건수
+            page_size: 페이지 오프셋 계산 기준 크기 (동기화 서비스의 기본 페이지 크기와 동일)
+            seed: 난수 시드 (같은 시드면 같은 데이터)
+            latency: 응답마다 추가할 지연 시간 (초, 네트워크 흉내)
+        """
+        self.total_count = total_count
+        self.page_size = page_size
+        self.seed = seed
+        self.latency = latency
+        self._base_date = datetime(2025, 1, 1)
+        self._filtered: Dict[str, List[int]] = {}
+
+    def make_item(self, index: int) -> Dict:
+        """index번째 합성 항목 (최신 등록 건이 앞쪽)"""
+        rng = random.Random(self.seed * 1_000_003 + index)
+        occurred = self._base_date - timedelta(days=index // 20)
+        return {
+            "msspsnIdntfccd": str(10_000_000 - index),
+            "occrde": occurred.strftime("%Y%m%d"),
+            "occrAdres": rng.choice(SAMPLE_ADDRESSES),
+            "alldressingDscd": rng.choice(SAMPLE_DRESSINGS),
+            "age": str(rng.randint(3, 90)),
+            "sexdstnDscd": rng.choice(["남자", "여자"]),
+            "writngTrgetDscd": rng.choice(["010", "060", "070"]),
+        }
+
+    def make_page(self, page: int, row_size: int) -> List[Dict]:
+        """페이지 항목 생성 (오프라인 재현용)"""
+        start = (page - 1) * self.page_size
+        end = min(start + row_size, self.total_count)
+        return [self.make_item(index) for index in range(start, end)]
+
+    def _matches(self, item: Dict, filters: Dict) -> bool:
+        """분할 조건 일치 여부 (대상 코드 / 지역 포함 / 발생일 구간)"""
+        codes = filters.get("writngTrgetDscds")
+        if codes and item["writngTrgetDscd"] not in codes:
+            return False
+        if filters.get("occrAdres") and filters["occrAdres"] not in item["occrAdres"]:
+            return False
+        occurred = item["occrde"]
+        if filters.get("detailDate1") and occurred < filters["detailDate1"].replace("-", ""):
+            return False
+        if filters.get("detailDate2") and occurred > filters["detailDate2"].replace("-", ""):
+            return False
+        return True
+
+    def _filtered_indexes(self, filters: Dict) -> List[int]:
+        """분할 조건에 맞는 항목 인덱스 (조건별로 한 번만 계산)"""
+        key = _filter_key(filters)
+        if key not in self._filtered:
+            self._filtered[key] = [
+                index for index in range(self.total_count)
+                if self._matches(self.make_item(index), filters)
+            ]
+        return self._filtered[key]
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        page, row_size, filters = _page_params(request)
+        if self.latency:
+            await asyncio.sleep(self.latency)
+
+        if _filter_key(filters) == _filter_key(None):
+            return _json_response({
+                "totalCount": self.total_count,
+                "list": self.make_page(page, row_size),
+            })
+
+        indexes = self._filtered_indexes(filters)
+        start = (page - 1) * self.page_size
+        return _json_response({
+            "totalCount": len(indexes),
+            "list": [self.make_item(index) for index in indexes[start:start + row_size]],
+        })
@@ -0,0 +1,122 @@
+# -*- coding: utf-8 -*-
+"""
+missing_persons 공간 인덱스 (지도 화면 영역 조회용)
+- SQLite: R*Tree 가상 테이블 missing_persons_rtree(id, 위도 범위, 경도 범위)
+  missing_persons 의 INSERT / 좌표 UPDATE / DELETE 트리거가 자동으로 갱신
+  → 동기화 upsert, 지명 사전 좌표, 지오코딩 큐/백필이 따로 신경 쓰지 않아도 항상 최신
+- 그 외 DB(PostgreSQL 등): (latitude, longitude) 복합 B-tree 인덱스로 범위 조회
+- bbox_filter(stmt, bind, ...) 로 어느 DB든 같은 방식으로 영역 필터 적용
+"""
+
+from sqlalchemy import Column, Float, Index, Integer, MetaData, Table, text
+from sqlalchemy.engine import Engine
+
+from app.models.missing_person import MissingPerson
+
+
+RTREE_TABLE = "missing_persons_rtree"
+
+# R*Tree 테이블 정의 (Base.metadata 와 분리 → create_all 대상 아님)
+rtree = Table(
+    RTREE_TABLE,
+    MetaData(),
+    Column("id", Integer, primary_key=True),
+    Column("min_lat", Float),
+    Column("max_lat", Float),
+    Column("min_lng", Float),
+    Column("max_lng", Float),
+)
+
+# SQLite 이외의 DB에서 쓰는 좌표 범위 인덱스
+lat_lng_index = Index("ix_missing_persons_lat_lng", MissingPerson.latitude, MissingPerson.longitude)
+
+_RTREE_TRIGGERS = [
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {RTREE_TABLE}_insert AFTER INSERT ON missing_persons
+    WHEN NEW.latitude IS NOT NULL AND NEW.longitude IS NOT NULL
+    BEGIN
+        INSERT OR REPLACE INTO {RTREE_TABLE} VALUES
+            (NEW.id, NEW.latitude, NEW.latitude, NEW.longitude, NEW.longitude);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {RTREE_TABLE}_update AFTER UPDATE OF latitude, longitude ON missing_persons
+    BEGIN
+        DELETE FROM {RTREE_TABLE} WHERE id = OLD.id;
+        INSERT INTO {RTREE_TABLE}
+            SELECT NEW.id, NEW.latitude, NEW.latitude, NEW.longitude, NEW.longitude
+            WHERE NEW.latitude IS NOT NULL AND NEW.longitude IS NOT NULL;
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {RTREE_TABLE}_delete AFTER DELETE ON missing_persons
+    BEGIN
+        DELETE FROM {RTREE_TABLE} WHERE id = OLD.id;
+    END
+    """,
+]
+
+
+def uses_rtree(engine) -> bool:
+    """R*Tree 사용 여부 (SQLite)"""
+    return engine.dialect.name == "sqlite"
+
+
+def ensure_spatial_index(engine: Engine):
+    """공간 인덱스 생성 (init_db에서 호출, 이미 있으면 그대로)"""
+    if not uses_rtree(engine):
+        lat_lng_index.create(bind=engine, checkfirst=True)
+        return
+
+    with engine.begin() as conn:
+        exists = conn.execute(
+            text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"),
+            {"name": RTREE_TABLE}
+        ).first()
+        if not exists:
+            conn.execute(text(
+                f"CREATE VIRTUAL TABLE {RTREE_TABLE} USING rtree(id, min_lat, max_lat, min_lng, max_lng)"
+            ))
+        for trigger in _RTREE_TRIGGERS:
+            conn.execute(text(trigger))
+        if not exists:
+            # 기존 행을 한 번에 채움 (이후로는 트리거가 유지)
+            count = conn.execute(text(f"""
+                INSERT INTO {RTREE_TABLE}
+                SELECT id, latitude, latitude, longitude, longitude FROM missing_persons
+                WHERE latitude IS NOT NULL AND longitude IS NOT NULL
+            """)).rowcount
+            print(f"🛠️  공간 인덱스 생성: {RTREE_TABLE} ({count}건)")
+
+
+def rebuild_spatial_index(engine: Engine) -> int:
+    """R*Tree 를 missing_persons 좌표로 다시 채움 (트리거 없이 직접 수정한 경우용)"""
+    if not uses_rtree(engine):
+        return 0
+    with engine.begin() as conn:
+        conn.execute(text(f"DELETE FROM {RTREE_TABLE}"))
+        return conn.execute(text(f"""
+            INSERT INTO {RTREE_TABLE}
+            SELECT id, latitude, latitude, longitude, longitude FROM missing_persons
+            WHERE latitude IS NOT NULL AND longitude IS NOT NULL
+        """)).rowcount
+
+
+def bbox_filter(stmt, bind, min_lat: float, min_lng: float, max_lat: float, max_lng: float):
+    """
+    select(MissingPerson) 문에 영역 필터 적용 (bind: 엔진/연결, 동기·비동기 모두)
+
+    SQLite는 R*Tree 와 조인해 인덱스 범위만 읽고, 정확한 경계는 원래 좌표로 다시 확인
+    (R*Tree 는 32비트 실수로 저장해 경계가 약간 넓음)
+    """
+    if uses_rtree(bind):
+        stmt = stmt.join(rtree, rtree.c.id == MissingPerson.id).where(
+            rtree.c.max_lat >= min_lat,
+            rtree.c.min_lat <= max_lat,
+            rtree.c.max_lng >= min_lng,
+            rtree.c.min_lng <= max_lng,
+        )
+    return stmt.where(
+        MissingPerson.latitude.between(min_lat, max_lat),
+        MissingPerson.longitude.between(min_lng, max_lng),
+    )
@@ -0,0 +1,101 @@
+# -*- coding: utf-8 -*-
+"""
+동기화 체크포인트 저장소
+- 저장까지 끝난 페이지 키를 DB에 기록 → 중단된 동기화는 남은 페이지부터 재개
+- 수신한 external_id도 체크포인트별로 보관 → 재개 후에도 실종 해제 감지 가능
+- API totalCount가 바뀌었거나 오래된 체크포인트는 재개하지 않음 (페이지 경계가 밀림)
+- 페이지 키: 분할하지 않으면 "3", 분할 수집이면 "target:010#3" (fetch_planner.page_key)
+"""
+
+from datetime import datetime, timedelta
+from typing import Optional, Set, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.models.sync_run import SyncCheckpoint, SyncSeenId
+
+
+# 이 시간보다 오래된 체크포인트는 재개하지 않음
+CHECKPOINT_MAX_AGE = timedelta(hours=6)
+
+
+def _parse_pages(value: Optional[str]) -> Set[str]:
+    """"1,2,5" → {"1", "2", "5"}"""
+    return {page for page in (value or "").split(",") if page}
+
+
+class SyncCheckpointStore:
+    """동기화 체크포인트 저장소 (동기화 세션과 같은 트랜잭션에서 사용)"""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def open(self, mode: str, total_count: int, row_size: int) -> Tuple[SyncCheckpoint, Set[str]]:
+        """
+        재개 가능한 체크포인트를 찾거나 새로 생성
+
+        Returns:
+            (체크포인트, 이미 완료된 페이지 키 집합)
+        """
+        now = datetime.now()
+        candidate = self.db.query(SyncCheckpoint)\
+            .filter(SyncCheckpoint.mode == mode, SyncCheckpoint.status == "open")\
+            .order_by(SyncCheckpoint.created_at.desc())\
+            .first()
+
+        if (
+            candidate is not None
+            and candidate.total_count == total_count
+            and candidate.row_size == row_size
+            and now - candidate.updated_at <= CHECKPOINT_MAX_AGE
+        ):
+            completed = _parse_pages(candidate.completed_pages)
+            candidate.updated_at = now
+            self.db.commit()
+            return candidate, completed
+
+        # 재개할 수 없는 이전 체크포인트는 정리
+        self._abandon_open(mode)
+
+        checkpoint = SyncCheckpoint(
+            mode=mode,
+            status="open",
+            total_count=total_count,
+            row_size=row_size,
+            completed_pages="",
+            created_at=now,
+            updated_at=now,
+        )
+        self.db.add(checkpoint)
+        self.db.commit()
+        return checkpoint, set()
+
+    def mark_page_done(self, checkpoint: SyncCheckpoint, key: str):
+        """페이지 완료 기록 (커밋은 호출 측에서 페이지 데이터와 함께)"""
+        pages = _parse_pages(checkpoint.completed_pages)
+        pages.add(key)
+        checkpoint.completed_pages = ",".join(sorted(pages))
+        checkpoint.updated_at = datetime.now()
+
+    def finish(self, checkpoint: SyncCheckpoint):
+        """크롤링 완료 → 체크포인트 종료 및 수신 ID 정리"""
+        checkpoint.status = "completed"
+        checkpoint.completed_at = datetime.now()
+        self._delete_seen_ids(checkpoint.id)
+        self.db.commit()
+
+    def _abandon_open(self, mode: str):
+        """열린 체크포인트를 폐기 처리"""
+        stale = self.db.query(SyncCheckpoint)\
+            .filter(SyncCheckpoint.mode == mode, SyncCheckpoint.status == "open")\
+            .all()
+        for checkpoint in stale:
+            checkpoint.status = "abandoned"
+            checkpoint.completed_at = datetime.now()
+            self._delete_seen_ids(checkpoint.id)
+
+    def _delete_seen_ids(self, checkpoint_id: int):
+        """체크포인트의 수신 ID 삭제"""
+        self.db.query(SyncSeenId)\
+            .filter(SyncSeenId.checkpoint_id == checkpoint_id)\
+            .delete(synchronize_session=False)
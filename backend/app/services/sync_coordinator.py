@@ -0,0 +1,249 @@
+# -*- coding: utf-8 -*-
+"""
+동기화 코디네이터 (single-flight)
+- 자동 동기화 / 수동 트리거 요청을 하나의 실행으로 병합
+- 요청은 즉시 작업 ID를 받고, 진행 상황은 작업 조회로 확인
+- 부분/증분 동기화 중에 들어온 전체 동기화 요청은 병합하지 않고 후속 작업 하나로 대기
+  (실종 해제 감지가 필요한 요청이 조용히 버려지지 않도록, 대기 중 요청은 그 후속 작업에 병합)
+"""
+
+import asyncio
+import uuid
+from collections import OrderedDict
+from datetime import datetime
+from typing import Dict, Optional
+
+from app.services import sync_history
+from app.services.sync_worker import SyncWorker, get_sync_worker
+
+
+# 보관할 최근 작업 수
+JOB_HISTORY_SIZE = 20
+
+
+class SyncCoordinator:
+    """동시에 하나의 동기화만 실행되도록 조정하는 코디네이터"""
+
+    def __init__(self, worker: SyncWorker, history_size: int = JOB_HISTORY_SIZE):
+        self.worker = worker
+        self.history_size = history_size
+        self._jobs: "OrderedDict[str, Dict]" = OrderedDict()
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self._current_id: Optional[str] = None
+        self._pending: Optional[Dict] = None  # 현재 작업이 끝나면 시작할 후속 전체 동기화
+
+    def trigger(
+        self,
+        api_key: str,
+        esntl_id: str = "10000855",
+        max_pages: int = 50,
+        source: str = "manual",
+        mode: str = "full"
+    ) -> Dict:
+        """
+        동기화 요청 (API 이벤트 루프에서 호출)
+
+        이미 실행 중인 동기화가 있으면 새로 시작하지 않고 그 작업을 반환합니다.
+        단, 부분/증분 동기화 중에 전체 동기화를 요청하면 후속 전체 동기화 작업(status="queued")을
+        하나 만들어 반환하고, 현재 작업이 끝나면 시작합니다.
+        mode="partial" 은 앞쪽 max_pages 페이지만 받고 실종 해제 감지를 생략합니다.
+        mode="incremental" 은 최근 발생 건(high-water mark 이후)만 받고 실종 해제 감지를 생략합니다.
+
+        Returns:
+            작업 정보 딕셔너리
+        """
+        current = self.current_job()
+        if current and mode == "full" and current["mode"] != "full":
+            return self._queue_follow_up(current, api_key, esntl_id, max_pages, source)
+        if current:
+            current["coalesced"] += 1
+            print(f"🔗 진행 중인 동기화에 병합: {current['job_id']} (요청: {source})")
+            return current
+
+        job = self._new_job(source, mode, max_pages)
+        self._start(job, api_key, esntl_id, max_pages)
+        print(f"🆕 동기화 작업 시작: {job['job_id']} (요청: {source})")
+        return job
+
+    def _new_job(self, source: str, mode: str, max_pages: int, status: str = "running") -> Dict:
+        """작업 정보 생성 후 기록에 추가"""
+        job_id = uuid.uuid4().hex[:12]
+        job = {
+            "job_id": job_id,
+            "source": source,
+            "mode": mode,
+            "status": status,
+            "phase": "queued",
+            "max_pages": max_pages,
+            "total_count": 0,
+            "pages_fetched": 0,
+            "total_fetched": 0,
+            "rows_written": 0,
+            "coalesced": 0,
+            "created_at": datetime.now(),
+            "finished_at": None,
+            "result": None,
+            "error": None,
+        }
+        self._jobs[job_id] = job
+        self._trim_history()
+        return job
+
+    def _start(self, job: Dict, api_key: str, esntl_id: str, max_pages: int):
+        """작업 실행 시작 (현재 작업으로 지정)"""
+        job["status"] = "running"
+        self._current_id = job["job_id"]
+        self._tasks[job["job_id"]] = asyncio.create_task(
+            self._run(job, api_key, esntl_id, max_pages)
+        )
+
+    def _queue_follow_up(self, current: Dict, api_key: str, esntl_id: str, max_pages: int, source: str) -> Dict:
+        """부분/증분 동기화 중 들어온 전체 동기화 요청 → 후속 작업 하나로 대기 (이미 있으면 병합)"""
+        if self._pending:
+            job = self._pending["job"]
+            job["coalesced"] += 1
+            print(f"🔗 대기 중인 전체 동기화에 병합: {job['job_id']} (요청: {source})")
+            return job
+
+        job = self._new_job(source, "full", max_pages, status="queued")
+        job["queued_after"] = current["job_id"]
+        self._pending = {"job": job, "api_key": api_key, "esntl_id": esntl_id, "max_pages": max_pages}
+        print(f"⏳ 전체 동기화 대기: {job['job_id']} ({current['mode']} 작업 {current['job_id']} 종료 후, 요청: {source})")
+        return job
+
+    def _start_pending(self, cancelled: bool):
+        """현재 작업 종료 후 대기 중인 전체 동기화 시작 (서버 종료로 취소된 경우 함께 취소)"""
+        pending, self._pending = self._pending, None
+        if not pending:
+            return
+        job = pending["job"]
+        if cancelled:
+            job["status"] = "cancelled"
+            job["finished_at"] = datetime.now()
+            return
+        self._start(job, pending["api_key"], pending["esntl_id"], pending["max_pages"])
+        print(f"🆕 대기 중이던 전체 동기화 시작: {job['job_id']}")
+
+    async def _run(self, job: Dict, api_key: str, esntl_id: str, max_pages: int):
+        """워커에서 동기화 실행 후 작업 상태 기록 (sync_runs 테이블에도 저장)"""
+        run_id = None
+        result = None
+        cancelled = False
+        try:
+            run_id = await asyncio.to_thread(sync_history.start_run, job)
+            result = await self.worker.run_sync(
+                api_key=api_key,
+                esntl_id=esntl_id,
+                max_pages=max_pages,
+                progress=job,
+                resolve=job["mode"] == "full",
+                incremental=job["mode"] == "incremental"
+            )
+            job["result"] = result
+            if not result.get("success"):
+                job["status"] = "failed"
+            elif job["mode"] == "full" and not result.get("crawl_complete"):
+                # 일부 페이지 실패 → 체크포인트에서 재개 필요 (실종 해제 감지 생략됨)
+                job["status"] = "incomplete"
+            else:
+                job["status"] = "succeeded"
+            return result
+
+        except asyncio.CancelledError:
+            job["status"] = "cancelled"
+            cancelled = True
+            raise
+
+        except Exception as e:
+            job["status"] = "failed"
+            job["error"] = str(e)
+            return {"success": False, "errors": [str(e)]}
+
+        finally:
+            job["finished_at"] = datetime.now()
+            if self._current_id == job["job_id"]:
+                self._current_id = None
+            self._tasks.pop(job["job_id"], None)
+            if self._current_id is None:
+                self._start_pending(cancelled)
+
+            if run_id is not None:
+                try:
+                    await asyncio.to_thread(sync_history.finish_run, run_id, job, result)
+                except Exception as e:
+                    print(f"⚠️  동기화 기록 저장 실패: {e}")
+
+    async def wait(self, job_id: str) -> Optional[Dict]:
+        """작업 완료까지 대기 후 결과 반환 (대기 측 취소가 작업을 취소하지 않음)"""
+        job = self._jobs.get(job_id)
+        while job and job["status"] == "queued":
+            # 후속 작업은 앞 작업이 끝날 때 시작됨
+            before = self._tasks.get(job["queued_after"])
+            if before is None:
+                break
+            await asyncio.wait({before})
+
+        task = self._tasks.get(job_id)
+        if task:
+            return await asyncio.shield(task)
+
+        job = self._jobs.get(job_id)
+        return job["result"] if job else None
+
+    async def cancel_current(self):
+        """실행 중인 동기화 취소 (서버 종료 시)"""
+        task = self._tasks.get(self._current_id) if self._current_id else None
+        if task:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+
+    def current_job(self) -> Optional[Dict]:
+        """실행 중인 작업 (없으면 None)"""
+        if self._current_id:
+            return self._jobs.get(self._current_id)
+        return None
+
+    def get_job(self, job_id: str) -> Optional[Dict]:
+        """작업 조회"""
+        return self._jobs.get(job_id)
+
+    def recent_jobs(self, limit: int = 10) -> list:
+        """최근 작업 목록 (최신순)"""
+        return list(reversed(self._jobs.values()))[:limit]
+
+    def _trim_history(self):
+        """오래된 완료 작업 정리"""
+        while len(self._jobs) > self.history_size:
+            oldest_id = next(iter(self._jobs))
+            if oldest_id == self._current_id:
+                break
+            self._jobs.pop(oldest_id)
+
+
+def job_summary(job: Dict) -> Dict:
+    """API 응답용 작업 요약 (전체 결과의 오류 목록은 개수만)"""
+    summary = {key: value for key, value in job.items() if key != "result"}
+    result = job.get("result")
+    if result:
+        summary["result"] = {
+            key: value for key, value in result.items() if key not in ("errors", "parse_errors")
+        }
+        summary["result"]["error_count"] = len(result.get("errors", []))
+        summary["result"]["parse_error_count"] = len(result.get("parse_errors", []))
+        summary["errors"] = result.get("errors", [])[:5]
+    return summary
+
+
+# 싱글톤 인스턴스
+_sync_coordinator = None
+
+
+def get_sync_coordinator() -> SyncCoordinator:
+    """동기화 코디네이터 인스턴스 반환"""
+    global _sync_coordinator
+    if _sync_coordinator is None:
+        _sync_coordinator = SyncCoordinator(get_sync_worker())
+    return _sync_coordinator
@@ -0,0 +1,218 @@
+# -*- coding: utf-8 -*-
+"""
+동기화 실행 기록 (sync_runs 테이블)
+- 실행별 시작/종료, 단계별 소요 시간, 페이지 수, 추가/업데이트/해제 건수, 에러 샘플 저장
+- /api/v1/sync/status 에서 최근 실행과 백분위 통계 제공
+"""
+
+import json
+import math
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from app.database.db import SessionLocal
+from app.models.sync_run import SyncRun
+
+
+# 에러 샘플 최대 저장 개수
+ERROR_SAMPLE_SIZE = 5
+
+# 결과 딕셔너리 → sync_runs 컬럼
+RESULT_COLUMNS = (
+    "pages_fetched", "total_fetched", "new_added", "updated",
+    "unchanged", "resolved", "skipped",
+)
+
+# 단계 이름 → sync_runs 컬럼
+PHASE_COLUMNS = {
+    "fetch": "fetch_seconds",
+    "parse": "parse_seconds",
+    "write": "write_seconds",
+    "resolve": "resolve_seconds",
+}
+
+
+def start_run(job: Dict) -> int:
+    """동기화 시작 기록 (status=running)"""
+    db = SessionLocal()
+    try:
+        run = SyncRun(
+            job_id=job["job_id"],
+            source=job["source"],
+            mode=job.get("mode", "full"),
+            status="running",
+            started_at=job["created_at"],
+        )
+        db.add(run)
+        db.commit()
+        return run.id
+    finally:
+        db.close()
+
+
+def finish_run(run_id: int, job: Dict, result: Optional[Dict]):
+    """동기화 종료 기록 (결과, 단계별 소요 시간, 에러 샘플)"""
+    db = SessionLocal()
+    try:
+        run = db.get(SyncRun, run_id)
+        if run is None:
+            return
+
+        run.status = job["status"]
+        run.finished_at = job["finished_at"] or datetime.now()
+        run.duration = (run.finished_at - run.started_at).total_seconds()
+        run.total_count = job.get("total_count")
+        if result:
+            run.head_signature = result.get("head_signature")
+
+        errors = []
+        if result:
+            for key in RESULT_COLUMNS:
+                setattr(run, key, result.get(key, 0))
+            for phase, column in PHASE_COLUMNS.items():
+                seconds = result.get("timings", {}).get(phase)
+                setattr(run, column, round(seconds, 4) if seconds is not None else None)
+            errors = result.get("errors", [])
+        if job.get("error"):
+            errors = errors + [job["error"]]
+
+        run.error_count = len(errors)
+        run.error_samples = json.dumps(errors[:ERROR_SAMPLE_SIZE], ensure_ascii=False) if errors else None
+        db.commit()
+    finally:
+        db.close()
+
+
+def mark_interrupted_runs() -> int:
+    """서버 종료로 끝나지 못한 실행(status=running)을 interrupted로 정리 (서버 시작 시 호출)"""
+    db = SessionLocal()
+    try:
+        interrupted = db.query(SyncRun)\
+            .filter(SyncRun.status == "running")\
+            .update({"status": "interrupted"}, synchronize_session=False)
+        db.commit()
+        return interrupted
+    finally:
+        db.close()
+
+
+def record_probe_skip(source: str, total_count: int, head_signature: Optional[str]):
+    """변경 감지 결과 변경 없음 → 전체 동기화 생략 기록 (status=skipped)"""
+    db = SessionLocal()
+    try:
+        now = datetime.now()
+        db.add(SyncRun(
+            source=source,
+            mode="probe",
+            status="skipped",
+            started_at=now,
+            finished_at=now,
+            total_count=total_count,
+            head_signature=head_signature,
+        ))
+        db.commit()
+    finally:
+        db.close()
+
+
+def last_upstream_state() -> Optional[Dict]:
+    """
+    마지막으로 확인한 API 상태 (서버 재시작 후 변경 감지 기준으로 사용)
+
+    Returns:
+        {"total_count": int, "head_signature": str, "last_full_sync": datetime | None} 또는 None
+    """
+    db = SessionLocal()
+    try:
+        run = db.query(SyncRun)\
+            .filter(
+                SyncRun.status.in_(["succeeded", "skipped"]),
+                SyncRun.mode != "incremental",  # 증분 실행의 totalCount는 기간 조건이 걸린 값
+                SyncRun.head_signature.isnot(None)
+            )\
+            .order_by(SyncRun.started_at.desc())\
+            .first()
+        if run is None:
+            return None
+
+        last_full = db.query(SyncRun)\
+            .filter(SyncRun.status == "succeeded", SyncRun.mode == "full")\
+            .order_by(SyncRun.started_at.desc())\
+            .first()
+
+        return {
+            "total_count": run.total_count,
+            "head_signature": run.head_signature,
+            "last_full_sync": last_full.finished_at if last_full else None,
+        }
+    finally:
+        db.close()
+
+
+def _run_to_dict(run: SyncRun) -> Dict:
+    """API 응답용 변환"""
+    return {
+        "id": run.id,
+        "job_id": run.job_id,
+        "source": run.source,
+        "mode": run.mode,
+        "status": run.status,
+        "started_at": run.started_at.isoformat() if run.started_at else None,
+        "finished_at": run.finished_at.isoformat() if run.finished_at else None,
+        "duration": run.duration,
+        "phases": {phase: getattr(run, column) for phase, column in PHASE_COLUMNS.items()},
+        "total_count": run.total_count,
+        **{key: getattr(run, key) for key in RESULT_COLUMNS},
+        "error_count": run.error_count,
+        "error_samples": json.loads(run.error_samples) if run.error_samples else [],
+    }
+
+
+def recent_runs(limit: int = 10) -> List[Dict]:
+    """최근 동기화 실행 목록 (최신순)"""
+    db = SessionLocal()
+    try:
+        runs = db.query(SyncRun)\
+            .order_by(SyncRun.started_at.desc())\
+            .limit(limit)\
+            .all()
+        return [_run_to_dict(run) for run in runs]
+    finally:
+        db.close()
+
+
+def _percentile(values: List[float], pct: float) -> Optional[float]:
+    """최근접 순위 방식 백분위"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return round(ordered[rank - 1], 3)
+
+
+def run_percentiles(limit: int = 50) -> Dict:
+    """최근 성공한 실행의 소요 시간/처리량 백분위 (p50/p90/p99)"""
+    db = SessionLocal()
+    try:
+        runs = db.query(SyncRun)\
+            .filter(SyncRun.status == "succeeded")\
+            .order_by(SyncRun.started_at.desc())\
+            .limit(limit)\
+            .all()
+    finally:
+        db.close()
+
+    series = {"duration": [r.duration for r in runs if r.duration is not None]}
+    for phase, column in PHASE_COLUMNS.items():
+        series[phase] = [getattr(r, column) for r in runs if getattr(r, column) is not None]
+    series["rows_per_second"] = [
+        r.total_fetched / r.duration for r in runs if r.duration and r.total_fetched
+    ]
+
+    return {
+        "sample_size": len(runs),
+        **{
+            name: {f"p{pct}": _percentile(values, pct) for pct in (50, 90, 99)}
+            for name, values in series.items()
+        }
+    }
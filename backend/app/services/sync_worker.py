@@ -0,0 +1,117 @@
+# -*- coding: utf-8 -*-
+"""
+동기화 전용 워커
+- API 서버(uvicorn) 이벤트 루프와 분리된 전용 스레드 + 이벤트 루프에서 동기화 실행
+- 동기화 중 발생하는 블로킹 DB 호출이 지도 앱의 조회 요청을 막지 않음
+- 공유 HTTP 클라이언트(keep-alive)는 워커 루프에 묶여 동기화 실행 간 재사용됨
+- 동기화 후속 지오코딩 큐(GeocodeQueue)도 이 루프에서 계속 실행됨
+"""
+
+import asyncio
+import threading
+from typing import Dict, Optional
+
+from app.services.safe_dream_api import SafeDreamAPI, close_http_client
+
+
+class SyncWorker:
+    """전용 스레드에서 동기화 코루틴을 실행하는 워커"""
+
+    def __init__(self):
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def start(self):
+        """워커 스레드 시작 (이미 실행 중이면 무시)"""
+        with self._lock:
+            if self._thread and self._thread.is_alive():
+                return
+
+            self._loop = asyncio.new_event_loop()
+            self._thread = threading.Thread(
+                target=self._run_loop,
+                name="safemap-sync-worker",
+                daemon=True
+            )
+            self._thread.start()
+
+    def _run_loop(self):
+        """워커 스레드 본체"""
+        asyncio.set_event_loop(self._loop)
+        self._loop.run_forever()
+        self._loop.close()
+
+    async def run(self, coro):
+        """
+        코루틴을 워커 루프에서 실행하고 결과를 기다림
+
+        API 루프는 스케줄링과 결과 수신만 담당합니다.
+        호출 측이 취소되면 워커 쪽 작업도 취소됩니다.
+        """
+        self.start()
+        future = asyncio.run_coroutine_threadsafe(coro, self._loop)
+        return await asyncio.wrap_future(future)
+
+    async def run_sync(
+        self,
+        api_key: str,
+        esntl_id: str,
+        max_pages: int = 50,
+        progress: Optional[Dict] = None,
+        resolve: bool = True,
+        incremental: bool = False
+    ) -> Dict:
+        """워커에서 동기화 실행 (DB 세션도 워커에서 생성)"""
+        from app.services.data_sync_service import DataSyncService
+
+        service = DataSyncService(api_key=api_key, esntl_id=esntl_id)
+        return await self.run(service.sync_all_data(
+            max_pages=max_pages,
+            progress=progress,
+            resolve=resolve,
+            incremental=incremental
+        ))
+
+    async def probe(self, api_key: str, esntl_id: str) -> Dict:
+        """워커에서 변경 감지용 경량 조회 실행 (공유 HTTP 클라이언트 사용)"""
+        return await self.run(SafeDreamAPI(api_key=api_key, esntl_id=esntl_id).probe())
+
+    def stop(self, timeout: float = 10.0):
+        """워커 종료 (지오코딩 큐와 공유 HTTP 클라이언트도 워커 루프에서 닫음)"""
+        from app.services.geocode_queue import get_geocode_queue
+
+        with self._lock:
+            if not self._thread or not self._loop:
+                return
+
+            if self._loop.is_running():
+                try:
+                    asyncio.run_coroutine_threadsafe(
+                        get_geocode_queue().aclose(), self._loop
+                    ).result(timeout=timeout)
+                except Exception as e:
+                    print(f"⚠️  지오코딩 큐 종료 실패: {e}")
+                try:
+                    asyncio.run_coroutine_threadsafe(
+                        close_http_client(), self._loop
+                    ).result(timeout=timeout)
+                except Exception as e:
+                    print(f"⚠️  HTTP 클라이언트 종료 실패: {e}")
+                self._loop.call_soon_threadsafe(self._loop.stop)
+
+            self._thread.join(timeout=timeout)
+            self._thread = None
+            self._loop = None
+
+
+# 싱글톤 인스턴스
+_sync_worker = None
+
+
+def get_sync_worker() -> SyncWorker:
+    """동기화 워커 인스턴스 반환"""
+    global _sync_worker
+    if _sync_worker is None:
+        _sync_worker = SyncWorker()
+    return _sync_worker
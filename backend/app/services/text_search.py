@@ -0,0 +1,133 @@
+# -*- coding: utf-8 -*-
+"""
+missing_persons 주소/상세정보 전문 검색
+- SQLite: FTS5 외부 콘텐츠 테이블 missing_persons_fts(location_address, location_detail)
+  본문은 missing_persons 에만 저장하고, INSERT / 주소·상세정보 UPDATE / DELETE 트리거가 색인만 갱신
+  → 동기화 upsert 등 쓰는 쪽은 따로 신경 쓰지 않아도 항상 최신
+- 토큰(공백/문장부호 단위) 접두 검색: "강남" → 강남구, "안경" → 안경을 (한국어 조사가 뒤에 붙는 형태에 맞춤)
+  여러 단어는 모두 포함(AND)
+- 그 외 DB(PostgreSQL 등): 단어마다 ILIKE '%단어%' 로 대체
+- search_filter(stmt, bind, q) 로 어느 DB든 같은 방식으로 검색 조건 적용
+"""
+
+from typing import List
+
+from sqlalchemy import Column, Integer, MetaData, String, Table, and_, or_, select, text
+from sqlalchemy.engine import Engine
+
+from app.models.missing_person import MissingPerson
+
+
+FTS_TABLE = "missing_persons_fts"
+
+# FTS5 테이블 정의 (Base.metadata 와 분리 → create_all 대상 아님)
+# 테이블 이름과 같은 숨은 컬럼이 MATCH 대상
+fts = Table(
+    FTS_TABLE,
+    MetaData(),
+    Column("rowid", Integer, primary_key=True),
+    Column("location_address", String),
+    Column("location_detail", String),
+    Column(FTS_TABLE, String),
+)
+
+_FTS_TRIGGERS = [
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_insert AFTER INSERT ON missing_persons
+    BEGIN
+        INSERT INTO {FTS_TABLE} (rowid, location_address, location_detail)
+            VALUES (NEW.id, NEW.location_address, NEW.location_detail);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_update AFTER UPDATE OF location_address, location_detail ON missing_persons
+    WHEN OLD.location_address IS NOT NEW.location_address OR OLD.location_detail IS NOT NEW.location_detail
+    BEGIN
+        INSERT INTO {FTS_TABLE} ({FTS_TABLE}, rowid, location_address, location_detail)
+            VALUES ('delete', OLD.id, OLD.location_address, OLD.location_detail);
+        INSERT INTO {FTS_TABLE} (rowid, location_address, location_detail)
+            VALUES (NEW.id, NEW.location_address, NEW.location_detail);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_delete AFTER DELETE ON missing_persons
+    BEGIN
+        INSERT INTO {FTS_TABLE} ({FTS_TABLE}, rowid, location_address, location_detail)
+            VALUES ('delete', OLD.id, OLD.location_address, OLD.location_detail);
+    END
+    """,
+]
+
+
+def uses_fts(engine) -> bool:
+    """FTS5 사용 여부 (SQLite)"""
+    return engine.dialect.name == "sqlite"
+
+
+def ensure_text_search(engine: Engine):
+    """전문 검색 인덱스 생성 (init_db에서 호출, 이미 있으면 그대로)"""
+    if not uses_fts(engine):
+        return
+
+    with engine.begin() as conn:
+        exists = conn.execute(
+            text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"),
+            {"name": FTS_TABLE}
+        ).first()
+        if not exists:
+            conn.execute(text(f"""
+                CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5(
+                    location_address, location_detail,
+                    content='missing_persons', content_rowid='id',
+                    tokenize='unicode61', prefix='2 3'
+                )
+            """))
+        for trigger in _FTS_TRIGGERS:
+            conn.execute(text(trigger))
+        if not exists:
+            # 기존 행을 한 번에 색인 (이후로는 트리거가 유지)
+            conn.execute(text(f"INSERT INTO {FTS_TABLE} ({FTS_TABLE}) VALUES ('rebuild')"))
+            count = conn.execute(text("SELECT count(*) FROM missing_persons")).scalar()
+            print(f"🛠️  전문 검색 인덱스 생성: {FTS_TABLE} ({count}건)")
+
+
+def rebuild_text_search(engine: Engine):
+    """FTS5 색인을 missing_persons 본문으로 다시 만듦 (트리거 없이 직접 수정한 경우용)"""
+    if not uses_fts(engine):
+        return
+    with engine.begin() as conn:
+        conn.execute(text(f"INSERT INTO {FTS_TABLE} ({FTS_TABLE}) VALUES ('rebuild')"))
+
+
+def search_terms(q: str) -> List[str]:
+    """검색어 → 단어 목록 (FTS5 문법 문자인 큰따옴표는 제거)"""
+    return [term for term in (q or "").replace('"', " ").split() if term]
+
+
+def match_expression(terms: List[str]) -> str:
+    """단어 목록 → FTS5 MATCH 식 (각 단어 접두 검색, 모두 포함)"""
+    return " ".join(f'"{term}"*' for term in terms)
+
+
+def search_filter(stmt, bind, q: str):
+    """
+    select(MissingPerson) 문에 주소/상세정보 검색 조건 적용 (검색어가 비어 있으면 그대로)
+    bind: 엔진/연결 (동기·비동기 모두, DB 종류 확인용)
+
+    SQLite는 FTS5 색인에서 일치하는 rowid만 골라 id로 조회합니다.
+    """
+    terms = search_terms(q)
+    if not terms:
+        return stmt
+
+    if uses_fts(bind):
+        matched = select(fts.c.rowid).where(fts.c[FTS_TABLE].match(match_expression(terms)))
+        return stmt.where(MissingPerson.id.in_(matched))
+
+    return stmt.where(and_(*[
+        or_(
+            MissingPerson.location_address.ilike(f"%{term}%"),
+            MissingPerson.location_detail.ilike(f"%{term}%")
+        )
+        for term in terms
+    ]))
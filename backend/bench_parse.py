@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+안전Dream 응답 디코딩/파싱 마이크로 벤치마크 (네트워크/DB 불필요)
+
+사용법:
+    python bench_parse.py                    # 합성 데이터 10만 건
+    python bench_parse.py --records 500000 --repeat 5
+
+비교 대상:
+    - 이전: response.json() 표준 json + strptime/예외 출력 방식의 parse_missing_person
+    - 현재: decode_json (orjson 사용 가능 시) + safe_dream_decoder.parse_items
+"""
+
+import argparse
+import json
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="안전Dream 파싱 마이크로 벤치마크")
+    parser.add_argument("--records", type=int, default=100000, help="합성 데이터 건수 (기본: 100000)")
+    parser.add_argument("--page-size", type=int, default=100, help="페이지 크기 (기본: 100)")
+    parser.add_argument("--repeat", type=int, default=3, help="반복 횟수 (가장 빠른 값 사용, 기본: 3)")
+    return parser.parse_args()
+
+
+# ===== 이전 구현 (비교 기준) =====
+
+def legacy_parse_date(date_str: str) -> Optional[datetime]:
+    if not date_str:
+        return None
+    try:
+        if len(str(date_str)) == 8:
+            return datetime.strptime(str(date_str), "%Y%m%d")
+        return datetime.fromisoformat(str(date_str))
+    except Exception as e:
+        print(f"⚠️ 날짜 파싱 실패: {date_str}, {e}")
+        return None
+
+
+def legacy_parse_age(age_str) -> Optional[int]:
+    try:
+        return int(age_str) if age_str else None
+    except:
+        return None
+
+
+def legacy_parse_gender(gender_str: str) -> Optional[str]:
+    if not gender_str:
+        return None
+    if "남" in str(gender_str):
+        return "M"
+    elif "여" in str(gender_str):
+        return "F"
+    return None
+
+
+def legacy_parse_missing_person(item: Dict) -> Optional[Dict]:
+    try:
+        return {
+            "external_id": str(item.get("msspsnIdntfccd", "")),
+            "missing_date": legacy_parse_date(item.get("occrde")),
+            "location_address": item.get("occrAdres", ""),
+            "location_detail": item.get("alldressingDscd", ""),
+            "age": legacy_parse_age(item.get("age")),
+            "gender": legacy_parse_gender(item.get("sexdstnDscd")),
+            "latitude": None,
+            "longitude": None,
+        }
+    except Exception as e:
+        print(f"⚠️ 데이터 파싱 실패: {e}")
+        return None
+
+
+# ===== 측정 =====
+
+def best_of(repeat: int, func) -> float:
+    """repeat번 실행 중 가장 짧은 시간 (초)"""
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main():
+    args = parse_args()
+
+    from app.services.safe_dream_decoder import DERIVED_COLUMNS, ORJSON_AVAILABLE, decode_json, parse_items
+    from app.services.safe_dream_replay import SyntheticTransport
+
+    transport = SyntheticTransport(args.records, page_size=args.page_size)
+    pages: List[bytes] = []
+    for page in range(1, -(-args.records // args.page_size) + 1):
+        payload = {"totalCount": args.records, "list": transport.make_page(page, args.page_size)}
+        pages.append(json.dumps(payload, ensure_ascii=False).encode("utf-8"))
+
+    def legacy():
+        for raw in pages:
+            for item in json.loads(raw)["list"]:
+                legacy_parse_missing_person(item)
+
+    def current():
+        errors: List[str] = []
+        for raw in pages:
+            parse_items(decode_json(raw)["list"], errors)
+
+    # 결과가 같은지 먼저 확인 (content_hash가 바뀌지 않아야 함, 계산 컬럼은 지문에서 제외되므로 비교하지 않음)
+    sample = json.loads(pages[0])["list"]
+    current_rows = [
+        {key: value for key, value in row.items() if key not in DERIVED_COLUMNS}
+        for row in parse_items(sample)
+    ]
+    assert [legacy_parse_missing_person(item) for item in sample] == current_rows, "파싱 결과 불일치"
+
+    print("\n" + "="*60)
+    print(f"⏱️  파싱 벤치마크 - 합성 데이터 {args.records:,}건 ({len(pages):,}페이지)")
+    print(f"   orjson: {'사용' if ORJSON_AVAILABLE else '없음 (표준 json)'}, 반복 {args.repeat}회 중 최솟값")
+    print("="*60)
+
+    results = {}
+    for label, func in (("이전 (json + strptime)", legacy), ("현재 (decode_json + 빠른 경로)", current)):
+        elapsed = best_of(args.repeat, func)
+        results[label] = elapsed
+        print(f"   • {label}: {elapsed:.3f}초 ({args.records / elapsed:,.0f}건/초)")
+
+    before, after = results.values()
+    print(f"\n   🚀 {before / after:.1f}배 빠름")
+    print("="*60 + "\n")
+
+
+if __name__ == "__main__":
+    main()
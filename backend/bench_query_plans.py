@@ -0,0 +1,277 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+실종자 목록 조회 쿼리 계획/성능 벤치마크 (네트워크 불필요)
+
+사용법:
+    python bench_query_plans.py                        # 합성 데이터 100만 건
+    python bench_query_plans.py --rows 200000 --runs 5
+    python bench_query_plans.py --without-indexes      # 복합 인덱스 없이 비교
+    python bench_query_plans.py --check                # 테이블 전체 스캔/정렬용 임시 B-tree 가 있으면 실패 (CI용)
+                                                       # (검색어 조합은 전문 검색 색인에서 찾은 일부 행만 정렬하므로 정렬 허용)
+    python bench_query_plans.py --db /tmp/plans.db     # 만든 DB 재사용 (행 수가 같으면 다시 만들지 않음)
+
+GET /missing-persons 가 만들 수 있는 필터 조합(상태 × 기간 × 성별 × 나이 × 장애 × 검색어)마다
+페이지 쿼리(발생일 최신순 100건)와 건수 쿼리의 EXPLAIN QUERY PLAN 과 실행 시간을 출력합니다.
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from itertools import product
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+# 목록 조회용 복합 인덱스 (MissingPerson.__table_args__)
+COMPOSITE_INDEXES = ("ix_missing_persons_status_date", "ix_missing_persons_date")
+
+# 필터 조합 (GET /missing-persons 쿼리 파라미터 기준)
+STATUS_OPTIONS = [None, "missing", "resolved"]
+PERIOD_OPTIONS = [None, "days=30", "1year"]
+GENDER_OPTIONS = [None, "F"]
+AGE_OPTIONS = [None, (10, 19)]
+DISABILITY_OPTIONS = [None, True]
+SEARCH_OPTIONS = [None, "강남"]
+
+# 쿼리 계획에서 문제로 보는 항목
+FULL_SCAN = "SCAN missing_persons"
+TEMP_SORT = "USE TEMP B-TREE FOR ORDER BY"
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="GET /missing-persons 필터 조합별 쿼리 계획 벤치마크")
+    parser.add_argument("--rows", type=int, default=1000000, help="합성 데이터 건수 (기본: 1000000)")
+    parser.add_argument("--runs", type=int, default=3, help="쿼리당 반복 횟수 (중앙값 사용, 기본: 3)")
+    parser.add_argument("--limit", type=int, default=100, help="페이지 크기 (기본: 100)")
+    parser.add_argument("--db", type=str, help="사용할 SQLite 파일 (기본: 임시 파일)")
+    parser.add_argument("--without-indexes", action="store_true", help="복합 인덱스를 지우고 측정")
+    parser.add_argument("--check", action="store_true", help="전체 스캔/임시 정렬이 있으면 종료 코드 1")
+    parser.add_argument("--seed", type=int, default=42, help="난수 시드")
+    return parser.parse_args()
+
+
+def synthetic_rows(count: int, seed: int):
+    """실제 분포와 비슷한 합성 실종자 행 (발생일 10년, 해제 85%, 아동/치매 노인 비중)"""
+    from app.services.gazetteer import get_gazetteer
+    from app.services.safe_dream_decoder import detect_disability
+
+    rng = random.Random(seed)
+    regions = []
+    stack = [get_gazetteer().full.root]
+    while stack:
+        node = stack.pop()
+        stack.extend(node.children.values())
+        if isinstance(node.value, dict):
+            regions.append(node.value)
+
+    now = datetime.now()
+    details = ["키 150cm, 파란색 상의", "지적장애 3급, 흰색 운동화", "검정 바지, 안경 착용", "자폐성장애, 빨간 가방"]
+    for i in range(count):
+        region = rng.choice(regions)
+        missing_date = now - timedelta(seconds=rng.randrange(10 * 365 * 86400))
+        status = "missing" if rng.random() < 0.15 else "resolved"
+        group = rng.random()
+        if group < 0.35:
+            age = rng.randint(3, 17)
+        elif group < 0.65:
+            age = rng.randint(65, 95)
+        else:
+            age = rng.randint(18, 64)
+        detail = rng.choice(details)
+        yield {
+            "external_id": f"BENCH{i:08d}",
+            "missing_date": missing_date,
+            "location_address": f"{region['name']} {rng.randint(1, 300)}",
+            "location_detail": detail,
+            "age": age,
+            "gender": "M" if rng.random() < 0.6 else "F",
+            "has_disability": detect_disability(detail),
+            "latitude": region["latitude"] + rng.uniform(-0.02, 0.02),
+            "longitude": region["longitude"] + rng.uniform(-0.02, 0.02),
+            "geocode_precision": region["precision"],
+            "status": status,
+            "resolved_at": missing_date + timedelta(days=rng.randint(1, 30)) if status == "resolved" else None,
+            "content_hash": None,
+            "created_at": now,
+            "updated_at": now,
+        }
+
+
+def populate(engine, rows: int, seed: int):
+    """missing_persons 를 합성 데이터로 채움 (이미 같은 건수면 그대로)"""
+    from sqlalchemy import func, insert, select, text
+    from app.models.missing_person import MissingPerson
+
+    with engine.connect() as conn:
+        existing = conn.execute(select(func.count()).select_from(MissingPerson.__table__)).scalar()
+    if existing == rows:
+        print(f"♻️  기존 데이터 사용: {existing:,}건")
+        return
+
+    started = time.perf_counter()
+    table = MissingPerson.__table__
+    with engine.begin() as conn:
+        conn.execute(table.delete())
+        batch = []
+        for row in synthetic_rows(rows, seed):
+            batch.append(row)
+            if len(batch) >= 50000:
+                conn.execute(insert(table), batch)
+                batch = []
+        if batch:
+            conn.execute(insert(table), batch)
+    with engine.begin() as conn:
+        conn.execute(text("ANALYZE"))
+    print(f"🧪 합성 데이터 {rows:,}건 생성: {time.perf_counter() - started:.1f}초")
+
+
+def combinations():
+    """필터 조합 목록 [(라벨, build_missing_persons_query 인자)]"""
+    now = datetime.now()
+    for status, period, gender, age, disability, search in product(
+        STATUS_OPTIONS, PERIOD_OPTIONS, GENDER_OPTIONS, AGE_OPTIONS, DISABILITY_OPTIONS, SEARCH_OPTIONS
+    ):
+        kwargs = {"status": status, "gender": gender, "has_disability": disability, "search": search}
+        labels = [f"status={status or 'all'}"]
+        if period == "days=30":
+            kwargs["since"] = now - timedelta(days=30)
+            labels.append("days=30")
+        elif period == "1year":
+            kwargs["since"] = datetime(now.year - 1, 1, 1)
+            kwargs["until"] = datetime(now.year - 1, 12, 31)
+            labels.append("start/end=last-year")
+        if gender:
+            labels.append(f"gender={gender}")
+        if age:
+            kwargs["age_min"], kwargs["age_max"] = age
+            labels.append(f"age={age[0]}-{age[1]}")
+        if disability:
+            labels.append("has_disability")
+        if search:
+            labels.append(f"q={search}")
+        yield " ".join(labels), kwargs
+
+
+def explain(session, stmt) -> list:
+    """EXPLAIN QUERY PLAN 결과 (detail 열 목록)"""
+    compiled = stmt.compile(dialect=session.get_bind().dialect)
+    params = tuple(
+        str(value) if isinstance(value, datetime) else value
+        for value in (compiled.params[name] for name in compiled.positiontup)
+    )
+    rows = session.connection().exec_driver_sql(f"EXPLAIN QUERY PLAN {compiled}", params).all()
+    return [row[-1] for row in rows]
+
+
+def timed(fn, runs: int) -> float:
+    """중앙값 실행 시간 (ms)"""
+    samples = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples)
+
+
+def problems(plan: list, expect_covering: bool, allow_sort: bool = False) -> list:
+    """쿼리 계획의 문제 항목 (테이블 전체 스캔, 정렬용 임시 B-tree, 커버링이 아닌 건수 계산)"""
+    found = []
+    for detail in plan:
+        if detail.startswith(FULL_SCAN) and "INDEX" not in detail:
+            found.append("전체 스캔")
+        if TEMP_SORT in detail and not allow_sort:
+            found.append("임시 정렬")
+    if expect_covering and not any("COVERING INDEX" in detail for detail in plan):
+        found.append("테이블 조회")
+    return found
+
+
+def run_benchmark(args, db_path: str) -> int:
+    # DB 설정은 모듈 로드 시점에 결정되므로 환경변수 설정 후 import
+    os.environ["DATABASE_URL"] = f"sqlite:///{db_path}"
+
+    from sqlalchemy import select, text
+    from app.database.db import SessionLocal, engine, init_db
+    from app.models.missing_person import MissingPerson
+    from app.services.missing_person_query import build_missing_persons_query, count_query, page_query
+
+    init_db()
+    populate(engine, args.rows, args.seed)
+
+    with engine.begin() as conn:
+        if args.without_indexes:
+            for name in COMPOSITE_INDEXES:
+                conn.execute(text(f"DROP INDEX IF EXISTS {name}"))
+        else:
+            for index in MissingPerson.__table__.indexes:
+                index.create(bind=conn, checkfirst=True)
+        conn.execute(text("ANALYZE"))
+
+    print("\n" + "="*100)
+    print(f"⏱️  목록 조회 쿼리 계획 벤치마크 - {args.rows:,}건, 복합 인덱스 {'없음' if args.without_indexes else '사용'}, "
+          f"페이지 {args.limit}건, {args.runs}회 중앙값, DB: {db_path}")
+    print("="*100)
+    print(f"{'필터':<58} {'페이지(ms)':>10} {'건수(ms)':>10} {'건수':>9}  계획")
+
+    failures = 0
+    page_times, count_times = [], []
+    db = SessionLocal()
+    try:
+        for label, kwargs in combinations():
+            query = build_missing_persons_query(select(MissingPerson), engine, **kwargs)
+            page = page_query(query, 0, args.limit)
+            count = count_query(query)
+
+            page_ms = timed(lambda: db.scalars(page).all(), args.runs)
+            count_ms = timed(lambda: db.scalar(count), args.runs)
+            total = db.scalar(count)
+            page_times.append(page_ms)
+            count_times.append(count_ms)
+
+            page_plan = explain(db, page)
+            count_plan = explain(db, count)
+            # 검색어 조합은 전문 검색 색인이 고른 행을 id로 조회 → 일치 건만 정렬
+            searching = bool(kwargs["search"])
+            issues = problems(page_plan, False, searching) + problems(count_plan, not searching, searching)
+            if issues:
+                failures += 1
+
+            mark = "⚠️ " if issues else "  "
+            print(f"{label:<60} {page_ms:>10.2f} {count_ms:>10.2f} {total:>9,}  {mark}{' / '.join(page_plan)}")
+            if issues:
+                print(f"{'':<94}{', '.join(dict.fromkeys(issues))} | 건수: {' / '.join(count_plan)}")
+    finally:
+        db.close()
+
+    print("="*100)
+    print(f"📊 페이지 중앙값 {statistics.median(page_times):.2f}ms (최대 {max(page_times):.2f}ms), "
+          f"건수 중앙값 {statistics.median(count_times):.2f}ms (최대 {max(count_times):.2f}ms)")
+    if failures:
+        print(f"⚠️  인덱스로 처리되지 않는 필터 조합 {failures}개")
+    else:
+        print("✅ 모든 필터 조합이 인덱스로 처리됨")
+    print()
+    return failures
+
+
+def main():
+    args = parse_args()
+
+    if args.db:
+        failures = run_benchmark(args, args.db)
+    else:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            failures = run_benchmark(args, os.path.join(tmp_dir, "bench.db"))
+
+    if args.check and failures:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+동기화 성능 벤치마크 (네트워크 불필요)
+
+사용법:
+    python bench_sync.py --records 10000                 # 합성 데이터 1만 건
+    python bench_sync.py --records 1000000 --latency 0.2 # 100만 건, 페이지당 200ms 지연
+    python bench_sync.py --replay archive/20250101-120000.jsonl.gz  # 보관된 원본 응답 재생
+
+임시 SQLite DB에서 첫 동기화(전체 추가)와 두 번째 동기화(변경 없음)를 측정합니다.
+"""
+
+import argparse
+import asyncio
+import contextlib
+import io
+import math
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="DataSyncService 오프라인 벤치마크")
+    parser.add_argument("--records", type=int, default=10000, help="합성 데이터 건수 (기본: 10000)")
+    parser.add_argument("--replay", type=str, help="재생할 원본 응답 보관 파일 (.jsonl.gz)")
+    parser.add_argument("--latency", type=float, default=0.0, help="페이지 응답 지연 (초)")
+    parser.add_argument("--concurrency", type=int, default=5, help="동시 페이지 요청 수")
+    parser.add_argument("--partition-by", choices=["target", "region", "date"], help="분할 수집 방식 (기본: 분할 안 함)")
+    parser.add_argument("--runs", type=int, default=2, help="동기화 반복 횟수 (기본: 2)")
+    parser.add_argument("--db", type=str, help="사용할 SQLite 파일 (기본: 임시 파일)")
+    parser.add_argument("--verbose", action="store_true", help="동기화 로그 출력")
+    return parser.parse_args()
+
+
+async def run_benchmark(args, db_path: str):
+    # DB 설정은 모듈 로드 시점에 결정되므로 환경변수 설정 후 import
+    os.environ["DATABASE_URL"] = f"sqlite:///{db_path}"
+
+    from app.database.db import init_db
+    from app.services.data_sync_service import DataSyncService
+    from app.services.safe_dream_api import SafeDreamAPI
+    from app.services.safe_dream_replay import ReplayTransport, SyntheticTransport
+
+    init_db()
+
+    if args.replay:
+        transport = ReplayTransport(args.replay, latency=args.latency)
+        max_pages = 100000
+        label = f"재생: {args.replay}"
+    else:
+        transport = SyntheticTransport(args.records, latency=args.latency)
+        max_pages = max(1, math.ceil(args.records / 100))  # 분할 수집이면 파티션당 상한
+        label = f"합성 데이터 {args.records:,}건"
+
+    api_client = SafeDreamAPI(api_key="offline", archive_dir=None, transport=transport)
+    service = DataSyncService(
+        api_key="offline",
+        concurrency=args.concurrency,
+        api_client=api_client,
+        geocode=False  # 저장 단계만 측정 (지오코딩 API 호출 없음)
+    )
+
+    print("\n" + "="*60)
+    print(f"⏱️  동기화 벤치마크 - {label}")
+    print(f"   동시 요청: {args.concurrency}, 페이지 지연: {args.latency}초, 분할: {args.partition_by or '없음'}, DB: {db_path}")
+    print("="*60)
+
+    try:
+        for run in range(1, args.runs + 1):
+            log = io.StringIO()
+            started = time.perf_counter()
+            with contextlib.redirect_stdout(sys.stdout if args.verbose else log):
+                result = await service.sync_all_data(
+                    max_pages=max_pages,
+                    partition_by=args.partition_by
+                )
+            elapsed = time.perf_counter() - started
+
+            timings = result.get("timings", {})
+            rate = result["total_fetched"] / elapsed if elapsed > 0 else 0
+            print(f"""
+🔁 {run}회차 ({'성공' if result['success'] else '실패'})
+   • 수신: {result['total_fetched']:,}건 / {result['pages_fetched']:,}페이지 (중복 제거 {result['duplicates']:,}건, 전체 수집 {'완료' if result['crawl_complete'] else '미완료'})
+   • 추가 {result['new_added']:,} / 업데이트 {result['updated']:,} / 변경 없음 {result['unchanged']:,} / 해제 {result['resolved']:,}
+   • 소요 시간: {elapsed:.2f}초 ({rate:,.0f}건/초)
+   • 단계별: 수신 {timings.get('fetch', 0):.2f}초 / 파싱 {timings.get('parse', 0):.2f}초 / 저장 {timings.get('write', 0):.2f}초 / 해제 감지 {timings.get('resolve', 0):.2f}초""")
+
+            if result["errors"]:
+                print(f"   ⚠️  에러 {len(result['errors'])}건: {result['errors'][:3]}")
+    finally:
+        await api_client.aclose()
+
+    print("\n" + "="*60 + "\n")
+
+
+def main():
+    args = parse_args()
+
+    if args.db:
+        asyncio.run(run_benchmark(args, args.db))
+        return
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        asyncio.run(run_benchmark(args, os.path.join(tmp_dir, "bench.db")))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,39 @@
+# -*- coding: utf-8 -*-
+"""
+공용 테스트 설정
+- DB 엔진은 app.database.db 를 import 할 때 DATABASE_URL 로 만들어지므로
+  어떤 app 모듈보다 먼저 임시 SQLite 파일을 지정 (실제 safemap.db 는 건드리지 않음)
+"""
+
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+_TMP_DIR = tempfile.mkdtemp(prefix="safemap-test-")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_TMP_DIR, 'test.db')}"
+
+
+@pytest.fixture(scope="session")
+def database():
+    """테이블/인덱스가 만들어진 테스트 DB (세션당 한 번 init_db)"""
+    from app.database.db import init_db
+
+    init_db()
+    return os.environ["DATABASE_URL"]
+
+
+@pytest.fixture
+def session_factory(database):
+    """테스트마다 비운 테이블을 쓰는 세션 팩토리"""
+    from app.database.db import SessionLocal, engine
+    from app.models.missing_person import Base
+
+    with engine.begin() as conn:
+        for table in reversed(Base.metadata.sorted_tables):
+            conn.execute(table.delete())
+    return SessionLocal
@@ -0,0 +1,70 @@
+# -*- coding: utf-8 -*-
+"""address_normalizer: 구성 요소 분해, 정규 키, 지오코딩 키(장소명 주소가 구 단위로 합쳐지지 않음)"""
+
+import pytest
+
+from app.services.address_normalizer import clean_address, geocode_key, normalize_address, parse_address
+
+
+@pytest.mark.parametrize("address, expected", [
+    ("서울시  강남구 역삼동 (역삼역 근처)", "서울특별시 강남구 역삼동"),
+    ("부산 사하구 승학로233번길 12, 101동", "부산광역시 사하구 승학로233번길 12"),
+    ("경기 수원시 팔달구 인계동 1010번지", "경기도 수원시 팔달구 인계동 1010"),
+    ("전라북도 전주시 완산구 효자동1가 산12-3", "전북특별자치도 전주시 완산구 효자동1가 산12-3"),
+    ("서울특별시 서대문구,이대역 부근", "서울특별시 서대문구"),
+    # 장소명 뒤의 "출구"는 시군구가 아님
+    ("이대역 2번 출구", "이대역 2번 출구"),
+    ("서울 서대문구 신촌역 3번 출구", "서울특별시 서대문구"),
+])
+def test_normalize_address(address, expected):
+    assert normalize_address(address) == expected
+
+
+def test_parse_address_components():
+    assert parse_address("서울 종로구 종로1가 24 교보빌딩") == {
+        "sido": "서울특별시",
+        "sigungu": "종로구",
+        "dong": "종로1가",
+        "road": None,
+        "number": "24",
+    }
+    assert parse_address("")["sido"] is None
+
+
+def test_clean_address_keeps_landmarks():
+    assert clean_address("서울특별시 서대문구,이대역 부근") == "서울특별시 서대문구 이대역 부근"
+    assert clean_address(" 강남구  역삼동 (역삼역 근처) ") == "강남구 역삼동 (역삼역 근처)"
+    assert clean_address(None) == ""
+
+
+@pytest.mark.parametrize("first, second", [
+    # 시군구 + 서로 다른 장소명 → 각자 다른 키
+    ("서울특별시 서대문구,이대역 부근", "서울특별시 서대문구 신촌역 3번출구"),
+    ("부산 해운대구 해운대해수욕장", "부산 해운대구 벡스코"),
+    # 도로명만 있고 건물번호가 없으면 장소명이 위치를 정함
+    ("부산 사하구 승학로233번길 하단시장", "부산 사하구 승학로233번길 승학초등학교"),
+    # 장소명이 있는 주소와 구 자체
+    ("서울특별시 서대문구 이대역 부근", "서울특별시 서대문구"),
+])
+def test_geocode_key_keeps_landmark_addresses_apart(first, second):
+    assert geocode_key(first) != geocode_key(second)
+
+
+@pytest.mark.parametrize("first, second", [
+    # 읍면동 / 도로명 + 건물번호까지 있으면 표기만 다른 주소는 같은 키
+    ("서울시  강남구 역삼동 (역삼역 근처)", "서울특별시 강남구 역삼동"),
+    ("부산 사하구 승학로233번길 12, 101동", "부산광역시 사하구 승학로233번길 12"),
+    # 장소명 없이 시도 약칭만 다름
+    ("서울시 서대문구", "서울특별시  서대문구"),
+    # 장소명 주소도 시도 약칭/구분 기호만 다르면 같은 키
+    ("서울 서대문구,이대역 부근", "서울특별시 서대문구 이대역 부근"),
+])
+def test_geocode_key_merges_spelling_variants(first, second):
+    assert geocode_key(first) == geocode_key(second)
+
+
+def test_geocode_key_examples():
+    assert geocode_key("서울특별시 서대문구,이대역 부근") == "서울특별시 서대문구 이대역 부근"
+    assert geocode_key("서울시 서대문구") == "서울특별시 서대문구"
+    assert geocode_key("서울 강남구 역삼동 123 (역삼역 근처)") == "서울특별시 강남구 역삼동 123"
+    assert geocode_key("") == ""
@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+"""fetch_planner: 파티션 구성과 빈틈 없는 분할"""
+
+from datetime import date, timedelta
+
+import pytest
+
+from app.services.fetch_planner import (
+    DATE_PARAM_FORMAT,
+    REGION_PREFIXES,
+    TARGET_CODES,
+    page_key,
+    plan_partitions,
+)
+
+
+def _parse(value):
+    return date.fromisoformat(value) if value else None
+
+
+def test_no_scheme_is_single_unfiltered_partition():
+    assert plan_partitions() == [{"key": "", "filters": {}}]
+    assert plan_partitions(None) == plan_partitions("")
+
+
+def test_target_partitions_cover_every_default_code_once():
+    partitions = plan_partitions("target")
+    codes = [code for p in partitions for code in p["filters"]["writng_trget_dscds"]]
+    assert sorted(codes) == sorted(TARGET_CODES)
+    assert len({p["key"] for p in partitions}) == len(partitions)
+
+
+def test_region_partitions_follow_prefix_list():
+    partitions = plan_partitions("region")
+    assert [p["filters"]["occr_adres"] for p in partitions] == REGION_PREFIXES
+    assert len({p["key"] for p in partitions}) == len(partitions)
+
+
+@pytest.mark.parametrize("today", [date(2024, 1, 1), date(2024, 6, 15), date(2024, 12, 31)])
+def test_date_windows_are_contiguous_and_open_ended(today):
+    partitions = plan_partitions("date", today=today, start_year=2000)
+    windows = [
+        (_parse(p["filters"].get("detail_date1")), _parse(p["filters"].get("detail_date2")))
+        for p in partitions
+    ]
+
+    # 첫 구간은 시작일 없음, 마지막 구간은 종료일 없음 → 전 기간을 덮음
+    assert windows[0][0] is None
+    assert windows[0][1] == date(1999, 12, 31)
+    assert windows[-1][0] == date(today.year, 1, 1)
+    assert windows[-1][1] is None
+
+    # 구간 사이에 빈 날짜도, 겹치는 날짜도 없음
+    for (_, previous_end), (next_start, _) in zip(windows, windows[1:]):
+        assert next_start == previous_end + timedelta(days=1)
+
+    assert len(partitions) == today.year - 2000 + 2
+    assert len({p["key"] for p in partitions}) == len(partitions)
+
+
+def test_date_params_use_api_format():
+    partition = plan_partitions("date", today=date(2024, 5, 1), start_year=2023)[1]
+    assert partition["filters"] == {
+        "detail_date1": date(2023, 1, 1).strftime(DATE_PARAM_FORMAT),
+        "detail_date2": date(2023, 12, 31).strftime(DATE_PARAM_FORMAT),
+    }
+
+
+def test_unknown_scheme_is_rejected():
+    with pytest.raises(ValueError):
+        plan_partitions("weekday")
+
+
+def test_page_key():
+    assert page_key({"key": "", "filters": {}}, 3) == "3"
+    assert page_key({"key": "target:010", "filters": {}}, 3) == "target:010#3"
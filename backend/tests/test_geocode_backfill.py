@@ -0,0 +1,134 @@
+# -*- coding: utf-8 -*-
+"""geocode_backfill: 키셋 커서 저장/재개, 한도 소진 시 일시 중지, 지명 사전 대체"""
+
+import asyncio
+from datetime import datetime
+
+import pytest
+
+from app.models.geocode_backfill import GeocodeBackfill
+from app.models.missing_person import MissingPerson
+from app.services.geocode_backfill import run_backfill
+
+
+class FakeGeocoder:
+    """주소 → 좌표 고정 응답, 일일 한도는 요청 주소 수로 계산"""
+
+    provider = "fake"
+
+    def __init__(self, known=None, quota=None):
+        self.known = known
+        self.quota = quota
+        self.requested = []
+
+    async def geocode_batch(self, addresses, show_progress=True, concurrency=None):
+        results = {}
+        for address in addresses:
+            if self.quota is not None and self.quota <= 0:
+                results[address] = None
+                continue
+            if self.quota is not None:
+                self.quota -= 1
+            self.requested.append(address)
+            known = self.known is None or address in self.known
+            results[address] = (37.0 + len(self.requested) / 1000, 127.0) if known else None
+        return results
+
+    def remaining_today(self):
+        return self.quota
+
+
+@pytest.fixture
+def rows(session_factory):
+    """좌표 없는 행 10개 (주소는 모두 다름)"""
+    db = session_factory()
+    try:
+        now = datetime.now()
+        for i in range(10):
+            db.add(MissingPerson(
+                external_id=f"BF{i:03d}",
+                location_address=f"서울특별시 강남구 역삼동 {i + 1}",
+                status="missing",
+                created_at=now,
+                updated_at=now,
+            ))
+        db.commit()
+        return [row.id for row in db.query(MissingPerson).order_by(MissingPerson.id)]
+    finally:
+        db.close()
+
+
+def _run(geocoder, session_factory, **kwargs):
+    return asyncio.run(run_backfill(geocoder, batch_size=3, session_factory=session_factory, **kwargs))
+
+
+def _cursor(session_factory):
+    db = session_factory()
+    try:
+        return db.query(GeocodeBackfill).filter(GeocodeBackfill.name == "fake").one()
+    finally:
+        db.close()
+
+
+def _precisions(session_factory):
+    db = session_factory()
+    try:
+        return [row.geocode_precision for row in db.query(MissingPerson).order_by(MissingPerson.id)]
+    finally:
+        db.close()
+
+
+def test_max_rows_pauses_and_next_run_resumes_after_cursor(rows, session_factory):
+    first = _run(FakeGeocoder(), session_factory, max_rows=4)
+    assert first["status"] == "paused"
+    assert first["processed"] == 4
+    assert first["last_id"] == rows[3]
+    assert _cursor(session_factory).last_id == rows[3]
+
+    geocoder = FakeGeocoder()
+    second = _run(geocoder, session_factory)
+    assert second["resumed_from"] == rows[3]
+    assert second["status"] == "completed"
+    assert second["processed"] == 6
+    assert len(geocoder.requested) == 6  # 앞에서 처리한 행은 다시 요청하지 않음
+    assert _precisions(session_factory) == ["address"] * 10
+    assert _cursor(session_factory).status == "completed"
+
+
+def test_completed_backfill_starts_over_next_time(rows, session_factory):
+    _run(FakeGeocoder(), session_factory)
+
+    again = _run(FakeGeocoder(), session_factory)
+    assert again["resumed_from"] == 0
+    assert again["processed"] == 0  # 모두 정밀 좌표 → 대상 없음
+    assert again["status"] == "completed"
+
+
+def test_quota_exhaustion_keeps_cursor_for_unfinished_batch(rows, session_factory):
+    # 첫 배치(3행)는 다 받고, 둘째 배치는 1행만 받은 뒤 한도 소진
+    summary = _run(FakeGeocoder(quota=4), session_factory)
+    assert summary["status"] == "paused"
+    assert summary["last_id"] == rows[2]  # 둘째 배치는 커서를 옮기지 않음
+    assert _cursor(session_factory).status == "paused"
+    assert _precisions(session_factory)[:4] == ["address"] * 4
+    assert _precisions(session_factory)[4:] == [None] * 6  # 한도 소진 시 대략 좌표로 채우지 않음
+
+    geocoder = FakeGeocoder()
+    resumed = _run(geocoder, session_factory)
+    assert resumed["resumed_from"] == rows[2]
+    assert resumed["status"] == "completed"
+    assert len(geocoder.requested) == 6  # 둘째 배치에서 받은 행은 이미 정밀 좌표 → 대상에서 빠짐
+    assert _precisions(session_factory) == ["address"] * 10
+
+
+def test_unknown_addresses_fall_back_to_gazetteer(rows, session_factory):
+    summary = _run(FakeGeocoder(known=set()), session_factory)
+    assert summary["approximated"] == 10
+    assert summary["geocoded"] == 0
+    assert set(_precisions(session_factory)) == {"sigungu"}
+
+    # 대략 좌표만 있는 행은 restart 하면 다시 대상
+    geocoder = FakeGeocoder()
+    again = _run(geocoder, session_factory, restart=True)
+    assert again["geocoded"] == 10
+    assert _precisions(session_factory) == ["address"] * 10
@@ -0,0 +1,74 @@
+# -*- coding: utf-8 -*-
+"""geocode_batch: 주소 키별 한 번만 요청, 같은 구의 다른 장소는 따로 변환"""
+
+import asyncio
+
+import httpx
+import pytest
+
+from app.services.geocode_batch import geocode_batch
+from app.services.geocode_cache import GeocodeCacheStore
+from app.services.geocoding_service import KakaoGeocodingService
+
+
+# 검색어 → 좌표 (키워드 검색 응답)
+PLACES = {
+    "서울특별시 서대문구 이대역 부근": (37.5567, 126.9460),
+    "서울특별시 서대문구 신촌역 3번출구": (37.5552, 126.9369),
+}
+
+
+@pytest.fixture
+def kakao(session_factory):
+    queries = []
+
+    def handler(request):
+        query = request.url.params["query"]
+        queries.append((request.url.path.rsplit("/", 1)[-1], query))
+        if request.url.path.endswith("keyword.json") and query in PLACES:
+            lat, lon = PLACES[query]
+            return httpx.Response(200, json={"documents": [{"x": str(lon), "y": str(lat)}]})
+        return httpx.Response(200, json={"documents": []})
+
+    service = KakaoGeocodingService("test-key", cache=GeocodeCacheStore(session_factory))
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    service._get_client = lambda: client
+    service.queries = queries
+    return service
+
+
+def test_landmarks_in_same_gu_are_geocoded_separately(kakao):
+    addresses = ["서울특별시 서대문구,이대역 부근", "서울특별시 서대문구 신촌역 3번출구"]
+    results = asyncio.run(geocode_batch(kakao, addresses, show_progress=False))
+
+    assert results == {
+        "서울특별시 서대문구,이대역 부근": PLACES["서울특별시 서대문구 이대역 부근"],
+        "서울특별시 서대문구 신촌역 3번출구": PLACES["서울특별시 서대문구 신촌역 3번출구"],
+    }
+    # 제공자에는 장소명이 남은 원문으로 요청
+    assert ("keyword.json", "서울특별시 서대문구 이대역 부근") in kakao.queries
+    assert ("keyword.json", "서울특별시 서대문구 신촌역 3번출구") in kakao.queries
+
+    # 캐시도 장소별로 저장 → 구 자체는 캐시에 없음
+    assert kakao.cache.lookup("서울특별시 서대문구", "kakao") == ("miss", None)
+    assert kakao.cache.lookup("서울 서대문구 신촌역 3번출구", "kakao") == (
+        "hit", PLACES["서울특별시 서대문구 신촌역 3번출구"]
+    )
+
+
+def test_spelling_variants_share_one_request(kakao):
+    addresses = ["서울특별시 서대문구 이대역 부근", "서울시 서대문구, 이대역 부근"]
+    results = asyncio.run(geocode_batch(kakao, addresses, show_progress=False))
+
+    assert set(results.values()) == {PLACES["서울특별시 서대문구 이대역 부근"]}
+    assert len([q for q in kakao.queries if q[0] == "address.json"]) == 1
+
+
+def test_second_batch_is_served_from_cache(kakao):
+    addresses = list(PLACES)
+    asyncio.run(geocode_batch(kakao, addresses, show_progress=False))
+    sent = len(kakao.queries)
+
+    results = asyncio.run(geocode_batch(kakao, addresses, show_progress=False))
+    assert results == PLACES
+    assert len(kakao.queries) == sent
@@ -0,0 +1,118 @@
+# -*- coding: utf-8 -*-
+"""geocode_cache: 제공자 공용 성공 결과, 제공자별 실패 기록, TTL 만료"""
+
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.models.geocode_cache import GeocodeCache
+from app.services.geocode_cache import GeocodeCacheStore
+
+
+ADDRESS = "서울특별시 강남구 역삼동 123"
+COORDS = (37.5, 127.03)
+
+
+@pytest.fixture
+def store(session_factory):
+    return GeocodeCacheStore(session_factory)
+
+
+def _expire(session_factory, provider):
+    """DB 항목을 만료시킴 (메모리 캐시가 없는 새 저장소로 다시 읽어야 반영)"""
+    db = session_factory()
+    try:
+        db.query(GeocodeCache).filter(GeocodeCache.provider == provider)\
+            .update({GeocodeCache.expires_at: datetime.now() - timedelta(seconds=1)})
+        db.commit()
+    finally:
+        db.close()
+
+
+def test_miss_then_hit_shared_across_providers(store):
+    assert store.lookup(ADDRESS, "kakao") == ("miss", None)
+
+    store.store(ADDRESS, "kakao", COORDS, 1.0)
+
+    assert store.lookup(ADDRESS, "kakao") == ("hit", COORDS)
+    assert store.lookup(ADDRESS, "naver") == ("hit", COORDS)
+
+
+def test_hit_survives_restart(store, session_factory):
+    store.store(ADDRESS, "kakao", COORDS, 1.0)
+    assert GeocodeCacheStore(session_factory).lookup(ADDRESS, "naver") == ("hit", COORDS)
+
+
+def test_spelling_variants_share_key(store):
+    store.store("서울시  강남구 역삼동 123 (역삼역 근처)", "kakao", COORDS, 1.0)
+    assert store.lookup(ADDRESS, "kakao") == ("hit", COORDS)
+
+
+def test_negative_entry_is_per_provider(store):
+    store.store(ADDRESS, "kakao", None)
+
+    assert store.lookup(ADDRESS, "kakao") == ("negative", None)
+    assert store.lookup(ADDRESS, "naver") == ("miss", None)
+
+
+def test_success_from_other_provider_beats_negative(store):
+    store.store(ADDRESS, "kakao", None)
+    store.store(ADDRESS, "naver", COORDS, 1.0)
+    assert store.lookup(ADDRESS, "kakao") == ("hit", COORDS)
+
+
+def test_expired_success_is_stale_with_fallback_coords(store, session_factory):
+    store.store(ADDRESS, "kakao", COORDS, 1.0)
+    _expire(session_factory, "kakao")
+
+    assert GeocodeCacheStore(session_factory).lookup(ADDRESS, "kakao") == ("stale", COORDS)
+
+
+def test_expired_negative_is_retried(store, session_factory):
+    store.store(ADDRESS, "kakao", None)
+    _expire(session_factory, "kakao")
+
+    assert GeocodeCacheStore(session_factory).lookup(ADDRESS, "kakao") == ("miss", None)
+
+
+def test_store_overwrites_same_provider(store, session_factory):
+    store.store(ADDRESS, "kakao", None)
+    store.store(ADDRESS, "kakao", COORDS, 0.9)
+
+    assert store.lookup(ADDRESS, "kakao") == ("hit", COORDS)
+    assert store.count() == 1
+
+
+def test_preload_reads_all_addresses_at_once(store, session_factory):
+    other = "부산광역시 해운대구 우동 1"
+    store.store(ADDRESS, "kakao", COORDS, 1.0)
+    store.store(other, "naver", None)
+
+    fresh = GeocodeCacheStore(session_factory)
+    fresh.preload([ADDRESS, other, "대구광역시 중구 동인동 5"])
+
+    assert fresh.lookup(ADDRESS, "kakao") == ("hit", COORDS)
+    assert fresh.lookup(other, "naver") == ("negative", None)
+    assert fresh.stats["misses"] == 0
+
+
+def test_purge_collapsed_keys(store, session_factory):
+    from app.database.db import engine
+    from app.services.geocode_cache import purge_collapsed_keys
+
+    # 예전 규칙: 장소명 주소가 "시도 시군구" 키로 저장됨
+    db = session_factory()
+    try:
+        db.add(GeocodeCache(
+            address_key="서울특별시 서대문구", address="서울특별시 서대문구 이대역 부근",
+            provider="kakao", status="ok", latitude=37.55, longitude=126.94,
+            fetched_at=datetime.now(), expires_at=datetime.now() + timedelta(days=1)
+        ))
+        db.commit()
+    finally:
+        db.close()
+    store.store(ADDRESS, "kakao", COORDS, 1.0)
+
+    assert purge_collapsed_keys(engine) == 1
+    assert store.count() == 1
+    assert GeocodeCacheStore(session_factory).lookup("서울특별시 서대문구", "kakao") == ("miss", None)
@@ -0,0 +1,167 @@
+# -*- coding: utf-8 -*-
+"""rate_limiter: GCRA 간격/순간 허용량, 일일 한도, DB 사용량 블록 확보"""
+
+import asyncio
+from datetime import date, timedelta
+
+import pytest
+
+from app.services import rate_limiter
+from app.services.geocode_quota import QuotaUsageStore
+from app.services.rate_limiter import DailyQuotaExceeded, TokenBucket
+
+
+class CountingStore:
+    """호출 횟수를 세는 메모리 사용량 저장소"""
+
+    def __init__(self):
+        self.used_by_day = {}
+        self.takes = 0
+        self.refunds = 0
+
+    def take(self, name, day, limit, count=1):
+        self.takes += 1
+        used = self.used_by_day.get(day, 0)
+        granted = count if limit is None else max(0, min(count, limit - used))
+        self.used_by_day[day] = used + granted
+        return granted
+
+    def refund(self, name, day, count=1):
+        self.refunds += 1
+        self.used_by_day[day] = max(0, self.used_by_day.get(day, 0) - count)
+
+    def used(self, name, day):
+        return self.used_by_day.get(day, 0)
+
+
+def _acquire(bucket, times):
+    async def run():
+        for _ in range(times):
+            await bucket.acquire()
+    asyncio.run(run())
+
+
+def test_rate_must_be_positive():
+    with pytest.raises(ValueError):
+        TokenBucket("x", 0)
+
+
+def test_gcra_spaces_requests_evenly():
+    bucket = TokenBucket("x", rate_per_second=10)
+    waits = [bucket._reserve() for _ in range(5)]
+
+    assert waits[0] == 0
+    for previous, current in zip(waits, waits[1:]):
+        assert current - previous == pytest.approx(0.1, abs=0.01)
+
+
+def test_gcra_burst_allows_immediate_requests():
+    bucket = TokenBucket("x", rate_per_second=10, burst=3)
+    waits = [bucket._reserve() for _ in range(5)]
+
+    assert waits[:3] == [0, 0, 0]
+    assert waits[3] == pytest.approx(0.1, abs=0.01)
+    assert waits[4] == pytest.approx(0.2, abs=0.01)
+
+
+def test_memory_daily_limit():
+    bucket = TokenBucket("x", rate_per_second=1000, daily_limit=3)
+    _acquire(bucket, 3)
+
+    assert bucket.remaining_today() == 0
+    with pytest.raises(DailyQuotaExceeded):
+        _acquire(bucket, 1)
+
+
+def test_daily_limit_resets_next_day(monkeypatch):
+    bucket = TokenBucket("x", rate_per_second=1000, daily_limit=1)
+    _acquire(bucket, 1)
+
+    class Tomorrow(date):
+        @classmethod
+        def today(cls):
+            return date.today() + timedelta(days=1)
+
+    monkeypatch.setattr(rate_limiter, "date", Tomorrow)
+    assert bucket.remaining_today() == 1
+    _acquire(bucket, 1)
+
+
+def test_cancel_while_waiting_does_not_use_quota():
+    bucket = TokenBucket("x", rate_per_second=1, daily_limit=10)
+
+    async def run():
+        await bucket.acquire()
+        waiting = asyncio.ensure_future(bucket.acquire())  # 1초 대기 중
+        await asyncio.sleep(0.05)
+        waiting.cancel()
+        await asyncio.gather(waiting, return_exceptions=True)
+
+    asyncio.run(run())
+    assert bucket.remaining_today() == 9
+
+
+def test_store_is_written_once_per_block():
+    store = CountingStore()
+    bucket = TokenBucket("x", rate_per_second=1000, daily_limit=1000, usage_store=store, quota_block=50)
+    _acquire(bucket, 120)
+
+    assert store.takes == 3
+    assert bucket.stats()["used_today"] == 120
+    assert bucket.remaining_today() == 1000 - 120
+
+
+def test_settle_returns_unused_block():
+    store = CountingStore()
+    bucket = TokenBucket("x", rate_per_second=1000, daily_limit=1000, usage_store=store, quota_block=50)
+    _acquire(bucket, 7)
+    assert store.used("x", date.today()) == 50
+
+    bucket.settle()
+    assert store.used("x", date.today()) == 7
+    assert bucket.stats()["reserved"] == 0
+
+
+def test_block_is_trimmed_to_remaining_limit():
+    store = CountingStore()
+    bucket = TokenBucket("x", rate_per_second=1000, daily_limit=30, usage_store=store, quota_block=50)
+    _acquire(bucket, 30)
+
+    with pytest.raises(DailyQuotaExceeded):
+        _acquire(bucket, 1)
+    assert store.used("x", date.today()) == 30
+
+
+def test_db_quota_survives_restart_and_is_shared(session_factory, monkeypatch):
+    store = QuotaUsageStore(session_factory)
+    first = TokenBucket("kakao", rate_per_second=1000, daily_limit=100, usage_store=store, quota_block=40)
+    _acquire(first, 10)
+    first.settle()
+
+    # 재시작(또는 다른 프로세스): 새 제한기도 DB 사용량을 이어서 봄
+    second = TokenBucket("kakao", rate_per_second=1000, daily_limit=100, usage_store=store, quota_block=40)
+    assert second.remaining_today() == 90
+
+    # 두 제한기가 블록을 나눠 가져도 합계는 한도 이하 (다른 쪽이 쥐고 있는 블록은 쓰지 못함)
+    other = TokenBucket("kakao", rate_per_second=1000, daily_limit=100, usage_store=store, quota_block=40)
+    _acquire(second, 45)  # 40 + 40 확보, 35 남김
+    _acquire(other, 10)  # 남은 10 확보
+    with pytest.raises(DailyQuotaExceeded):
+        _acquire(other, 1)
+    assert store.used("kakao", date.today()) == 100
+
+    # 쓰지 않은 블록을 반환하면 다른 쪽이 사용 (소진 확인 후 재확인 시간이 지나면)
+    second.settle()
+    monkeypatch.setattr(rate_limiter, "QUOTA_RECHECK_SECONDS", 0)
+    _acquire(other, 35)
+    assert store.used("kakao", date.today()) == 100
+    assert other.remaining_today() == 0
+
+
+def test_store_refund_never_goes_negative(session_factory):
+    store = QuotaUsageStore(session_factory)
+    today = date.today()
+    assert store.take("naver", today, 10, 4) == 4
+    store.refund("naver", today, 10)
+    assert store.used("naver", today) == 0
+    assert store.take("naver", today, 0, 1) == 0
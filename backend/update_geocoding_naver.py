@@ -2,8 +2,14 @@
 # -*- coding: utf-8 -*-
 """
 Naver Geocoding API를 사용하여 기존 데이터베이스의 주소를 좌표로 변환하는 스크립트
+- 키셋 배치로 스트리밍 처리, 커서 저장 → 중단 후 다시 실행하면 이어서 처리 (app.services.geocode_backfill)
+
+사용법:
+    python update_geocoding_naver.py             # 이어서 (완료된 적 있으면 처음부터)
+    python update_geocoding_naver.py --restart   # 저장된 커서 무시하고 처음부터
 """
 
+import argparse
 import asyncio
 import sys
 from pathlib import Path
@@ -11,110 +17,70 @@ from pathlib import Path
 # 프로젝트 루트를 Python 경로에 추가
 sys.path.insert(0, str(Path(__file__).parent))
 
-from app.database.db import SessionLocal
-from app.models.missing_person import MissingPerson
+from app.database.db import init_db
 from app.services.naver_geocoding_service import NaverGeocodingService
-from datetime import datetime
+from app.services.geocode_backfill import GEOCODE_BACKFILL_BATCH_SIZE, run_backfill
 import os
 from dotenv import load_dotenv
 
 
-async def update_all_locations(naver_client_id: str, naver_client_secret: str):
-    """모든 실종자 데이터의 위치 정보 업데이트"""
+def parse_args():
+    parser = argparse.ArgumentParser(description="SafeMap Naver 지오코딩 백필")
+    parser.add_argument("--restart", action="store_true", help="저장된 커서를 무시하고 처음부터")
+    parser.add_argument("--batch-size", type=int, default=GEOCODE_BACKFILL_BATCH_SIZE,
+                        help=f"배치 크기 (기본: {GEOCODE_BACKFILL_BATCH_SIZE})")
+    parser.add_argument("--max-rows", type=int, default=None, help="이번 실행에서 처리할 최대 행 수")
+    return parser.parse_args()
+
+
+async def update_all_locations(naver_client_id: str, naver_client_secret: str, args):
+    """위치 정보가 없거나 대략적인 실종자 데이터의 좌표 업데이트"""
 
     print("\n" + "="*60)
     print("🗺️  Naver Geocoding 서비스 시작")
     print("="*60 + "\n")
 
-    db = SessionLocal()
+    init_db()
     geocoding_service = NaverGeocodingService(naver_client_id, naver_client_secret)
 
     try:
-        # 위치 정보가 없는 실종자 데이터 조회
-        missing_persons = db.query(MissingPerson).filter(
-            MissingPerson.latitude.is_(None),
-            MissingPerson.location_address.isnot(None)
-        ).all()
-
-        total = len(missing_persons)
-        print(f"📊 위치 정보가 없는 데이터: {total}건")
-
-        if total == 0:
-            print("✅ 모든 데이터에 위치 정보가 있습니다!")
-            return
-
-        print(f"🚀 지오코딩 시작...\n")
-
-        success_count = 0
-        failed_count = 0
-
-        for idx, person in enumerate(missing_persons, 1):
-            address = person.location_address.strip() if person.location_address else None
-
-            if not address:
-                continue
-
-            # 진행 상황 출력 (10개마다)
-            if idx % 10 == 0:
-                print(f"📍 진행: {idx}/{total} ({idx/total*100:.1f}%) - "
-                      f"성공: {success_count}, 실패: {failed_count}")
-
-            # 지오코딩 시도
-            result = await geocoding_service.geocode_address(address)
-
-            if result:
-                lat, lon = result
-                person.latitude = lat
-                person.longitude = lon
-                person.updated_at = datetime.now()
-                success_count += 1
-
-                # 처음 5개만 상세 출력
-                if success_count <= 5:
-                    print(f"   ✅ {address[:40]} → ({lat:.6f}, {lon:.6f})")
-            else:
-                failed_count += 1
-
-                # 처음 5개 실패만 출력
-                if failed_count <= 5:
-                    print(f"   ❌ {address[:40]} → 변환 실패")
-
-            # 50개마다 커밋
-            if idx % 50 == 0:
-                db.commit()
-                print(f"   💾 {idx}건 저장 완료")
-                await asyncio.sleep(1.0)  # API 부하 방지
-
-        # 최종 커밋
-        db.commit()
+        summary = await run_backfill(
+            geocoding_service,
+            batch_size=args.batch_size,
+            restart=args.restart,
+            max_rows=args.max_rows
+        )
 
         print("\n" + "="*60)
-        print("✅ 지오코딩 완료!")
+        print("✅ 지오코딩 완료!" if summary["status"] == "completed" else "⏸️  지오코딩 일시 중지 (다시 실행하면 이어서 처리)")
         print("="*60)
         print(f"""
 📊 결과:
-   • 전체 처리: {total}건
-   • 성공: {success_count}건 ({success_count/total*100:.1f}%)
-   • 실패: {failed_count}건 ({failed_count/total*100:.1f}%)
+   • 처리: {summary['processed']}건 ({summary['batches']}배치, 커서 id {summary['resumed_from']} → {summary['last_id']})
+   • 정밀 좌표: {summary['geocoded']}건
+   • 대략 좌표 (지명 사전): {summary['approximated']}건
+   • 실패: {summary['failed']}건
         """)
 
         # 캐시 통계
         cache_stats = geocoding_service.get_cache_stats()
-        print(f"💾 캐시된 주소: {cache_stats['cached_addresses']}개")
+        print(f"💾 캐시된 주소: {cache_stats['cached_addresses']}개 "
+              f"(적중 {cache_stats['hits']}, 실패 기록 적중 {cache_stats['negative_hits']}, "
+              f"API 호출 {cache_stats['api_calls']}회)")
         print("="*60 + "\n")
 
     except Exception as e:
-        print(f"\n❌ 오류 발생: {str(e)}")
+        print(f"\n❌ 오류 발생: {str(e)} (다시 실행하면 마지막 배치 다음부터 재개)")
         import traceback
         traceback.print_exc()
-        db.rollback()
 
     finally:
-        db.close()
+        await geocoding_service.aclose()
 
 
 if __name__ == "__main__":
     load_dotenv()
+    args = parse_args()
 
     # Naver Cloud Platform 인증 정보
     NAVER_CLIENT_ID = os.getenv("NAVER_CLIENT_ID")
@@ -137,4 +103,4 @@ NAVER_CLIENT_SECRET=your_client_secret
         sys.exit(1)
 
     print("🚀 SafeMap Naver 지오코딩 업데이트 시작...\n")
-    asyncio.run(update_all_locations(NAVER_CLIENT_ID, NAVER_CLIENT_SECRET))
+    asyncio.run(update_all_locations(NAVER_CLIENT_ID, NAVER_CLIENT_SECRET, args))
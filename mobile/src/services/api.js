@@ -32,6 +32,25 @@ export const api = {
     }
   },
 
+  // 지도 화면 영역 안의 실종자 조회 (bounds: { minLat, minLng, maxLat, maxLng })
+  getMissingPersonsInBounds: async (bounds, params = {}) => {
+    try {
+      const response = await apiClient.get('/api/v1/missing-persons/bbox', {
+        params: {
+          min_lat: bounds.minLat,
+          min_lng: bounds.minLng,
+          max_lat: bounds.maxLat,
+          max_lng: bounds.maxLng,
+          ...params,
+        },
+      });
+      return response.data;
+    } catch (error) {
+      console.error('Error fetching missing persons in bounds:', error);
+      throw error;
+    }
+  },
+
   // 실종자 통계 조회
   getStatistics: async (days = 30) => {
     try {